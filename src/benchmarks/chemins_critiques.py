@@ -0,0 +1,187 @@
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from model.espace_aerien import EspaceAerien
+from model.instantane import capturer
+from model.simulation import Simulation
+
+TAILLES = (10, 100, 300, 1_000, 10_000)
+NOMBRE_TEMPETES = 4
+# Trafic auquel le mode flotte (colonnes NumPy) ne doit pas être plus lent que le mode objet.
+TAILLE_COMPARAISON_FLOTTE = 300
+BASELINE_DEFAUT = os.path.join(os.path.dirname(__file__), "baseline.json")
+BASELINE_FLOTTE = os.path.join(os.path.dirname(__file__), "baseline_flotte.json")
+
+_application = None
+
+
+def cote_espace(taille: int) -> float:
+    # Densité constante, celle de l'espace d'origine à son trafic maximal : sans cela, 10 000 avions sur
+    # 1000 × 1000 se percutent par centaines dès le premier tick et la flotte mesurée fond.
+    return EspaceAerien.TAILLE_X * math.sqrt(max(1.0, taille / Simulation.MAX_AVIONS_EN_VOL))
+
+
+def construire_scenario(taille: int, graine: int = 42, flotte_vectorisee: bool = False) -> Simulation:
+    cote = cote_espace(taille)
+    simulation = Simulation(flotte_vectorisee=flotte_vectorisee, graine=graine, taille_x=cote, taille_y=cote)
+    # Le plafond d'apparitions suit la surface : on le ramène au trafic demandé.
+    simulation.MAX_AVIONS_EN_VOL = taille / simulation.facteur_surface
+    while len(simulation.espace.avions) < taille:
+        simulation.espace.generer_avion_aleatoire()
+    for _ in range(NOMBRE_TEMPETES):
+        simulation.espace.generer_tempete()
+    simulation.demarrer()
+    simulation.evenements.vider()
+    return simulation
+
+
+def mesurer(fonction, repetitions: int) -> int:
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter_ns()
+        fonction()
+        durees.append(time.perf_counter_ns() - debut)
+    return int(statistics.median(durees))
+
+
+def _phases(simulation: Simulation, radar):
+    espace = simulation.espace
+    delta = (simulation.TEMPS_PAR_TICK_S * simulation.vitesse_simulation) / 3600.0
+
+    def deplacer():
+        if espace.flotte is not None:
+            espace.flotte.deplacer_tous(delta)
+            return
+        for avion in espace.avions:
+            avion.deplacer(delta)
+
+    def verifier_tempete():
+        for avion in espace.avions:
+            espace.verifier_tempete(avion)
+
+    def mise_a_jour():
+        simulation.mise_a_jour()
+        simulation.evenements.vider()
+
+    phases = {
+        "avion_deplacer": deplacer,
+        "verifier_tempete": verifier_tempete,
+        "masque_tempetes": espace.masque_tempetes,
+        "detecter_collisions": espace.detecter_collisions,
+        "mise_a_jour": mise_a_jour,
+    }
+    if radar is not None:
+        def update_radar():
+            instantane = capturer(simulation)
+            radar.update_radar(instantane.avions, instantane.tempetes, None, instantane.taille_x, instantane.taille_y)
+        phases["radar_update"] = update_radar
+    return phases
+
+
+def _creer_radar():
+    global _application
+    try:
+        from PySide6.QtWidgets import QApplication
+    except ImportError:
+        return None
+    from ui.radar_view import RadarView
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    _application = QApplication.instance() or QApplication(sys.argv[:1])
+    return RadarView()
+
+
+def executer_benchmarks(tailles=TAILLES, repetitions: int = 20, avec_radar: bool = True,
+                        flotte_vectorisee: bool = False) -> dict:
+    resultats = {}
+    for taille in tailles:
+        radar = _creer_radar() if avec_radar else None
+        simulation = construire_scenario(taille, flotte_vectorisee=flotte_vectorisee)
+        # Moins de répétitions pour les très grandes flottes.
+        n = max(3, repetitions * 300 // max(taille, 300))
+        mesures = {nom: mesurer(phase, n) for nom, phase in _phases(simulation, radar).items()}
+
+        tracemalloc.start()
+        simulation = construire_scenario(taille, flotte_vectorisee=flotte_vectorisee)
+        for _ in range(3):
+            simulation.mise_a_jour()
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mesures["memoire_pic_octets"] = pic
+
+        resultats[str(taille)] = mesures
+        print(f"{taille:>6} avions : " + ", ".join(
+            f"{nom}={valeur / 1000:.1f}µs" if nom != "memoire_pic_octets" else f"{nom}={valeur}"
+            for nom, valeur in mesures.items()), flush=True)
+    return resultats
+
+
+def comparer_flotte(taille: int = TAILLE_COMPARAISON_FLOTTE, repetitions: int = 20) -> dict:
+    # Même graine dans les deux modes : les deux simulations restent identiques tick après tick.
+    mesures = {}
+    for nom, flotte_vectorisee in (("mise_a_jour_objets", False), ("mise_a_jour_flotte", True)):
+        simulation = construire_scenario(taille, flotte_vectorisee=flotte_vectorisee)
+        mesures[nom] = mesurer(_phases(simulation, None)["mise_a_jour"], repetitions * 5)
+    print(f"{taille:>6} avions : mise_a_jour objets={mesures['mise_a_jour_objets'] / 1000:.1f}µs, "
+          f"flotte={mesures['mise_a_jour_flotte'] / 1000:.1f}µs", flush=True)
+    return mesures
+
+
+def comparer(resultats: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for taille, mesures in resultats.items():
+        reference = baseline.get(taille, {})
+        for nom, valeur in mesures.items():
+            ancienne = reference.get(nom)
+            if ancienne and valeur > ancienne * (1 + tolerance):
+                regressions.append(f"{taille} avions / {nom} : {ancienne} -> {valeur} (+{valeur / ancienne - 1:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks des chemins critiques de la simulation.")
+    parser.add_argument("--tailles", type=int, nargs="+", default=list(TAILLES))
+    parser.add_argument("--repetitions", type=int, default=20)
+    parser.add_argument("--sans-radar", action="store_true", help="Ne pas mesurer RadarView.update_radar.")
+    parser.add_argument("--flotte", action="store_true", help="Mesurer le mode flotte (colonnes NumPy).")
+    parser.add_argument("--baseline", default=None,
+                        help="Fichier JSON de référence (baseline.json, ou baseline_flotte.json avec --flotte).")
+    parser.add_argument("--sauver", action="store_true", help="Écrire les résultats comme nouvelle référence.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Ralentissement toléré avant alerte.")
+    args = parser.parse_args(argv)
+    if args.baseline is None:
+        args.baseline = BASELINE_FLOTTE if args.flotte else BASELINE_DEFAUT
+
+    resultats = executer_benchmarks(args.tailles, args.repetitions, not args.sans_radar, args.flotte)
+    resultats["flotte"] = comparer_flotte(repetitions=args.repetitions)
+    flotte = resultats["flotte"]
+    regressions = []
+    if flotte["mise_a_jour_flotte"] > flotte["mise_a_jour_objets"]:
+        regressions.append(f"mode flotte plus lent que le mode objet à {TAILLE_COMPARAISON_FLOTTE} avions : "
+                           f"{flotte['mise_a_jour_flotte']} > {flotte['mise_a_jour_objets']}")
+
+    if args.sauver:
+        with open(args.baseline, "w", encoding="utf-8") as fichier:
+            json.dump(resultats, fichier, indent=2)
+        print(f"Référence écrite dans {args.baseline}")
+    elif not os.path.exists(args.baseline):
+        print("Aucune référence : relancer avec --sauver pour en créer une.")
+    else:
+        with open(args.baseline, encoding="utf-8") as fichier:
+            baseline = json.load(fichier)
+        regressions += comparer(resultats, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    if not regressions:
+        print("Aucune régression.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import argparse
+import random
+import tracemalloc
+
+from model.avion import Avion
+from model.espace_aerien import ZoneTempete
+
+
+def octets_par_instance(fabrique, nombre: int) -> float:
+    tracemalloc.start()
+    avant, _ = tracemalloc.get_traced_memory()
+    instances = [fabrique(i) for i in range(nombre)]
+    apres, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # La liste elle-même n'est pas comptée.
+    return (apres - avant - instances.__sizeof__()) / nombre
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mémoire occupée par avion et par tempête.")
+    parser.add_argument("--nombre", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    identifiants = [f"AV{i:05d}" for i in range(args.nombre)]
+
+    par_avion = octets_par_instance(
+        lambda i: Avion(identifiants[i], rng.uniform(0, 1000), rng.uniform(0, 1000), 3000, rng), args.nombre)
+    par_tempete = octets_par_instance(
+        lambda i: ZoneTempete(rng.uniform(0, 1000), rng.uniform(0, 1000), 80, 400), args.nombre)
+
+    print(f"Avion       : {par_avion:.0f} octets / instance")
+    print(f"ZoneTempete : {par_tempete:.0f} octets / instance")
+
+
+if __name__ == "__main__":
+    main()
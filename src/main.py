@@ -1,5 +1,5 @@
+import argparse
 import sys
-import random
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QPalette, QColor
 from PySide6.QtCore import Qt
@@ -56,11 +56,17 @@ def appliquer_theme_sombre(app):
 
 
 if __name__ == "__main__":
-    random.seed(42)
+    parser = argparse.ArgumentParser(description="Simulateur de tour de contrôle.")
+    parser.add_argument("--journal", default=None, help="Enregistrer la partie dans ce fichier.")
+    parser.add_argument("--relecture", default=None, help="Rejouer un journal enregistré.")
+    parser.add_argument("--evenements", default=None, help="Exporter tous les évènements (JSON lignes).")
+    parser.add_argument("--opengl", action="store_true", help="Radar rendu en OpenGL (instanciation GPU).")
+    args, reste = parser.parse_known_args()
 
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + reste)
     appliquer_theme_sombre(app)
 
-    fenetre = MainWindow()
+    fenetre = MainWindow(graine=42, relecture=args.relecture, journal=args.journal,
+                         evenements=args.evenements, opengl=args.opengl)
     fenetre.show()
     sys.exit(app.exec())
\ No newline at end of file
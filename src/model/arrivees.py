@@ -0,0 +1,145 @@
+import bisect
+import heapq
+
+import numpy as np
+
+from model.avion import Avion
+from model.espace_aerien import EspaceAerien
+
+
+class GestionnaireArrivees:
+    """Séquence les avions autorisés à atterrir : file de priorité, créneaux de piste et guidage continu."""
+
+    # Occupation de la piste par un atterrissage.
+    INTERVALLE_CRENEAU_TICKS = 10
+
+    VITESSE_APPROCHE_MIN = 300
+    VITESSE_APPROCHE_MAX = 800
+
+    # Avion.deplacer brûle 10 % par heure et parcourt vitesse * 100 unités par heure.
+    CONSOMMATION_PAR_UNITE = 0.1
+
+    # Carburant restant à l'arrivée (en %) sous lequel l'avion passe devant les autres.
+    MARGE_CARBURANT_CRITIQUE = 5.0
+    # En autorisation automatique, marge à vitesse actuelle qui déclenche l'autorisation d'atterrir.
+    MARGE_AUTORISATION_AUTO = 15.0
+
+    def __init__(self, altitude_approche: int):
+        self.altitude_approche = altitude_approche
+        self.autorisation_automatique = False
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        self.piste_libre_tick = 0
+        self.creneaux: dict[int, int] = {}
+        self.sequence: tuple[tuple[str, int], ...] = ()
+        self._infaisables: set[int] = set()
+        # Vrai si le dernier guidage a changé un cap, une vitesse ou un niveau.
+        self.trajectoires_modifiees = False
+
+    def _en_approche(self, espace: EspaceAerien) -> tuple[list[Avion], np.ndarray | None]:
+        flotte = espace.flotte
+        if flotte is not None:
+            n = flotte.taille
+            lignes = np.flatnonzero(flotte.instruction_atterrissage[:n] & flotte.en_vol[:n])
+            return [flotte.avions[k] for k in lignes], lignes
+        return [a for a in espace.avions if a.instruction_atterrissage and a.en_vol], None
+
+    def candidats_automatiques(self, espace: EspaceAerien) -> list[Avion]:
+        avions = [a for a in espace.avions if a.en_vol and not a.instruction_atterrissage]
+        if not avions:
+            return []
+        n = len(avions)
+        x = np.fromiter((a.x for a in avions), dtype=np.float64, count=n)
+        y = np.fromiter((a.y for a in avions), dtype=np.float64, count=n)
+        vitesse = np.fromiter((a.vitesse for a in avions), dtype=np.float64, count=n)
+        carburant = np.fromiter((a.carburant for a in avions), dtype=np.float64, count=n)
+        incident = np.fromiter((a.incident for a in avions), dtype=bool, count=n)
+
+        reste = np.maximum(0.0, np.hypot(espace.aeroport_x - x, espace.aeroport_y - y) - espace.ZONE_APPROCHE_RAYON)
+        marge = carburant - self.CONSOMMATION_PAR_UNITE * reste / np.maximum(vitesse, 1)
+        return [avions[k] for k in np.flatnonzero(incident | (marge < self.MARGE_AUTORISATION_AUTO))]
+
+    def guider(self, espace: EspaceAerien, tick: int, delta_tick_heures: float) -> list[str]:
+        # Renvoie les identifiants des avions qui viennent de devenir incapables d'atteindre l'aéroport.
+        avions, lignes = self._en_approche(espace)
+        self.trajectoires_modifiees = False
+        if not avions or delta_tick_heures <= 0:
+            self.creneaux = {}
+            self.sequence = ()
+            self._infaisables.clear()
+            return []
+
+        n = len(avions)
+        x = np.fromiter((a.x for a in avions), dtype=np.float64, count=n)
+        y = np.fromiter((a.y for a in avions), dtype=np.float64, count=n)
+        carburant = np.fromiter((a.carburant for a in avions), dtype=np.float64, count=n)
+        incident = np.fromiter((a.incident for a in avions), dtype=bool, count=n)
+        handles = [a.handle for a in avions]
+
+        dx = espace.aeroport_x - x
+        dy = espace.aeroport_y - y
+        reste = np.maximum(0.0, np.hypot(dx, dy) - espace.ZONE_APPROCHE_RAYON)
+        unites_par_tick_max = self.VITESSE_APPROCHE_MAX * delta_tick_heures * 100
+        eta = np.ceil(reste / unites_par_tick_max).astype(np.int64)
+        # Faisabilité au plus vite : la consommation par tick est fixe, aller vite économise du carburant.
+        marge = carburant - self.CONSOMMATION_PAR_UNITE * reste / self.VITESSE_APPROCHE_MAX
+        # Rang 0 : panne ou carburant critique ; rang 2 : ne peut plus atteindre la piste, servi en dernier.
+        rangs = np.where(marge < 0, 2, np.where(incident | (marge < self.MARGE_CARBURANT_CRITIQUE), 0, 1))
+
+        file = [(r, m, e, h, k) for k, (r, m, e, h) in
+                enumerate(zip(rangs.tolist(), marge.tolist(), eta.tolist(), handles))]
+        heapq.heapify(file)
+        creneaux = np.empty(n, dtype=np.int64)
+        pris: list[int] = []
+        while file:
+            _, _, e, _, k = heapq.heappop(file)
+            creneaux[k] = self._premier_creneau_libre(pris, max(tick + e, self.piste_libre_tick))
+            bisect.insort(pris, int(creneaux[k]))
+        self.creneaux = dict(zip(handles, creneaux.tolist()))
+        ordre = np.argsort(creneaux, kind="stable")
+        self.sequence = tuple((avions[k].identifiant, int(creneaux[k])) for k in ordre)
+
+        # Guidage de tous les avions en approche en une passe : cap vers la piste, vitesse calée sur le créneau.
+        caps = (np.degrees(np.arctan2(dy, dx)) % 360).astype(np.int64)
+        vitesse_creneau = reste / (np.maximum(creneaux - tick, 1) * delta_tick_heures * 100)
+        vitesse_carburant = self.CONSOMMATION_PAR_UNITE * reste / np.maximum(carburant, 1e-9)
+        vitesses = np.clip(np.maximum(vitesse_creneau, vitesse_carburant),
+                           self.VITESSE_APPROCHE_MIN, self.VITESSE_APPROCHE_MAX).round().astype(np.int64)
+        if lignes is not None:
+            flotte = espace.flotte
+            self.trajectoires_modifiees = bool(np.any(flotte.cap[lignes] != caps)
+                                               or np.any(flotte.vitesse[lignes] != vitesses))
+            flotte.cap[lignes] = caps
+            flotte.vitesse[lignes] = vitesses
+        else:
+            for avion, cap, vitesse in zip(avions, caps.tolist(), vitesses.tolist()):
+                if avion.cap != cap or avion.vitesse != vitesse:
+                    self.trajectoires_modifiees = True
+                avion.cap = cap
+                avion.vitesse = vitesse
+        for avion in avions:
+            if avion.altitude > self.altitude_approche:
+                avion.altitude = self.altitude_approche
+                self.trajectoires_modifiees = True
+
+        infaisables = {h for h, m in zip(handles, marge.tolist()) if m < 0}
+        nouveaux = [avions[k].identifiant for k, h in enumerate(handles) if h in infaisables - self._infaisables]
+        self._infaisables = infaisables
+        return nouveaux
+
+    def _premier_creneau_libre(self, pris: list[int], au_plus_tot: int) -> int:
+        # Un avion prioritaire lointain ne bloque pas la piste : les plus proches se glissent dans les trous.
+        intervalle = self.INTERVALLE_CRENEAU_TICKS
+        creneau = au_plus_tot
+        k = bisect.bisect_left(pris, creneau - intervalle + 1)
+        while k < len(pris) and pris[k] < creneau + intervalle:
+            creneau = pris[k] + intervalle
+            k += 1
+        return creneau
+
+    def autoriser(self, avion: Avion, tick: int) -> bool:
+        return tick >= self.piste_libre_tick and self.creneaux.get(avion.handle, tick) <= tick
+
+    def atterrissage(self, tick: int):
+        self.piste_libre_tick = tick + self.INTERVALLE_CRENEAU_TICKS
@@ -1,14 +1,51 @@
 import random
 import math
 
+def _drapeau(masque: int) -> property:
+    def lire(self) -> bool:
+        return bool(self._drapeaux & masque)
+
+    def ecrire(self, valeur: bool):
+        drapeaux = self._drapeaux | masque if valeur else self._drapeaux & ~masque
+        if drapeaux != self._drapeaux:
+            self._drapeaux = drapeaux
+            self.version += 1
+
+    return property(lire, ecrire)
+
+
 class Avion:
-    def __init__(self, identifiant: str, x: float, y: float, altitude: int):
+    __slots__ = ("handle", "version", "identifiant", "x", "y", "_altitude", "vitesse", "cap",
+                 "carburant", "compteur_tempete", "_drapeaux")
+
+    # Attributs qui changent l'apparence de l'avion sur le radar (hors position).
+    ATTRIBUTS_VISUELS = frozenset({
+        "identifiant", "altitude", "en_vol", "alerte_collision",
+        "instruction_atterrissage", "a_atterri", "incident",
+    })
+
+    EN_VOL = 1 << 0
+    ALERTE_COLLISION = 1 << 1
+    INSTRUCTION_ATTERRISSAGE = 1 << 2
+    A_ATTERRI = 1 << 3
+    INCIDENT = 1 << 4
+
+    en_vol = _drapeau(EN_VOL)
+    alerte_collision = _drapeau(ALERTE_COLLISION)
+    instruction_atterrissage = _drapeau(INSTRUCTION_ATTERRISSAGE)
+    a_atterri = _drapeau(A_ATTERRI)
+    incident = _drapeau(INCIDENT)
+
+    def __init__(self, identifiant: str, x: float, y: float, altitude: int, rng=random):
+        self.handle = -1
+        self.version = 0
+        self._drapeaux = 0
         self.identifiant = identifiant
         self.x = x
         self.y = y
         self.altitude = altitude
-        self.vitesse = random.randint(400, 800)
-        self.cap = random.randint(0, 359)
+        self.vitesse = rng.randint(400, 800)
+        self.cap = rng.randint(0, 359)
         self.carburant = 100.0
         self.en_vol = True
         self.alerte_collision = False
@@ -17,6 +54,16 @@ class Avion:
         self.incident = False
         self.compteur_tempete = 0.0
 
+    @property
+    def altitude(self) -> int:
+        return self._altitude
+
+    @altitude.setter
+    def altitude(self, valeur: int):
+        if getattr(self, "_altitude", None) != valeur:
+            self._altitude = valeur
+            self.version += 1
+
     def deplacer(self, delta_temps_heures: float):
         if delta_temps_heures <= 0 or not self.en_vol:
             return
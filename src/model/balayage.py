@@ -0,0 +1,106 @@
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from model.simulation import Simulation
+
+PARAMETRES_BALAYABLES = (
+    "PROBABILITE_INCIDENT",
+    "PROBABILITE_TEMPETE",
+    "INTERVALLE_APPARITION_AVION",
+    "MAX_AVIONS_EN_VOL",
+)
+
+
+def grille_parametres(**valeurs: list) -> list[dict]:
+    for nom in valeurs:
+        if nom not in PARAMETRES_BALAYABLES:
+            raise ValueError(f"Paramètre inconnu : {nom}")
+    noms = list(valeurs)
+    return [dict(zip(noms, combinaison)) for combinaison in itertools.product(*valeurs.values())]
+
+
+def executer_scenario(parametres: dict, graine: int, ticks: int, checkpoint: str | None = None) -> dict:
+    simulation = Simulation(graine=graine)
+    if checkpoint is not None:
+        # Variante « et si » : on part de l'état sauvegardé et la graine ne sert qu'à diverger ensuite.
+        simulation.load_checkpoint(checkpoint)
+        simulation.rng.seed(graine)
+    for nom, valeur in parametres.items():
+        if nom not in PARAMETRES_BALAYABLES:
+            raise ValueError(f"Paramètre inconnu : {nom}")
+        setattr(simulation, nom, valeur)
+
+    simulation.demarrer()
+    for _ in range(ticks):
+        simulation.mise_a_jour()
+        simulation.evenements.vider()
+
+    return {**parametres, "graine": graine, "ticks": ticks, **simulation.get_stats()}
+
+
+def _executer_job(job: tuple[dict, int, int, str | None]) -> dict:
+    return executer_scenario(*job)
+
+
+def en_colonnes(lignes: list[dict]) -> dict[str, list]:
+    colonnes = {}
+    for ligne in lignes:
+        for nom in ligne:
+            colonnes.setdefault(nom, [])
+    for ligne in lignes:
+        for nom, colonne in colonnes.items():
+            colonne.append(ligne.get(nom))
+    return colonnes
+
+
+def balayer(grille: list[dict], graines, ticks: int, max_workers: int | None = None,
+            checkpoint: str | None = None) -> dict[str, list]:
+    jobs = [(parametres, graine, ticks, checkpoint) for parametres in grille for graine in graines]
+    if not jobs:
+        return {}
+
+    nb_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (nb_workers * 4))
+    with ProcessPoolExecutor(max_workers=nb_workers) as pool:
+        lignes = list(pool.map(_executer_job, jobs, chunksize=chunksize))
+
+    return en_colonnes(lignes)
+
+
+def ecrire_csv(colonnes: dict[str, list], chemin: str):
+    noms = list(colonnes)
+    with open(chemin, "w", newline="", encoding="utf-8") as fichier:
+        writer = csv.writer(fichier)
+        writer.writerow(noms)
+        writer.writerows(zip(*(colonnes[nom] for nom in noms)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage Monte-Carlo de scénarios en parallèle.")
+    parser.add_argument("--ticks", type=int, default=2_000)
+    parser.add_argument("--graines", type=int, default=8, help="Nombre de graines par jeu de paramètres.")
+    parser.add_argument("--incident", type=float, nargs="+", default=[Simulation.PROBABILITE_INCIDENT])
+    parser.add_argument("--tempete", type=float, nargs="+", default=[Simulation.PROBABILITE_TEMPETE])
+    parser.add_argument("--intervalle", type=int, nargs="+", default=[Simulation.INTERVALLE_APPARITION_AVION])
+    parser.add_argument("--max-avions", type=int, nargs="+", default=[Simulation.MAX_AVIONS_EN_VOL])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default=None, help="Partir de ce checkpoint au lieu d'une partie neuve.")
+    parser.add_argument("--csv", default="balayage.csv", help="Fichier de résultats.")
+    args = parser.parse_args(argv)
+
+    grille = grille_parametres(
+        PROBABILITE_INCIDENT=args.incident,
+        PROBABILITE_TEMPETE=args.tempete,
+        INTERVALLE_APPARITION_AVION=args.intervalle,
+        MAX_AVIONS_EN_VOL=args.max_avions,
+    )
+    colonnes = balayer(grille, range(args.graines), args.ticks, args.workers, args.checkpoint)
+    ecrire_csv(colonnes, args.csv)
+    print(f"{len(colonnes.get('graine', []))} scénarios écrits dans {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import json
+import math
+
+import numpy as np
+
+from model.avion import Avion
+from model.espace_aerien import ZoneTempete
+from model.prediction import ConflitPrevu
+
+MAGIC = b"ATCK"
+VERSION_FORMAT = 3
+
+DTYPE_ENTETE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("en_cours", "u1"),
+    ("tick", "<u8"),
+    ("score", "<i8"),
+    ("avions_atterris", "<i8"),
+    ("avions_entres", "<i8"),
+    ("avions_perdus", "<i8"),
+    ("collisions_evitees", "<i8"),
+    ("prochain_handle", "<u8"),
+    ("prochain_numero_tempete", "<u8"),
+    ("vitesse_simulation", "<f8"),
+    ("avance_rapide", "<u4"),
+    ("nb_avions", "<u4"),
+    ("nb_tempetes", "<u4"),
+    ("nb_conflits", "<u4"),
+    ("nb_conflits_prevus", "<u4"),
+    ("gauss_suivant", "<f8"),
+    ("taille_rng_numpy", "<u4"),
+    ("taille_x", "<f8"),
+    ("taille_y", "<f8"),
+    ("piste_libre_tick", "<u8"),
+])
+
+# Contrairement au journal, tout est en pleine précision : une partie reprise doit continuer à l'identique.
+DTYPE_AVION = np.dtype([
+    ("handle", "<u8"),
+    ("version", "<u8"),
+    ("identifiant", "S16"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("altitude", "<i8"),
+    ("vitesse", "<i8"),
+    ("cap", "<i8"),
+    ("carburant", "<f8"),
+    ("compteur_tempete", "<f8"),
+    ("drapeaux", "u1"),
+])
+
+DTYPE_TEMPETE = np.dtype([
+    ("numero", "<u8"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("rayon", "<i8"),
+    ("duree_vie", "<i8"),
+    ("expiration", "<i8"),
+])
+
+DTYPE_CONFLIT_PREVU = np.dtype([("id1", "S16"), ("id2", "S16"), ("eta_ticks", "<f8"), ("distance_min", "<f8")])
+
+# État de random.Random : 624 mots du Mersenne Twister et la position courante.
+TAILLE_ETAT_RNG = 625
+
+DRAPEAUX = (
+    ("en_vol", Avion.EN_VOL),
+    ("alerte_collision", Avion.ALERTE_COLLISION),
+    ("instruction_atterrissage", Avion.INSTRUCTION_ATTERRISSAGE),
+    ("a_atterri", Avion.A_ATTERRI),
+    ("incident", Avion.INCIDENT),
+)
+
+COLONNES_AVION = ("x", "y", "altitude", "vitesse", "cap", "carburant", "compteur_tempete")
+
+
+def _tableau_avions(avions: list[Avion]) -> np.ndarray:
+    tableau = np.empty(len(avions), dtype=DTYPE_AVION)
+    if not avions:
+        return tableau
+    tableau["handle"] = [a.handle for a in avions]
+    tableau["version"] = [a.version for a in avions]
+    tableau["identifiant"] = [a.identifiant.encode() for a in avions]
+    for nom in COLONNES_AVION:
+        tableau[nom] = [getattr(a, nom) for a in avions]
+    drapeaux = np.zeros(len(avions), dtype=np.uint8)
+    for nom, masque in DRAPEAUX:
+        drapeaux[np.array([getattr(a, nom) for a in avions], dtype=bool)] |= masque
+    tableau["drapeaux"] = drapeaux
+    return tableau
+
+
+def sauver(simulation, chemin: str):
+    espace = simulation.espace
+    avions = _tableau_avions(espace.avions)
+    tempetes = np.array([(t.numero, t.x, t.y, t.rayon, t.duree_vie, t.expiration) for t in espace.tempetes],
+                        dtype=DTYPE_TEMPETE)
+    conflits = np.array(sorted(espace.conflits_actifs), dtype="<u8")
+    conflits_prevus = np.array([(c.id1.encode(), c.id2.encode(), c.eta_ticks, c.distance_min)
+                                for c in simulation.conflits_prevus], dtype=DTYPE_CONFLIT_PREVU)
+
+    _, etat_rng, gauss_suivant = simulation.rng.getstate()
+    etat_numpy = b""
+    if simulation.rng_numpy is not None:
+        etat_numpy = json.dumps(simulation.rng_numpy.bit_generator.state).encode()
+
+    entete = np.array([(
+        MAGIC, VERSION_FORMAT, simulation.en_cours, simulation.tick_compteur,
+        simulation.score, simulation.avions_atterris_reussis, simulation.avions_entres,
+        simulation.avions_perdus_collision, espace.collisions_evitees,
+        espace.registre.prochain_handle, espace.prochain_numero_tempete,
+        simulation.vitesse_simulation, simulation.avance_rapide,
+        len(avions), len(tempetes), len(conflits), len(conflits_prevus),
+        math.nan if gauss_suivant is None else gauss_suivant, len(etat_numpy),
+        simulation.taille_x, simulation.taille_y, simulation.arrivees.piste_libre_tick,
+    )], dtype=DTYPE_ENTETE)
+
+    with open(chemin, "wb") as fichier:
+        fichier.write(entete.tobytes())
+        fichier.write(np.array(etat_rng, dtype="<u4").tobytes())
+        fichier.write(etat_numpy)
+        fichier.write(avions.tobytes())
+        fichier.write(tempetes.tobytes())
+        fichier.write(conflits.tobytes())
+        fichier.write(conflits_prevus.tobytes())
+
+
+def _restaurer_avions(simulation, avions: np.ndarray) -> list[Avion]:
+    identifiants = [i.decode() for i in avions["identifiant"].tolist()]
+    handles = avions["handle"].tolist()
+    versions = avions["version"].tolist()
+    flotte = simulation.espace.flotte
+
+    if flotte is not None:
+        colonnes = {nom: avions[nom] for nom in ("handle",) + COLONNES_AVION}
+        for nom, masque in DRAPEAUX:
+            colonnes[nom] = (avions["drapeaux"] & masque) != 0
+        restaures = flotte.restaurer(colonnes)
+        for avion, identifiant, version in zip(restaures, identifiants, versions):
+            avion.identifiant = identifiant
+            avion.version = version
+        return restaures
+
+    # Construction directe des slots : pas de tirage aléatoire ni de compteur de version incrémenté.
+    restaures = []
+    for identifiant, handle, version, x, y, altitude, vitesse, cap, carburant, compteur, drapeaux in zip(
+            identifiants, handles, versions, *(avions[nom].tolist() for nom in COLONNES_AVION),
+            avions["drapeaux"].tolist()):
+        avion = Avion.__new__(Avion)
+        avion.handle = handle
+        avion.version = version
+        avion.identifiant = identifiant
+        avion.x = x
+        avion.y = y
+        avion._altitude = altitude
+        avion.vitesse = vitesse
+        avion.cap = cap
+        avion.carburant = carburant
+        avion.compteur_tempete = compteur
+        avion._drapeaux = drapeaux
+        restaures.append(avion)
+    return restaures
+
+
+def charger(simulation, chemin: str):
+    with open(chemin, "rb") as fichier:
+        donnees = fichier.read()
+
+    entete = np.frombuffer(donnees, dtype=DTYPE_ENTETE, count=1)[0]
+    if entete["magic"] != MAGIC:
+        raise ValueError(f"{chemin} n'est pas un checkpoint de simulation.")
+    if entete["version"] != VERSION_FORMAT:
+        raise ValueError(f"Version de checkpoint non supportée : {entete['version']} (attendue {VERSION_FORMAT}).")
+    if (entete["taille_x"], entete["taille_y"]) != (simulation.taille_x, simulation.taille_y):
+        raise ValueError(f"Checkpoint d'un espace {entete['taille_x']:g}x{entete['taille_y']:g}, "
+                         f"simulation configurée en {simulation.taille_x:g}x{simulation.taille_y:g}.")
+
+    offset = DTYPE_ENTETE.itemsize
+    etat_rng = np.frombuffer(donnees, dtype="<u4", count=TAILLE_ETAT_RNG, offset=offset)
+    offset += etat_rng.nbytes
+    etat_numpy = donnees[offset:offset + int(entete["taille_rng_numpy"])]
+    offset += len(etat_numpy)
+    avions = np.frombuffer(donnees, dtype=DTYPE_AVION, count=int(entete["nb_avions"]), offset=offset)
+    offset += avions.nbytes
+    tempetes = np.frombuffer(donnees, dtype=DTYPE_TEMPETE, count=int(entete["nb_tempetes"]), offset=offset)
+    offset += tempetes.nbytes
+    conflits = np.frombuffer(donnees, dtype="<u8", count=int(entete["nb_conflits"]), offset=offset)
+    offset += conflits.nbytes
+    conflits_prevus = np.frombuffer(donnees, dtype=DTYPE_CONFLIT_PREVU, count=int(entete["nb_conflits_prevus"]),
+                                    offset=offset)
+
+    espace = simulation.espace = simulation._creer_espace()
+    espace.registre.restaurer(_restaurer_avions(simulation, avions), int(entete["prochain_handle"]))
+
+    zones = []
+    for numero, x, y, rayon, duree_vie, expiration in tempetes.tolist():
+        zone = ZoneTempete(x, y, rayon, duree_vie, expiration)
+        zone.numero = numero
+        zones.append(zone)
+    espace.restaurer_tempetes(zones, int(entete["prochain_numero_tempete"]))
+
+    espace.conflits_actifs = set(conflits.tolist())
+    espace.collisions_evitees = int(entete["collisions_evitees"])
+
+    simulation.conflits_prevus = [ConflitPrevu(id1.decode(), id2.decode(), eta, distance)
+                                  for id1, id2, eta, distance in conflits_prevus.tolist()]
+    # Pas de sous-pas fusionné avant la prochaine prédiction.
+    simulation.entree_separation = 0.0
+
+    simulation.en_cours = bool(entete["en_cours"])
+    simulation.tick_compteur = int(entete["tick"])
+    simulation.score = int(entete["score"])
+    simulation.avions_atterris_reussis = int(entete["avions_atterris"])
+    simulation.avions_entres = int(entete["avions_entres"])
+    simulation.avions_perdus_collision = int(entete["avions_perdus"])
+    simulation.vitesse_simulation = float(entete["vitesse_simulation"])
+    simulation.avance_rapide = int(entete["avance_rapide"])
+    # Créneaux et séquence sont recalculés au tick suivant à partir des avions autorisés.
+    simulation.arrivees.reinitialiser()
+    simulation.arrivees.piste_libre_tick = int(entete["piste_libre_tick"])
+    # L'historique des trajectoires n'est pas sauvegardé : les traînées repartent de la position chargée.
+    if simulation.historique is not None:
+        simulation.historique.reinitialiser()
+
+    gauss_suivant = float(entete["gauss_suivant"])
+    simulation.rng.setstate((3, tuple(etat_rng.tolist()), None if math.isnan(gauss_suivant) else gauss_suivant))
+    if etat_numpy:
+        etat = json.loads(etat_numpy)
+        if simulation.rng_numpy is None:
+            simulation.rng_numpy = np.random.Generator(getattr(np.random, etat["bit_generator"])())
+        simulation.rng_numpy.bit_generator.state = etat
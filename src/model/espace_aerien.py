@@ -1,15 +1,26 @@
 from model.avion import Avion
+from model.flotte import Flotte
+from model.registre import RegistreAvions
+from operator import attrgetter
+import heapq
 import math
 import random
 
+import numpy as np
+
 
 class ZoneTempete:
+    __slots__ = ("x", "y", "rayon", "duree_vie", "expiration", "numero")
 
-    def __init__(self, x, y, rayon, duree_vie):
+    def __init__(self, x, y, rayon, duree_vie, expiration=None):
         self.x = x
         self.y = y
         self.rayon = rayon
         self.duree_vie = duree_vie
+        # Premier tick sans la tempête : `expirer_tempetes` la retire dès que `expiration <= tick`.
+        self.expiration = expiration if expiration is not None else duree_vie - 1
+        # Attribué par l'espace aérien à l'ajout, unique pour toute la durée de la simulation.
+        self.numero = -1
 
 
 class EspaceAerien:
@@ -28,109 +39,256 @@ class EspaceAerien:
     ZONE_APPROCHE_RAYON = 150
     ALTITUDE_APPROCHE_MAX = 1500
 
-    def __init__(self):
-        self.avions: list[Avion] = []
+    TAILLE_CELLULE_TEMPETE = 100
+
+    # Une paire de conflit est codée sur un entier : (plus petite poignée << 32) | plus grande.
+    DECALAGE_PAIRE = 32
+    MASQUE_PAIRE = (1 << DECALAGE_PAIRE) - 1
+
+    def __init__(self, flotte: Flotte | None = None, rng=random, taille_x: float = TAILLE_X,
+                 taille_y: float = TAILLE_Y, secteurs=None):
+        self.flotte = flotte
+        self.rng = rng
+        self.taille_x = taille_x
+        self.taille_y = taille_y
+        # Un seul aéroport, toujours au centre de l'espace.
+        self.aeroport_x = taille_x / 2
+        self.aeroport_y = taille_y / 2
+        # Partition en secteurs (PartitionSecteurs) : si présente, la détection de collisions lui est déléguée.
+        self.secteurs = secteurs
+        self.registre = RegistreAvions()
         self.tempetes: list[ZoneTempete] = []
+        self._index_tempetes: dict[tuple[int, int], list[ZoneTempete]] = {}
+        # Version dense de l'index pour `masque_tempetes`, reconstruite au premier appel après un changement.
+        self._grille_tempetes = None
+        self._expirations_tempetes = []
+        self.prochain_numero_tempete = 0
 
-        self.conflits_actifs = set()
+        self.conflits_actifs: set[int] = set()
         self.collisions_evitees = 0
 
+    @property
+    def avions(self) -> list[Avion]:
+        return self.registre.avions
+
+    def colonnes(self, *noms: str) -> list[np.ndarray]:
+        # Registre et flotte retirent par échange avec le dernier : la ligne k de la flotte est `avions[k]`.
+        # En mode flotte, ce sont des vues sur les colonnes vivantes, à ne pas modifier.
+        n = len(self.avions)
+        if self.flotte is not None:
+            return [getattr(self.flotte, nom)[:n] for nom in noms]
+        return [np.fromiter(map(attrgetter(nom), self.avions), dtype=Flotte.COLONNES[nom], count=n) for nom in noms]
+
     def ajouter_avion(self, avion: Avion):
-        self.avions.append(avion)
+        self.registre.ajouter(avion)
+
+    def trouver_avion(self, identifiant: str) -> Avion | None:
+        return self.registre.par_identifiant(identifiant)
+
+    def creer_avion(self, identifiant: str, x: float, y: float, altitude: int) -> Avion:
+        if self.flotte is not None:
+            return self.flotte.creer_avion(identifiant, x, y, altitude, self.rng)
+        return Avion(identifiant, x, y, altitude, self.rng)
+
+    def retirer_avions(self, avions_a_retirer: list[Avion]):
+        for avion in avions_a_retirer:
+            if self.registre.retirer(avion) and self.flotte is not None:
+                self.flotte.retirer(avion)
+
+    def _nouvel_identifiant(self) -> str:
+        for _ in range(10):
+            identifiant = f"AV{self.rng.randint(1000, 9999)}"
+            if identifiant not in self.registre:
+                return identifiant
+        # Espace presque saturé en identifiants à 4 chiffres : on passe à une numérotation séquentielle.
+        return f"AV{10000 + self.registre.prochain_handle}"
 
     def generer_avion_aleatoire(self, force_conflit=False):
-        identifiant = f"AV{random.randint(1000, 9999)}"
+        identifiant = self._nouvel_identifiant()
         MARGE = 100.0
 
         x, y, altitude = 0, 0, 0
 
         conflit_cree = False
         if force_conflit and len(self.avions) > 0:
-            cible = random.choice(self.avions)
-            angle = random.uniform(0, 2 * math.pi)
+            cible = self.rng.choice(self.avions)
+            angle = self.rng.uniform(0, 2 * math.pi)
             x = cible.x + math.cos(angle) * 40
             y = cible.y + math.sin(angle) * 40
             altitude = cible.altitude
 
-            if MARGE < x < self.TAILLE_X - MARGE and MARGE < y < self.TAILLE_Y - MARGE:
+            if MARGE < x < self.taille_x - MARGE and MARGE < y < self.taille_y - MARGE:
                 conflit_cree = True
 
 
         if not conflit_cree:
-            X_MIN, X_MAX = MARGE, self.TAILLE_X - MARGE
-            Y_MIN, Y_MAX = MARGE, self.TAILLE_Y - MARGE
-            x = random.uniform(X_MIN, X_MAX)
-            y = random.uniform(Y_MIN, Y_MAX)
-            altitude = random.randrange(1000, 5500, 500)
+            X_MIN, X_MAX = MARGE, self.taille_x - MARGE
+            Y_MIN, Y_MAX = MARGE, self.taille_y - MARGE
+            x = self.rng.uniform(X_MIN, X_MAX)
+            y = self.rng.uniform(Y_MIN, Y_MAX)
+            altitude = self.rng.randrange(1000, 5500, 500)
 
-        avion = Avion(identifiant, x, y, altitude)
+        avion = self.creer_avion(identifiant, x, y, altitude)
         self.ajouter_avion(avion)
         return avion
 
-    def generer_tempete(self):
-        x = random.uniform(100, self.TAILLE_X - 100)
-        y = random.uniform(100, self.TAILLE_Y - 100)
-        rayon = random.randint(50, 120)
-        duree = random.randint(200, 600)
-        nouvelle_tempete = ZoneTempete(x, y, rayon, duree)
-        self.tempetes.append(nouvelle_tempete)
+    def generer_tempete(self, tick: int = 0):
+        x = self.rng.uniform(100, self.taille_x - 100)
+        y = self.rng.uniform(100, self.taille_y - 100)
+        rayon = self.rng.randint(50, 120)
+        duree = self.rng.randint(200, 600)
+        nouvelle_tempete = ZoneTempete(x, y, rayon, duree, tick + duree - 1)
+        self.ajouter_tempete(nouvelle_tempete)
         return nouvelle_tempete
 
-    def detecter_collisions(self) -> list[Avion]:
-        crashed_planes = set()
-        nouveaux_conflits = set()
-
-        for avion in self.avions:
-            avion.alerte_collision = False
+    def _cellules_tempete(self, tempete: ZoneTempete):
+        taille = self.TAILLE_CELLULE_TEMPETE
+        for cx in range(int((tempete.x - tempete.rayon) // taille), int((tempete.x + tempete.rayon) // taille) + 1):
+            for cy in range(int((tempete.y - tempete.rayon) // taille), int((tempete.y + tempete.rayon) // taille) + 1):
+                yield cx, cy
+
+    def ajouter_tempete(self, tempete: ZoneTempete):
+        tempete.numero = self.prochain_numero_tempete
+        self.prochain_numero_tempete += 1
+        self._indexer_tempete(tempete)
+
+    def _indexer_tempete(self, tempete: ZoneTempete):
+        self.tempetes.append(tempete)
+        self._grille_tempetes = None
+        for cle in self._cellules_tempete(tempete):
+            self._index_tempetes.setdefault(cle, []).append(tempete)
+        heapq.heappush(self._expirations_tempetes, (tempete.expiration, tempete.numero, tempete))
+
+    def restaurer_tempetes(self, tempetes: list[ZoneTempete], prochain_numero: int):
+        # Les tempêtes gardent leur numéro : l'ordre d'expiration à égalité de tick est conservé.
+        for tempete in tempetes:
+            self._indexer_tempete(tempete)
+        self.prochain_numero_tempete = prochain_numero
+
+    def retirer_tempete(self, tempete: ZoneTempete):
+        # L'entrée du tas est laissée en place et ignorée à son expiration.
+        if tempete not in self.tempetes:
+            return
+        self.tempetes.remove(tempete)
+        self._grille_tempetes = None
+        for cle in self._cellules_tempete(tempete):
+            cellule = self._index_tempetes[cle]
+            cellule.remove(tempete)
+            if not cellule:
+                del self._index_tempetes[cle]
+
+    def expirer_tempetes(self, tick: int):
+        while self._expirations_tempetes and self._expirations_tempetes[0][0] <= tick:
+            _, _, tempete = heapq.heappop(self._expirations_tempetes)
+            self.retirer_tempete(tempete)
+
+    # Demi-voisinage d'une cellule : chaque paire de cellules voisines n'est visitée qu'une fois.
+    VOISINS_GRILLE = [(dx, dy, dz)
+                      for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                      if (dx, dy, dz) > (0, 0, 0)]
 
-        avions_par_id = {a.identifiant: a for a in self.avions}
-
-        for i, a1 in enumerate(self.avions):
-            for a2 in self.avions[i + 1:]:
-                dist_lat = self.distance_laterale(a1, a2)
-                dist_alt = abs(a1.altitude - a2.altitude)
-
-                pair_id = tuple(sorted((a1.identifiant, a2.identifiant)))
-
-                if dist_lat < self.DISTANCE_CRASH_LAT and dist_alt < self.DISTANCE_CRASH_ALT:
-                    crashed_planes.add(a1)
-                    crashed_planes.add(a2)
-
-                elif dist_lat < self.DISTANCE_MIN_LAT and dist_alt < self.DISTANCE_MIN_ALT:
-                    a1.alerte_collision = True
-                    a2.alerte_collision = True
-                    nouveaux_conflits.add(pair_id)
+    def detecter_collisions(self) -> list[Avion]:
+        if self.secteurs is not None:
+            crashed_planes, nouveaux_conflits, en_alerte = self.secteurs.detecter(self)
+        else:
+            crashed_planes, nouveaux_conflits, en_alerte = self._evaluer_paires()
+
+        if self.flotte is not None:
+            alertes = np.zeros(len(self.avions), dtype=bool)
+            alertes[[avion._index for avion in en_alerte]] = True
+            self.flotte.affecter("alerte_collision", alertes)
+        else:
+            for avion in self.avions:
+                avion.alerte_collision = avion in en_alerte
 
         conflits_resolus = self.conflits_actifs - nouveaux_conflits
 
-        for id1, id2 in conflits_resolus:
-            if id1 in avions_par_id and id2 in avions_par_id:
-                a1 = avions_par_id[id1]
-                a2 = avions_par_id[id2]
+        for paire in conflits_resolus:
+            a1 = self.registre.par_handle(paire >> self.DECALAGE_PAIRE)
+            a2 = self.registre.par_handle(paire & self.MASQUE_PAIRE)
+            if a1 is not None and a2 is not None:
                 if a1 not in crashed_planes and a2 not in crashed_planes:
                     self.collisions_evitees += 1
 
 
         self.conflits_actifs = nouveaux_conflits
 
-        return list(crashed_planes)
+        # Ordre stable (l'ordre d'un set d'objets dépend des adresses mémoire) pour que les graines soient rejouables.
+        return sorted(crashed_planes, key=lambda avion: avion.handle)
+
+    def _evaluer_paires(self) -> tuple[set[Avion], set[int], set[Avion]]:
+        # Même noyau que les secteurs : un seul secteur dont tous les avions sont propriétaires.
+        handles, x, y, altitude = self.colonnes("handle", "x", "y", "altitude")
+        crashes, conflits, alertes = detecter_secteur(handles, x, y, altitude, len(handles))
+
+        par_handle = self.registre.par_handle
+        return {par_handle(h) for h in crashes}, set(conflits), {par_handle(h) for h in alertes}
 
     def verifier_tempete(self, avion: Avion) -> bool:
-        for tempete in self.tempetes:
-            dist = math.sqrt((avion.x - tempete.x) ** 2 + (avion.y - tempete.y) ** 2)
-            if dist < tempete.rayon:
+        cle = (int(avion.x // self.TAILLE_CELLULE_TEMPETE), int(avion.y // self.TAILLE_CELLULE_TEMPETE))
+        for tempete in self._index_tempetes.get(cle, ()):
+            dx = avion.x - tempete.x
+            dy = avion.y - tempete.y
+            if dx * dx + dy * dy < tempete.rayon * tempete.rayon:
                 return True
         return False
 
+    def _construire_grille_tempetes(self):
+        # Grille dense sur l'emprise de l'index : (début, nombre) des entrées de chaque cellule dans tx/ty/rayons2.
+        if self._grille_tempetes is None:
+            coins = np.array(list(self._index_tempetes), dtype=np.int64)
+            origine = coins.min(axis=0)
+            forme = tuple((coins.max(axis=0) - origine + 1).tolist())
+            debuts = np.zeros(forme, dtype=np.int64)
+            nombres = np.zeros(forme, dtype=np.int64)
+            entrees = []
+            for (cx, cy), tempetes in self._index_tempetes.items():
+                debuts[cx - origine[0], cy - origine[1]] = len(entrees)
+                nombres[cx - origine[0], cy - origine[1]] = len(tempetes)
+                entrees.extend((t.x, t.y, t.rayon * t.rayon) for t in tempetes)
+            tx, ty, rayons2 = np.array(entrees, dtype=np.float64).T
+            self._grille_tempetes = (origine, debuts, nombres, tx, ty, rayons2)
+        return self._grille_tempetes
+
+    def masque_tempetes(self) -> np.ndarray:
+        # Aligné sur `avions`.
+        masque = np.zeros(len(self.avions), dtype=bool)
+        if not self.tempetes or not self.avions:
+            return masque
+
+        x, y = self.colonnes("x", "y")
+        # Chaque avion ne teste que les tempêtes de sa cellule.
+        origine, debuts_grille, nombres_grille, tx, ty, rayons2 = self._construire_grille_tempetes()
+        forme = debuts_grille.shape
+        taille = self.TAILLE_CELLULE_TEMPETE
+        cx = np.floor(x / taille).astype(np.int64) - origine[0]
+        cy = np.floor(y / taille).astype(np.int64) - origine[1]
+        dans_emprise = np.flatnonzero((cx >= 0) & (cx < forme[0]) & (cy >= 0) & (cy < forme[1]))
+        debuts = debuts_grille[cx[dans_emprise], cy[dans_emprise]]
+        nombres = nombres_grille[cx[dans_emprise], cy[dans_emprise]]
+        total = int(nombres.sum())
+        if total == 0:
+            return masque
+
+        indices = np.repeat(dans_emprise, nombres)
+        tempetes = np.repeat(debuts, nombres) + np.arange(total) - np.repeat(np.cumsum(nombres) - nombres, nombres)
+        dedans = (x[indices] - tx[tempetes]) ** 2 + (y[indices] - ty[tempetes]) ** 2 < rayons2[tempetes]
+        masque[indices[dedans]] = True
+        return masque
+
     def distance_laterale(self, a1: Avion, a2: Avion) -> float:
         return math.sqrt((a1.x - a2.x) ** 2 + (a1.y - a2.y) ** 2)
 
+    def cap_vers_aeroport(self, x: float, y: float) -> int:
+        angle_deg = math.degrees(math.atan2(self.aeroport_y - y, self.aeroport_x - x))
+        if angle_deg < 0: angle_deg += 360
+        return int(angle_deg)
+
     def tenter_atterrissage(self, avion: Avion) -> bool:
         if not avion.instruction_atterrissage:
             return False
 
-        aeroport_temp = Avion("", self.AEROPORT_X, self.AEROPORT_Y, 0)
-        dist_aeroport = self.distance_laterale(avion, aeroport_temp)
+        dist_aeroport = math.hypot(avion.x - self.aeroport_x, avion.y - self.aeroport_y)
 
         if dist_aeroport > self.ZONE_APPROCHE_RAYON:
             return False
@@ -140,4 +298,68 @@ class EspaceAerien:
 
         avion.en_vol = False
         avion.a_atterri = True
-        return True
\ No newline at end of file
+        return True
+
+
+def _paires_grille(x: list[float], y: list[float], altitude: list[int]):
+    grille = {}
+    for i in range(len(x)):
+        cle = (int(x[i] // EspaceAerien.DISTANCE_MIN_LAT),
+               int(y[i] // EspaceAerien.DISTANCE_MIN_LAT),
+               int(altitude[i] // EspaceAerien.DISTANCE_MIN_ALT))
+        cellule = grille.get(cle)
+        if cellule is None:
+            grille[cle] = [i]
+        else:
+            cellule.append(i)
+
+    for (cx, cy, cz), cellule in grille.items():
+        for k, i in enumerate(cellule):
+            for j in cellule[k + 1:]:
+                yield i, j
+        for dx, dy, dz in EspaceAerien.VOISINS_GRILLE:
+            voisine = grille.get((cx + dx, cy + dy, cz + dz))
+            if voisine is None:
+                continue
+            for i in cellule:
+                for j in voisine:
+                    yield i, j
+
+
+def detecter_secteur(handles: np.ndarray, x: np.ndarray, y: np.ndarray, altitude: np.ndarray,
+                     nb_proprietaires: int) -> tuple[list[int], list[int], list[int]]:
+    # Exécutée dans un processus de travail : uniquement des tableaux, pas d'objets Avion.
+    # Les `nb_proprietaires` premiers avions appartiennent au secteur, les suivants forment le halo.
+    handles = handles.tolist()
+    x = x.tolist()
+    y = y.tolist()
+    altitude = altitude.tolist()
+
+    crashes = set()
+    conflits = set()
+    alertes = set()
+    crash_lat_2 = EspaceAerien.DISTANCE_CRASH_LAT ** 2
+    min_lat_2 = EspaceAerien.DISTANCE_MIN_LAT ** 2
+
+    for i, j in _paires_grille(x, y, altitude):
+        # Paire entièrement dans le halo : c'est au secteur voisin de la traiter.
+        if i >= nb_proprietaires and j >= nb_proprietaires:
+            continue
+        dist_alt = abs(altitude[i] - altitude[j])
+        if dist_alt >= EspaceAerien.DISTANCE_MIN_ALT:
+            continue
+
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        dist_lat_2 = dx * dx + dy * dy
+
+        if dist_lat_2 < crash_lat_2 and dist_alt < EspaceAerien.DISTANCE_CRASH_ALT:
+            crashes.add(handles[i])
+            crashes.add(handles[j])
+        elif dist_lat_2 < min_lat_2:
+            alertes.add(handles[i])
+            alertes.add(handles[j])
+            h1, h2 = sorted((handles[i], handles[j]))
+            conflits.add((h1 << EspaceAerien.DECALAGE_PAIRE) | h2)
+
+    return list(crashes), list(conflits), list(alertes)
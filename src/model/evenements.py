@@ -0,0 +1,88 @@
+import collections
+import json
+import queue
+import threading
+from typing import Callable, NamedTuple
+
+
+class Evenement(NamedTuple):
+    tick: int
+    type: str
+    texte: str
+    identifiant: str | None = None
+
+
+class BusEvenements:
+    """Tampon circulaire borné : au-delà de la capacité, les plus anciens évènements sont perdus et comptés."""
+
+    CAPACITE = 10_000
+
+    def __init__(self, capacite: int = CAPACITE):
+        self.capacite = capacite
+        self._tampon: collections.deque[Evenement] = collections.deque(maxlen=capacite)
+        self.perdus = 0
+        self._abonnes: list[Callable[[Evenement], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._tampon)
+
+    def abonner(self, abonne: Callable[[Evenement], None]):
+        self._abonnes.append(abonne)
+
+    def desabonner(self, abonne: Callable[[Evenement], None]):
+        if abonne in self._abonnes:
+            self._abonnes.remove(abonne)
+
+    def publier(self, evenement: Evenement):
+        if len(self._tampon) == self.capacite:
+            self.perdus += 1
+        self._tampon.append(evenement)
+        for abonne in self._abonnes:
+            abonne(evenement)
+
+    def vider(self) -> list[Evenement]:
+        # popleft est atomique : le thread de simulation peut publier pendant que l'UI vide le tampon.
+        evenements = []
+        tampon = self._tampon
+        while tampon:
+            try:
+                evenements.append(tampon.popleft())
+            except IndexError:
+                break
+        return evenements
+
+
+class PuitsJsonLignes:
+    """Écrit chaque évènement sur une ligne JSON depuis un thread dédié, sans bloquer l'émetteur."""
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self._file = queue.SimpleQueue()
+        self._fichier = open(chemin, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._boucle, name="puits-evenements", daemon=True)
+        self._thread.start()
+
+    def __call__(self, evenement: Evenement):
+        self._file.put(evenement)
+
+    def _boucle(self):
+        while True:
+            evenement = self._file.get()
+            lignes = []
+            # On écrit par lots : tout ce qui est arrivé pendant l'écriture précédente part en une fois.
+            while evenement is not None:
+                lignes.append(json.dumps(evenement._asdict(), ensure_ascii=False))
+                try:
+                    evenement = self._file.get_nowait()
+                except queue.Empty:
+                    break
+            if lignes:
+                self._fichier.write("\n".join(lignes) + "\n")
+                self._fichier.flush()
+            if evenement is None:
+                return
+
+    def fermer(self):
+        self._file.put(None)
+        self._thread.join()
+        self._fichier.close()
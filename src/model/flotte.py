@@ -0,0 +1,153 @@
+import random
+
+import numpy as np
+
+from model.avion import Avion
+
+
+class Flotte:
+    CAPACITE_INITIALE = 64
+
+    COLONNES = {
+        "handle": np.int64,
+        "x": np.float64,
+        "y": np.float64,
+        "altitude": np.int64,
+        "vitesse": np.int64,
+        "cap": np.int64,
+        "carburant": np.float64,
+        "compteur_tempete": np.float64,
+        "en_vol": np.bool_,
+        "alerte_collision": np.bool_,
+        "instruction_atterrissage": np.bool_,
+        "a_atterri": np.bool_,
+        "incident": np.bool_,
+    }
+
+    def __init__(self, capacite: int = CAPACITE_INITIALE):
+        self.taille = 0
+        self.capacite = max(1, capacite)
+        self.avions: list["AvionFlotte"] = []
+        for nom, dtype in self.COLONNES.items():
+            setattr(self, nom, np.zeros(self.capacite, dtype=dtype))
+
+    def _agrandir(self):
+        self.capacite *= 2
+        for nom in self.COLONNES:
+            ancienne = getattr(self, nom)
+            nouvelle = np.zeros(self.capacite, dtype=ancienne.dtype)
+            nouvelle[:self.taille] = ancienne[:self.taille]
+            setattr(self, nom, nouvelle)
+
+    def creer_avion(self, identifiant: str, x: float, y: float, altitude: int, rng=random) -> "AvionFlotte":
+        if self.taille == self.capacite:
+            self._agrandir()
+        # La ligne peut contenir l'état d'un avion retiré : on la remet à zéro pour que `version` n'en dépende pas.
+        for nom in self.COLONNES:
+            getattr(self, nom)[self.taille] = 0
+        avion = AvionFlotte(self, self.taille, identifiant, x, y, altitude, rng)
+        self.avions.append(avion)
+        self.taille += 1
+        return avion
+
+    def restaurer(self, colonnes: dict[str, np.ndarray]) -> list["AvionFlotte"]:
+        # Chargement en bloc : les colonnes sont copiées d'un coup, les vues sont créées sans tirage aléatoire.
+        n = len(next(iter(colonnes.values())))
+        self.capacite = max(self.CAPACITE_INITIALE, n)
+        self.taille = n
+        for nom, dtype in self.COLONNES.items():
+            colonne = np.zeros(self.capacite, dtype=dtype)
+            colonne[:n] = colonnes[nom]
+            setattr(self, nom, colonne)
+
+        self.avions = []
+        for index in range(n):
+            avion = AvionFlotte.__new__(AvionFlotte)
+            avion._flotte = self
+            avion._index = index
+            avion._valeurs = None
+            avion._drapeaux = 0
+            self.avions.append(avion)
+        return self.avions
+
+    def retirer(self, avion: "AvionFlotte"):
+        if avion._flotte is not self:
+            return
+
+        index = avion._index
+        dernier = self.taille - 1
+        avion._detacher()
+
+        if index != dernier:
+            for nom in self.COLONNES:
+                colonne = getattr(self, nom)
+                colonne[index] = colonne[dernier]
+            deplace = self.avions[dernier]
+            deplace._index = index
+            self.avions[index] = deplace
+
+        self.avions.pop()
+        self.taille -= 1
+
+    def affecter(self, nom: str, valeurs: np.ndarray):
+        # Écriture d'une colonne entière ; comme la propriété, un attribut visuel modifié incrémente `version`.
+        colonne = getattr(self, nom)[:self.taille]
+        if nom in Avion.ATTRIBUTS_VISUELS:
+            for index in np.flatnonzero(colonne != valeurs).tolist():
+                self.avions[index].version += 1
+        colonne[:] = valeurs
+
+    def deplacer_tous(self, delta_temps_heures: float):
+        if delta_temps_heures <= 0 or self.taille == 0:
+            return
+
+        n = self.taille
+        en_vol = self.en_vol[:n]
+
+        rad = np.radians(self.cap[:n])
+        distance_parcourue = self.vitesse[:n] * (delta_temps_heures * 100)
+        self.x[:n] += np.where(en_vol, np.cos(rad) * distance_parcourue, 0.0)
+        self.y[:n] += np.where(en_vol, np.sin(rad) * distance_parcourue, 0.0)
+
+        carburant = self.carburant[:n]
+        carburant[en_vol] = np.maximum(0.0, carburant[en_vol] - (10.0 * delta_temps_heures))
+        self.cap[:n] %= 360
+
+
+def _colonne(nom: str) -> property:
+    def lire(self):
+        if self._flotte is None:
+            return self._valeurs[nom]
+        return getattr(self._flotte, nom)[self._index].item()
+
+    def ecrire(self, valeur):
+        if nom in Avion.ATTRIBUTS_VISUELS and lire(self) != valeur:
+            self.version += 1
+        if self._flotte is None:
+            self._valeurs[nom] = valeur
+        else:
+            getattr(self._flotte, nom)[self._index] = valeur
+
+    return property(lire, ecrire)
+
+
+class AvionFlotte(Avion):
+    """Vue sur une ligne de la `Flotte` : l'état cinématique vit dans les colonnes NumPy."""
+    __slots__ = ("_flotte", "_index", "_valeurs")
+
+    def __init__(self, flotte: Flotte, index: int, identifiant: str, x: float, y: float, altitude: int,
+                 rng=random):
+        self._flotte = flotte
+        self._index = index
+        self._valeurs = None
+        super().__init__(identifiant, x, y, altitude, rng)
+
+    def _detacher(self):
+        # Un avion retiré de la flotte garde une copie de son dernier état pour l'UI.
+        self._valeurs = {nom: getattr(self, nom) for nom in Flotte.COLONNES}
+        self._flotte = None
+        self._index = -1
+
+
+for _nom in Flotte.COLONNES:
+    setattr(AvionFlotte, _nom, _colonne(_nom))
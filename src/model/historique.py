@@ -0,0 +1,103 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from model.avion import Avion
+
+
+class Trajectoires(NamedTuple):
+    # `echantillons` compte les prélèvements depuis la création : l'affichage sait combien de points sont nouveaux.
+    echantillons: int
+    capacite: int
+    points: dict[str, np.ndarray]
+
+
+class HistoriqueTrajectoires:
+    """Anneau NumPy de taille fixe (avions × échantillons) des positions passées de toute la flotte."""
+
+    ECHANTILLONS = 32
+    DECIMATION_TICKS = 10
+    CAPACITE_AVIONS = 256
+
+    def __init__(self, echantillons: int = ECHANTILLONS, decimation: int = DECIMATION_TICKS,
+                 capacite_avions: int = CAPACITE_AVIONS):
+        self.echantillons = max(2, echantillons)
+        self.decimation = max(1, decimation)
+        self.capacite = capacite_avions
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        forme = (self.capacite, self.echantillons)
+        self.x = np.zeros(forme, dtype=np.float32)
+        self.y = np.zeros(forme, dtype=np.float32)
+        self.altitude = np.zeros(forme, dtype=np.float32)
+        self.nombre = np.zeros(self.capacite, dtype=np.int64)
+        # Tous les avions sont échantillonnés au même tick : une seule tête d'écriture pour tout l'anneau.
+        self.tete = 0
+        self.total = 0
+        self._lignes: dict[int, int] = {}
+        self._libres = list(range(self.capacite - 1, -1, -1))
+
+    def _agrandir(self):
+        ancienne = self.capacite
+        self.capacite *= 2
+        for nom in ("x", "y", "altitude"):
+            colonne = np.zeros((self.capacite, self.echantillons), dtype=np.float32)
+            colonne[:ancienne] = getattr(self, nom)
+            setattr(self, nom, colonne)
+        self.nombre = np.concatenate([self.nombre, np.zeros(ancienne, dtype=np.int64)])
+        self._libres.extend(range(self.capacite - 1, ancienne - 1, -1))
+
+    def _ligne(self, handle: int) -> int:
+        ligne = self._lignes.get(handle)
+        if ligne is None:
+            if not self._libres:
+                self._agrandir()
+            ligne = self._libres.pop()
+            self.nombre[ligne] = 0
+            self._lignes[handle] = ligne
+        return ligne
+
+    def retirer(self, avion: Avion):
+        # O(1) : la ligne retourne dans la liste libre, ses anciennes valeurs seront écrasées.
+        ligne = self._lignes.pop(avion.handle, None)
+        if ligne is not None:
+            self.nombre[ligne] = 0
+            self._libres.append(ligne)
+
+    def echantillonner(self, avions: list[Avion], tick: int, ticks: int = 1):
+        # En avance rapide, un seul échantillon par période de décimation franchie.
+        if tick // self.decimation == (tick - ticks) // self.decimation:
+            return
+        if avions:
+            n = len(avions)
+            lignes = np.fromiter((self._ligne(a.handle) for a in avions), dtype=np.int64, count=n)
+            self.x[lignes, self.tete] = np.fromiter((a.x for a in avions), dtype=np.float32, count=n)
+            self.y[lignes, self.tete] = np.fromiter((a.y for a in avions), dtype=np.float32, count=n)
+            self.altitude[lignes, self.tete] = np.fromiter((a.altitude for a in avions), dtype=np.float32, count=n)
+            self.nombre[lignes] = np.minimum(self.nombre[lignes] + 1, self.echantillons)
+        self.tete = (self.tete + 1) % self.echantillons
+        self.total += 1
+
+    def _colonnes(self) -> np.ndarray:
+        # Ordre chronologique des colonnes de l'anneau, du plus ancien au plus récent.
+        return (self.tete + np.arange(self.echantillons)) % self.echantillons
+
+    def trajectoire(self, avion: Avion) -> np.ndarray:
+        ligne = self._lignes.get(avion.handle)
+        if ligne is None:
+            return np.empty((0, 3), dtype=np.float32)
+        colonnes = self._colonnes()[self.echantillons - self.nombre[ligne]:]
+        return np.stack([self.x[ligne, colonnes], self.y[ligne, colonnes], self.altitude[ligne, colonnes]], axis=1)
+
+    def capturer(self, avions: list[Avion]) -> Trajectoires:
+        # Copie en un bloc (avions × échantillons × 3) : l'instantané ne partage rien avec l'anneau.
+        connus = [(a.identifiant, self._lignes[a.handle]) for a in avions if a.handle in self._lignes]
+        if not connus:
+            return Trajectoires(self.total, self.echantillons, {})
+        lignes = np.fromiter((ligne for _, ligne in connus), dtype=np.int64, count=len(connus))
+        grille = np.ix_(lignes, self._colonnes())
+        bloc = np.stack([self.x[grille], self.y[grille], self.altitude[grille]], axis=2)
+        debuts = (self.echantillons - self.nombre[lignes]).tolist()
+        points = {identifiant: bloc[k, debut:] for k, ((identifiant, _), debut) in enumerate(zip(connus, debuts))}
+        return Trajectoires(self.total, self.echantillons, points)
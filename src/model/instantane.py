@@ -0,0 +1,62 @@
+from typing import NamedTuple
+
+from model.avion import Avion
+from model.espace_aerien import EspaceAerien
+from model.historique import Trajectoires
+from model.prediction import ConflitPrevu
+from model.resolution import Resolution
+
+
+class EtatAvion(NamedTuple):
+    identifiant: str
+    x: float
+    y: float
+    altitude: int
+    vitesse: int
+    cap: int
+    carburant: float
+    en_vol: bool
+    alerte_collision: bool
+    instruction_atterrissage: bool
+    a_atterri: bool
+    incident: bool
+    compteur_tempete: float
+    version: int
+
+    est_en_urgence = Avion.est_en_urgence
+
+
+class EtatTempete(NamedTuple):
+    x: float
+    y: float
+    rayon: int
+
+
+class Instantane(NamedTuple):
+    tick: int
+    en_cours: bool
+    avions: tuple[EtatAvion, ...]
+    tempetes: tuple[EtatTempete, ...]
+    stats: dict
+    conflits_prevus: tuple[ConflitPrevu, ...]
+    avions_par_id: dict[str, EtatAvion]
+    resolution: Resolution | None = None
+    sequence_arrivees: tuple[tuple[str, int], ...] = ()
+    trajectoires: Trajectoires | None = None
+    taille_x: float = EspaceAerien.TAILLE_X
+    taille_y: float = EspaceAerien.TAILLE_Y
+
+
+def capturer(simulation) -> Instantane:
+    avions = tuple(
+        EtatAvion(a.identifiant, a.x, a.y, a.altitude, a.vitesse, a.cap, a.carburant,
+                  a.en_vol, a.alerte_collision, a.instruction_atterrissage, a.a_atterri,
+                  a.incident, a.compteur_tempete, a.version)
+        for a in simulation.espace.avions
+    )
+    tempetes = tuple(EtatTempete(t.x, t.y, t.rayon) for t in simulation.espace.tempetes)
+    historique = simulation.historique
+    trajectoires = historique.capturer(simulation.espace.avions) if historique is not None else None
+    return Instantane(simulation.tick_compteur, simulation.en_cours, avions, tempetes, simulation.get_stats(),
+                      tuple(simulation.conflits_prevus), {a.identifiant: a for a in avions}, simulation.resolution,
+                      simulation.arrivees.sequence, trajectoires, simulation.taille_x, simulation.taille_y)
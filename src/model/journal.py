@@ -0,0 +1,264 @@
+import os
+
+import numpy as np
+
+from model.avion import Avion
+from model.espace_aerien import EspaceAerien
+from model.instantane import EtatAvion, EtatTempete, Instantane
+
+MAGIC = b"ATCJ"
+VERSION_FORMAT = 2
+
+TYPE_DELTA = 0
+TYPE_KEYFRAME = 1
+
+COMMANDE_CAP = 1
+COMMANDE_ALTITUDE = 2
+COMMANDE_ATTERRISSAGE = 3
+
+# La taille de l'espace aérien permet aux vues de replacer les avions à la relecture.
+DTYPE_ENTETE_FICHIER = np.dtype([("magic", "S4"), ("version", "<u2"), ("taille_x", "<f8"), ("taille_y", "<f8")])
+
+DTYPE_BLOC = np.dtype([
+    ("type", "u1"),
+    ("tick", "<u4"),
+    ("nb_avions", "<u4"),
+    ("nb_retires", "<u4"),
+    ("nb_tempetes_nouvelles", "<u4"),
+    ("nb_tempetes_expirees", "<u4"),
+    ("nb_commandes", "<u4"),
+    ("score", "<i4"),
+    ("avions_atterris", "<i4"),
+    ("avions_perdus", "<i4"),
+    ("collisions_evitees", "<i4"),
+])
+
+DTYPE_AVION = np.dtype([
+    ("handle", "<u4"),
+    ("identifiant", "S12"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("altitude", "<i4"),
+    ("vitesse", "<i2"),
+    ("cap", "<i2"),
+    ("carburant", "<f4"),
+    ("compteur_tempete", "<f4"),
+    ("drapeaux", "u1"),
+    ("version", "<u4"),
+])
+
+DTYPE_TEMPETE = np.dtype([
+    ("numero", "<u4"),
+    ("x", "<f8"),
+    ("y", "<f8"),
+    ("rayon", "<u2"),
+    ("expiration", "<u4"),
+])
+
+DTYPE_COMMANDE = np.dtype([("type", "u1"), ("handle", "<u4"), ("valeur", "<i4")])
+
+# Une entrée par frame : position du bloc et numéro de la keyframe à partir de laquelle le reconstruire.
+DTYPE_INDEX = np.dtype([("tick", "<u4"), ("offset", "<u8"), ("keyframe", "<u4")])
+
+DTYPE_HANDLE = np.dtype("<u4")
+
+
+def _drapeaux(avion) -> int:
+    return (avion.en_vol * Avion.EN_VOL
+            | avion.alerte_collision * Avion.ALERTE_COLLISION
+            | avion.instruction_atterrissage * Avion.INSTRUCTION_ATTERRISSAGE
+            | avion.a_atterri * Avion.A_ATTERRI
+            | avion.incident * Avion.INCIDENT)
+
+
+def _ligne_avion(avion) -> tuple:
+    return (avion.handle, avion.identifiant.encode(), avion.x, avion.y, avion.altitude, avion.vitesse,
+            avion.cap, avion.carburant, avion.compteur_tempete, _drapeaux(avion), avion.version)
+
+
+class EnregistreurJournal:
+    INTERVALLE_KEYFRAME = 100
+
+    def __init__(self, chemin: str, intervalle_keyframe: int = INTERVALLE_KEYFRAME,
+                 taille_x: float = EspaceAerien.TAILLE_X, taille_y: float = EspaceAerien.TAILLE_Y):
+        self.chemin = chemin
+        self.intervalle_keyframe = intervalle_keyframe
+        self._fichier = open(chemin, "wb")
+        self._index = open(chemin + ".idx", "wb")
+        self._fichier.write(np.array([(MAGIC, VERSION_FORMAT, taille_x, taille_y)],
+                                     dtype=DTYPE_ENTETE_FICHIER).tobytes())
+
+        self._frames = 0
+        self._derniere_keyframe = 0
+        self._forcer_keyframe = True
+        self._etats_avions: dict[int, tuple] = {}
+        self._tempetes: dict[int, tuple] = {}
+        self._commandes: list[tuple] = []
+
+    def forcer_keyframe(self):
+        self._forcer_keyframe = True
+
+    def commande(self, type_commande: int, avion, valeur: int = 0):
+        self._commandes.append((type_commande, avion.handle, valeur))
+
+    def enregistrer_tick(self, simulation):
+        keyframe = self._forcer_keyframe or self._frames % self.intervalle_keyframe == 0
+        self._forcer_keyframe = False
+
+        lignes = {avion.handle: _ligne_avion(avion) for avion in simulation.espace.avions}
+        tempetes = {t.numero: (t.numero, t.x, t.y, t.rayon, t.expiration) for t in simulation.espace.tempetes}
+
+        if keyframe:
+            avions = list(lignes.values())
+            retires = []
+            nouvelles = list(tempetes.values())
+            expirees = []
+        else:
+            anciens = self._etats_avions
+            avions = [ligne for handle, ligne in lignes.items() if anciens.get(handle) != ligne]
+            retires = [handle for handle in anciens if handle not in lignes]
+            nouvelles = [t for numero, t in tempetes.items() if numero not in self._tempetes]
+            expirees = [numero for numero in self._tempetes if numero not in tempetes]
+
+        self._etats_avions = lignes
+        self._tempetes = tempetes
+
+        stats = simulation.get_stats()
+        entete = np.array([(
+            TYPE_KEYFRAME if keyframe else TYPE_DELTA, simulation.tick_compteur,
+            len(avions), len(retires), len(nouvelles), len(expirees), len(self._commandes),
+            stats["score"], stats["avions_atterris"], stats["avions_perdus"], stats["collisions_evitees"],
+        )], dtype=DTYPE_BLOC)
+
+        offset = self._fichier.tell()
+        if keyframe:
+            self._derniere_keyframe = self._frames
+
+        self._fichier.write(entete.tobytes())
+        self._fichier.write(np.array(avions, dtype=DTYPE_AVION).tobytes())
+        self._fichier.write(np.array(retires, dtype=DTYPE_HANDLE).tobytes())
+        self._fichier.write(np.array(nouvelles, dtype=DTYPE_TEMPETE).tobytes())
+        self._fichier.write(np.array(expirees, dtype=DTYPE_HANDLE).tobytes())
+        self._fichier.write(np.array(self._commandes, dtype=DTYPE_COMMANDE).tobytes())
+        self._commandes = []
+
+        self._index.write(np.array([(simulation.tick_compteur, offset, self._derniere_keyframe)],
+                                   dtype=DTYPE_INDEX).tobytes())
+        self._frames += 1
+
+    def vider(self):
+        self._fichier.flush()
+        self._index.flush()
+
+    def fermer(self):
+        self._fichier.close()
+        self._index.close()
+
+
+class LecteurJournal:
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        if os.path.getsize(chemin) < DTYPE_ENTETE_FICHIER.itemsize:
+            raise ValueError(f"{chemin} n'est pas un journal de simulation valide.")
+        self._donnees = np.memmap(chemin, dtype=np.uint8, mode="r")
+        entete = np.frombuffer(self._donnees, dtype=DTYPE_ENTETE_FICHIER, count=1)[0]
+        if entete["magic"] != MAGIC or entete["version"] != VERSION_FORMAT:
+            raise ValueError(f"{chemin} n'est pas un journal de simulation valide.")
+        self.taille_x = float(entete["taille_x"])
+        self.taille_y = float(entete["taille_y"])
+
+        # Enregistrement interrompu : une entrée d'index incomplète ou un bloc à moitié écrit sont ignorés.
+        nb_entrees = os.path.getsize(chemin + ".idx") // DTYPE_INDEX.itemsize
+        if nb_entrees > 0:
+            index = np.memmap(chemin + ".idx", dtype=DTYPE_INDEX, mode="r", shape=(nb_entrees,))
+        else:
+            index = np.empty(0, dtype=DTYPE_INDEX)
+        nb_frames = int(np.searchsorted(index["offset"], len(self._donnees) - DTYPE_BLOC.itemsize, side="right"))
+        if nb_frames and self._fin_bloc(int(index[nb_frames - 1]["offset"])) > len(self._donnees):
+            nb_frames -= 1
+        self.index = index[:nb_frames]
+        self.frames_ignorees = nb_entrees - nb_frames
+
+        self._frame_courante = -1
+        self._avions: dict[int, np.void] = {}
+        self._tempetes: dict[int, np.void] = {}
+        self._entete = None
+        self.commandes = np.empty(0, dtype=DTYPE_COMMANDE)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _fin_bloc(self, offset: int) -> int:
+        entete = np.frombuffer(self._donnees, dtype=DTYPE_BLOC, count=1, offset=offset)[0]
+        return (offset + DTYPE_BLOC.itemsize
+                + int(entete["nb_avions"]) * DTYPE_AVION.itemsize
+                + (int(entete["nb_retires"]) + int(entete["nb_tempetes_expirees"])) * DTYPE_HANDLE.itemsize
+                + int(entete["nb_tempetes_nouvelles"]) * DTYPE_TEMPETE.itemsize
+                + int(entete["nb_commandes"]) * DTYPE_COMMANDE.itemsize)
+
+    def _lire(self, offset: int, dtype: np.dtype, nombre: int) -> tuple[np.ndarray, int]:
+        tableau = np.frombuffer(self._donnees, dtype=dtype, count=nombre, offset=offset)
+        return tableau, offset + nombre * dtype.itemsize
+
+    def _appliquer_bloc(self, offset: int):
+        entete, offset = self._lire(offset, DTYPE_BLOC, 1)
+        entete = entete[0]
+        avions, offset = self._lire(offset, DTYPE_AVION, int(entete["nb_avions"]))
+        retires, offset = self._lire(offset, DTYPE_HANDLE, int(entete["nb_retires"]))
+        nouvelles, offset = self._lire(offset, DTYPE_TEMPETE, int(entete["nb_tempetes_nouvelles"]))
+        expirees, offset = self._lire(offset, DTYPE_HANDLE, int(entete["nb_tempetes_expirees"]))
+        self.commandes, offset = self._lire(offset, DTYPE_COMMANDE, int(entete["nb_commandes"]))
+
+        if entete["type"] == TYPE_KEYFRAME:
+            self._avions = {}
+            self._tempetes = {}
+        for ligne in avions:
+            self._avions[int(ligne["handle"])] = ligne
+        for handle in retires.tolist():
+            self._avions.pop(handle, None)
+        for tempete in nouvelles:
+            self._tempetes[int(tempete["numero"])] = tempete
+        for numero in expirees.tolist():
+            self._tempetes.pop(numero, None)
+        self._entete = entete
+
+    def aller_a(self, frame: int):
+        if not 0 <= frame < len(self.index):
+            raise IndexError(f"Frame {frame} hors du journal ({len(self.index)} frames).")
+
+        # On avance depuis la frame courante si possible, sinon on repart de la keyframe de la frame demandée :
+        # au plus `intervalle_keyframe` blocs à appliquer quel que soit le saut.
+        keyframe = int(self.index[frame]["keyframe"])
+        debut = self._frame_courante + 1 if keyframe <= self._frame_courante < frame else keyframe
+        for f in range(debut, frame + 1):
+            self._appliquer_bloc(int(self.index[f]["offset"]))
+        self._frame_courante = frame
+
+    def instantane(self, frame: int, en_cours: bool = True) -> Instantane:
+        if len(self) == 0:
+            # Journal fermé avant le premier tick : relecture vide.
+            stats = {"score": 0, "avions_en_vol": 0, "avions_atterris": 0, "avions_perdus": 0, "collisions_evitees": 0}
+            return Instantane(0, False, (), (), stats, (), {}, taille_x=self.taille_x, taille_y=self.taille_y)
+        if frame != self._frame_courante:
+            self.aller_a(frame)
+
+        avions = tuple(
+            EtatAvion(ligne["identifiant"].decode(), float(ligne["x"]), float(ligne["y"]), int(ligne["altitude"]),
+                      int(ligne["vitesse"]), int(ligne["cap"]), float(ligne["carburant"]),
+                      bool(ligne["drapeaux"] & Avion.EN_VOL), bool(ligne["drapeaux"] & Avion.ALERTE_COLLISION),
+                      bool(ligne["drapeaux"] & Avion.INSTRUCTION_ATTERRISSAGE),
+                      bool(ligne["drapeaux"] & Avion.A_ATTERRI), bool(ligne["drapeaux"] & Avion.INCIDENT),
+                      float(ligne["compteur_tempete"]), int(ligne["version"]))
+            for ligne in self._avions.values()
+        )
+        tempetes = tuple(EtatTempete(float(t["x"]), float(t["y"]), int(t["rayon"])) for t in self._tempetes.values())
+        entete = self._entete
+        stats = {
+            "score": int(entete["score"]),
+            "avions_en_vol": len(avions),
+            "avions_atterris": int(entete["avions_atterris"]),
+            "avions_perdus": int(entete["avions_perdus"]),
+            "collisions_evitees": int(entete["collisions_evitees"]),
+        }
+        return Instantane(int(entete["tick"]), en_cours, avions, tempetes, stats, (),
+                          {a.identifiant: a for a in avions}, taille_x=self.taille_x, taille_y=self.taille_y)
@@ -0,0 +1,179 @@
+import queue
+import threading
+import time
+
+from model.evenements import BusEvenements, Evenement
+from model.instantane import Instantane, capturer
+from model.journal import LecteurJournal
+from model.simulation import Simulation
+
+
+class MoteurSimulation:
+    """Fait avancer une `Simulation` dans son propre thread ; l'UI lit des instantanés et envoie des commandes."""
+
+    def __init__(self, simulation: Simulation, periode_s: float | None = None):
+        self.simulation = simulation
+        self.periode_s = periode_s if periode_s is not None else simulation.TEMPS_PAR_TICK_S
+
+        self._commandes = queue.SimpleQueue()
+
+        # Double tampon : le thread de simulation écrit dans la case non publiée puis bascule l'index.
+        self._tampons: list[Instantane | None] = [None, None]
+        self._index_publie = 0
+
+        self._arret = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._publier()
+
+    def demarrer(self):
+        if self._thread is not None:
+            return
+        self._arret.clear()
+        self._thread = threading.Thread(target=self._boucle, name="simulation", daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def envoyer(self, commande, *args):
+        self._commandes.put((commande, args))
+
+    def dernier_instantane(self) -> Instantane:
+        return self._tampons[self._index_publie]
+
+    def pop_messages(self) -> list[Evenement]:
+        # Le bus de la simulation est borné et se vide sans verrou : l'UI récupère un lot par frame.
+        return self.simulation.evenements.vider()
+
+    def evenements_perdus(self) -> int:
+        return self.simulation.evenements.perdus
+
+    def _appliquer_commandes(self):
+        while True:
+            try:
+                commande, args = self._commandes.get_nowait()
+            except queue.Empty:
+                return
+            commande(self.simulation, *args)
+
+    def _publier(self):
+        arriere = 1 - self._index_publie
+        self._tampons[arriere] = capturer(self.simulation)
+        self._index_publie = arriere
+
+    def _boucle(self):
+        prochain = time.monotonic()
+        while not self._arret.is_set():
+            self._appliquer_commandes()
+            # En avance rapide, seuls les sous-pas sont calculés : un seul instantané est publié par période.
+            self.simulation.avancer(self.simulation.avance_rapide)
+            self._publier()
+
+            prochain += self.periode_s
+            attente = prochain - time.monotonic()
+            if attente > 0:
+                self._arret.wait(attente)
+            else:
+                # En retard : on repart de maintenant plutôt que d'enchaîner les ticks.
+                prochain = time.monotonic()
+
+
+class MoteurRelecture:
+    """Rejoue un journal enregistré avec la même interface que `MoteurSimulation`, sans recalculer la physique."""
+
+    def __init__(self, lecteur: LecteurJournal, periode_s: float = Simulation.TEMPS_PAR_TICK_S):
+        self.lecteur = lecteur
+        self.periode_s = periode_s
+        self.facteur = 1.0
+        self.avance_rapide = 1
+        self.en_lecture = False
+
+        self._frame = 0.0
+        self._commandes = queue.SimpleQueue()
+        self.evenements = BusEvenements()
+        self._instantane = lecteur.instantane(0, en_cours=False)
+
+        self._arret = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._log("INFO", f"Relecture de {lecteur.chemin} ({len(lecteur)} frames).")
+        if lecteur.frames_ignorees:
+            self._log("WARNING", f"Journal tronqué : {lecteur.frames_ignorees} frame(s) incomplète(s) ignorée(s).")
+
+    def demarrer(self):
+        if self._thread is not None:
+            return
+        self._arret.clear()
+        self._thread = threading.Thread(target=self._boucle, name="relecture", daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        self._arret.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def envoyer(self, commande, *args):
+        self._commandes.put((commande, args))
+
+    def dernier_instantane(self) -> Instantane:
+        return self._instantane
+
+    def _log(self, type_msg: str, texte: str):
+        self.evenements.publier(Evenement(self._instantane.tick, type_msg, texte))
+
+    def pop_messages(self) -> list[Evenement]:
+        return self.evenements.vider()
+
+    def evenements_perdus(self) -> int:
+        return self.evenements.perdus
+
+    def aller_a(self, frame: int):
+        self._frame = float(max(0, min(frame, len(self.lecteur) - 1)))
+        self._publier()
+
+    def _appliquer_commandes(self):
+        # Seules les commandes de lecture ont un sens : les ordres aux avions sont ignorés.
+        while True:
+            try:
+                commande, args = self._commandes.get_nowait()
+            except queue.Empty:
+                return
+            if commande is Simulation.demarrer:
+                self.en_lecture = True
+                self._publier()
+            elif commande is Simulation.arreter:
+                self.en_lecture = False
+                self._publier()
+            elif commande is Simulation.redemarrer:
+                self.en_lecture = False
+                self.aller_a(0)
+            elif commande is Simulation.set_vitesse_simulation:
+                self.facteur = max(1.0, args[0]) / Simulation.VITESSE_SIMULATION_DEFAUT
+            elif commande is Simulation.set_avance_rapide:
+                self.avance_rapide = max(1, min(int(args[0]), Simulation.AVANCE_RAPIDE_MAX))
+
+    def _publier(self):
+        self._instantane = self.lecteur.instantane(int(self._frame), self.en_lecture)
+
+    def _boucle(self):
+        prochain = time.monotonic()
+        while not self._arret.is_set():
+            self._appliquer_commandes()
+            if self.en_lecture:
+                self._frame = max(0.0, min(self._frame + self.facteur * self.avance_rapide, len(self.lecteur) - 1))
+                if self._frame >= len(self.lecteur) - 1:
+                    self.en_lecture = False
+                    self._log("INFO", "Fin du journal.")
+                self._publier()
+
+            prochain += self.periode_s
+            attente = prochain - time.monotonic()
+            if attente > 0:
+                self._arret.wait(attente)
+            else:
+                prochain = time.monotonic()
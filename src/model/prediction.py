@@ -0,0 +1,173 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from model.espace_aerien import EspaceAerien
+
+
+class ConflitPrevu(NamedTuple):
+    id1: str
+    id2: str
+    eta_ticks: float
+    distance_min: float
+    # Ticks avant que la paire passe sous la séparation latérale ; 0 (immédiat) pour un conflit restauré.
+    entree_ticks: float = 0.0
+    # Paire déjà sous la séparation, renvoyée seulement sur demande (`inclure_actifs`).
+    en_separation: bool = False
+
+
+class PredicteurConflits:
+    HORIZON_TICKS = 50
+
+    def __init__(self, horizon_ticks: int = HORIZON_TICKS):
+        self.horizon_ticks = horizon_ticks
+
+    def paires_proches(self, x, y, altitude, portee: float) -> tuple[np.ndarray, np.ndarray]:
+        # Chaque paire d'avions de cellules voisines d'une grille de maille `portee`, une seule fois ; utilisé par le
+        # résolveur, qui choisit la portée (séparation plus rapprochement maximal sur l'horizon).
+        # Les cellules sont codées sur un entier et triées, les voisines sont trouvées par searchsorted.
+        cx = (x // portee).astype(np.int64)
+        cy = (y // portee).astype(np.int64)
+        cz = (altitude // EspaceAerien.DISTANCE_MIN_ALT).astype(np.int64)
+        cx -= cx.min() - 1
+        cy -= cy.min() - 1
+        cz -= cz.min() - 1
+        ny = int(cy.max()) + 2
+        nz = int(cz.max()) + 2
+        cles = (cx * ny + cy) * nz + cz
+
+        ordre = np.argsort(cles, kind="stable")
+        cles_triees = cles[ordre]
+        positions = np.arange(len(cles_triees))
+
+        plages = []
+        for dx, dy, dz in [(0, 0, 0)] + EspaceAerien.VOISINS_GRILLE:
+            cibles = cles_triees + (dx * ny + dy) * nz + dz
+            debut = np.searchsorted(cles_triees, cibles, side="left")
+            fin = np.searchsorted(cles_triees, cibles, side="right")
+            if (dx, dy, dz) == (0, 0, 0):
+                debut = np.maximum(debut, positions + 1)
+            plages.append((debut, fin))
+        i, j = self._developper(positions, plages)
+        return ordre[i], ordre[j]
+
+    @staticmethod
+    def _developper(positions: np.ndarray, plages: list[tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+        # Chaque élément `positions[k]` est apparié à tous ceux de [debut[k], fin[k]) dans l'ordre trié.
+        paires_i, paires_j = [], []
+        for debut, fin in plages:
+            nombres = np.maximum(fin - debut, 0)
+            total = int(nombres.sum())
+            if total == 0:
+                continue
+            decalages = np.arange(total) - np.repeat(np.cumsum(nombres) - nombres, nombres)
+            paires_i.append(np.repeat(positions, nombres))
+            paires_j.append(np.repeat(debut, nombres) + decalages)
+        if not paires_i:
+            vide = np.empty(0, dtype=np.int64)
+            return vide, vide
+        return np.concatenate(paires_i), np.concatenate(paires_j)
+
+    def _paires_balayees(self, x, y, altitude, vx, vy) -> tuple[np.ndarray, np.ndarray]:
+        # Boîte balayée par chaque avion sur l'horizon, élargie de la demi-séparation : deux avions ne peuvent
+        # passer sous la séparation que si leurs boîtes se recouvrent. Les avions sont rangés par tranche de
+        # niveau et bande en y (aussi haute que la plus haute boîte), puis balayés en x dans chaque rangée.
+        marge = EspaceAerien.DISTANCE_MIN_LAT / 2
+        fin_x = x + vx * self.horizon_ticks
+        fin_y = y + vy * self.horizon_ticks
+        x_min = np.minimum(x, fin_x) - marge
+        x_max = np.maximum(x, fin_x) + marge
+        y_min = np.minimum(y, fin_y) - marge
+        y_max = np.maximum(y, fin_y) + marge
+
+        hauteur = float((y_max - y_min).max())
+        bande = ((y_min - y_min.min()) // hauteur).astype(np.int64) + 1
+        tranche = (altitude // EspaceAerien.DISTANCE_MIN_ALT).astype(np.int64)
+        tranche -= tranche.min()
+        nb_bandes = int(bande.max()) + 2
+        rangee = tranche * nb_bandes + bande
+
+        origine = float(x_min.min())
+        largeur_max = float((x_max - x_min).max())
+        # Une rangée occupe un intervalle de clés plus large que toute l'étendue en x.
+        etendue = float(x_max.max()) - origine + 1.0
+        cles = rangee * etendue + (x_min - origine)
+        ordre = np.argsort(cles, kind="stable")
+        cles_triees = cles[ordre]
+        positions = np.arange(len(cles_triees))
+        base = (rangee * etendue - origine)[ordre]
+        gauche = x_min[ordre]
+        droite = x_max[ordre]
+
+        # Même rangée : les suivants dont le bord gauche tombe dans la boîte. Rangées voisines (demi-voisinage) :
+        # on recule de la plus grande largeur puis on filtre le recouvrement exact.
+        plages = [(positions + 1, np.searchsorted(cles_triees, base + droite, side="right"))]
+        for decalage in (1, nb_bandes - 1, nb_bandes, nb_bandes + 1):
+            voisine = base + decalage * etendue
+            plages.append((np.searchsorted(cles_triees, voisine + gauche - largeur_max, side="left"),
+                           np.searchsorted(cles_triees, voisine + droite, side="right")))
+        i, j = self._developper(positions, plages)
+        i, j = ordre[i], ordre[j]
+        recouvrent = ((x_max[j] >= x_min[i]) & (x_min[j] <= x_max[i])
+                      & (y_max[j] >= y_min[i]) & (y_min[j] <= y_max[i]))
+        return i[recouvrent], j[recouvrent]
+
+    def predire(self, espace: EspaceAerien, delta_temps_heures: float,
+                inclure_actifs: bool = False) -> list[ConflitPrevu]:
+        avions = espace.avions
+        if len(avions) < 2 or delta_temps_heures <= 0:
+            return []
+
+        x, y, altitude, vitesse, cap = espace.colonnes("x", "y", "altitude", "vitesse", "cap")
+        cap = np.radians(cap)
+
+        # Vitesses en unités de carte par tick, comme dans Avion.deplacer.
+        pas = vitesse * delta_temps_heures * 100
+        vx = np.cos(cap) * pas
+        vy = np.sin(cap) * pas
+
+        i, j = self._paires_balayees(x, y, altitude, vx, vy)
+        if len(i) == 0:
+            return []
+
+        proches = np.abs(altitude[i] - altitude[j]) < EspaceAerien.DISTANCE_MIN_ALT
+        i, j = i[proches], j[proches]
+
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        dvx = vx[j] - vx[i]
+        dvy = vy[j] - vy[i]
+
+        dv2 = dvx * dvx + dvy * dvy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(dv2 > 0, -(dx * dvx + dy * dvy) / dv2, 0.0)
+        t = np.clip(t, 0.0, self.horizon_ticks)
+
+        cx = dx + dvx * t
+        cy = dy + dvy * t
+        dmin2 = cx * cx + cy * cy
+
+        seuil2 = EspaceAerien.DISTANCE_MIN_LAT ** 2
+        # Les paires déjà en conflit sont gérées par detecter_collisions.
+        en_separation = dx * dx + dy * dy < seuil2
+        prevus = (dmin2 < seuil2) & ~en_separation
+        if inclure_actifs:
+            prevus |= en_separation
+
+        # Entrée dans la séparation : plus petite racine de |d + v·t| = DISTANCE_MIN_LAT, avant le rapprochement maximal.
+        produit = dx * dvx + dy * dvy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entree = (-produit - np.sqrt(np.maximum(produit * produit - dv2 * (dx * dx + dy * dy - seuil2), 0.0))) / dv2
+        entree = np.clip(np.nan_to_num(entree), 0.0, t)
+
+        conflits = []
+        for a, b, eta, distance, debut, dedans in zip(i[prevus].tolist(), j[prevus].tolist(), t[prevus].tolist(),
+                                                      np.sqrt(dmin2[prevus]).tolist(), entree[prevus].tolist(),
+                                                      en_separation[prevus].tolist()):
+            id1 = avions[a].identifiant
+            id2 = avions[b].identifiant
+            if id2 < id1:
+                id1, id2 = id2, id1
+            conflits.append(ConflitPrevu(id1, id2, eta, distance, debut, dedans))
+        conflits.sort(key=lambda c: (c.eta_ticks, c.id1, c.id2))
+        return conflits
@@ -0,0 +1,64 @@
+import json
+import time
+
+
+class TamponCirculaire:
+    def __init__(self, capacite: int):
+        self.capacite = capacite
+        self.valeurs: list[float] = []
+        self.index = 0
+
+    def ajouter(self, valeur: float):
+        if len(self.valeurs) < self.capacite:
+            self.valeurs.append(valeur)
+        else:
+            self.valeurs[self.index] = valeur
+        self.index = (self.index + 1) % self.capacite
+
+    def copie(self) -> list[float]:
+        # La copie d'une liste est atomique : un autre thread peut lire pendant que la simulation écrit.
+        return self.valeurs.copy()
+
+
+class ProfileurTicks:
+    CAPACITE = 1000
+
+    def __init__(self, capacite: int = CAPACITE):
+        self.capacite = capacite
+        self.actif = False
+        self.phases: dict[str, TamponCirculaire] = {}
+
+    def debut(self) -> float | None:
+        return time.perf_counter() if self.actif else None
+
+    def marquer(self, phase: str, debut: float | None) -> float | None:
+        if debut is None:
+            return None
+        maintenant = time.perf_counter()
+        tampon = self.phases.get(phase)
+        if tampon is None:
+            tampon = self.phases[phase] = TamponCirculaire(self.capacite)
+        tampon.ajouter(maintenant - debut)
+        return maintenant
+
+    def reinitialiser(self):
+        self.phases = {}
+
+    def statistiques(self) -> dict[str, dict[str, float]]:
+        stats = {}
+        for phase, tampon in list(self.phases.items()):
+            valeurs = sorted(tampon.copie())
+            if not valeurs:
+                continue
+            n = len(valeurs)
+            stats[phase] = {
+                "echantillons": n,
+                "moyenne_ms": sum(valeurs) / n * 1000,
+                "p50_ms": valeurs[int(0.50 * (n - 1))] * 1000,
+                "p95_ms": valeurs[int(0.95 * (n - 1))] * 1000,
+                "p99_ms": valeurs[int(0.99 * (n - 1))] * 1000,
+            }
+        return stats
+
+    def exporter_json(self) -> str:
+        return json.dumps(self.statistiques(), indent=2)
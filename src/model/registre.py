@@ -0,0 +1,54 @@
+from model.avion import Avion
+
+
+class RegistreAvions:
+    """Avions rangés dans une liste dense, retrouvables en O(1) par poignée entière ou par identifiant."""
+
+    def __init__(self):
+        self.avions: list[Avion] = []
+        self._positions: dict[int, int] = {}
+        self._par_identifiant: dict[str, Avion] = {}
+        self.prochain_handle = 0
+
+    def __len__(self) -> int:
+        return len(self.avions)
+
+    def __contains__(self, identifiant: str) -> bool:
+        return identifiant in self._par_identifiant
+
+    def ajouter(self, avion: Avion) -> int:
+        # Les poignées ne sont jamais réutilisées : une paire de conflit ne peut pas désigner un nouvel avion.
+        avion.handle = self.prochain_handle
+        self.prochain_handle += 1
+        self._positions[avion.handle] = len(self.avions)
+        self.avions.append(avion)
+        self._par_identifiant[avion.identifiant] = avion
+        return avion.handle
+
+    def retirer(self, avion: Avion) -> bool:
+        position = self._positions.pop(avion.handle, None)
+        if position is None:
+            return False
+
+        dernier = self.avions.pop()
+        if dernier is not avion:
+            self.avions[position] = dernier
+            self._positions[dernier.handle] = position
+
+        if self._par_identifiant.get(avion.identifiant) is avion:
+            del self._par_identifiant[avion.identifiant]
+        return True
+
+    def par_handle(self, handle: int) -> Avion | None:
+        position = self._positions.get(handle)
+        return self.avions[position] if position is not None else None
+
+    def par_identifiant(self, identifiant: str) -> Avion | None:
+        return self._par_identifiant.get(identifiant)
+
+    def restaurer(self, avions: list[Avion], prochain_handle: int):
+        # Les avions gardent leur poignée, attribuée lors d'une exécution précédente.
+        self.avions = list(avions)
+        self._positions = {avion.handle: i for i, avion in enumerate(self.avions)}
+        self._par_identifiant = {avion.identifiant: avion for avion in self.avions}
+        self.prochain_handle = prochain_handle
@@ -0,0 +1,147 @@
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from model.avion import Avion
+from model.espace_aerien import EspaceAerien
+from model.prediction import PredicteurConflits
+
+
+class AvisResolution(NamedTuple):
+    identifiant: str
+    cap: int
+    delta_altitude: int
+
+
+class Resolution(NamedTuple):
+    avis: tuple[AvisResolution, ...]
+    conflits: int
+    non_resolus: int
+    duree_s: float
+
+
+class ResolveurConflits:
+    """Cherche, pour les avions en conflit, les plus petits changements de cap ou de niveau qui les séparent."""
+
+    DELTAS_CAP = (10, -10, 20, -20, 30, -30, 45, -45, 60, -60, 90, -90)
+    DELTAS_ALTITUDE = (500, -500, 1000, -1000)
+    COUT_DEGRE_CAP = 0.1
+    COUT_500_M = 1.5
+    ITERATIONS_MAX = 16
+
+    def __init__(self, predicteur: PredicteurConflits, altitude_min: int, altitude_max: int):
+        self.predicteur = predicteur
+        self.altitude_min = altitude_min
+        self.altitude_max = altitude_max
+
+        # Manœuvre 0 : ne rien changer. Les autres portent soit sur le cap, soit sur le niveau.
+        zeros_cap = (0,) * len(self.DELTAS_CAP)
+        zeros_altitude = (0,) * len(self.DELTAS_ALTITUDE)
+        self.deltas_cap = np.array((0,) + self.DELTAS_CAP + zeros_altitude, dtype=np.float64)
+        self.deltas_altitude = np.array((0,) + zeros_cap + self.DELTAS_ALTITUDE, dtype=np.int64)
+        self.couts = np.abs(self.deltas_cap) * self.COUT_DEGRE_CAP + np.abs(self.deltas_altitude) / 500 * self.COUT_500_M
+
+    def _en_conflit(self, dx, dy, dvx, dvy, dalt) -> np.ndarray:
+        # Même rapprochement maximal que PredicteurConflits, vectorisé sur des tableaux de toute forme.
+        horizon = self.predicteur.horizon_ticks
+        seuil2 = EspaceAerien.DISTANCE_MIN_LAT ** 2
+        produit = dx * dvx + dy * dvy
+        dv2 = dvx * dvx + dvy * dvy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(dv2 > 0, -produit / dv2, 0.0)
+        t = np.clip(t, 0.0, horizon)
+        cx = dx + dvx * t
+        cy = dy + dvy * t
+        # Une paire déjà sous la séparation mais qui s'éloigne est en train de se résoudre.
+        diverge = (dx * dx + dy * dy < seuil2) & (produit > 0)
+        return (np.abs(dalt) < EspaceAerien.DISTANCE_MIN_ALT) & (cx * cx + cy * cy < seuil2) & ~diverge
+
+    def resoudre(self, avions: list[Avion], delta_temps_heures: float) -> Resolution:
+        debut = time.perf_counter()
+        n = len(avions)
+        if n < 2 or delta_temps_heures <= 0:
+            return Resolution((), 0, 0, time.perf_counter() - debut)
+
+        x = np.fromiter((a.x for a in avions), dtype=np.float64, count=n)
+        y = np.fromiter((a.y for a in avions), dtype=np.float64, count=n)
+        altitude = np.fromiter((a.altitude for a in avions), dtype=np.int64, count=n)
+        cap = np.fromiter((a.cap for a in avions), dtype=np.float64, count=n)
+        pas = np.fromiter((a.vitesse for a in avions), dtype=np.float64, count=n) * delta_temps_heures * 100
+        # Un avion en approche finale ou au sol garde sa trajectoire ; les autres s'écartent pour lui.
+        mobiles = np.fromiter((a.en_vol and not a.instruction_atterrissage for a in avions), dtype=bool, count=n)
+
+        # Grille en 2D : un changement de niveau peut créer un conflit avec un avion d'une autre tranche.
+        portee = EspaceAerien.DISTANCE_MIN_LAT + 2 * float(pas.max()) * self.predicteur.horizon_ticks
+        i, j = self.predicteur.paires_proches(x, y, np.zeros(n), portee)
+        ecart_max = EspaceAerien.DISTANCE_MIN_ALT + 2 * max(self.DELTAS_ALTITUDE)
+        proches = np.abs(altitude[i] - altitude[j]) < ecart_max
+        i, j = i[proches], j[proches]
+
+        caps_candidats = np.radians(cap[:, None] + self.deltas_cap[None, :])
+        vx_candidats = np.cos(caps_candidats) * pas[:, None]
+        vy_candidats = np.sin(caps_candidats) * pas[:, None]
+        altitudes_candidates = altitude[:, None] + self.deltas_altitude[None, :]
+        valides = (altitudes_candidates >= self.altitude_min) & (altitudes_candidates <= self.altitude_max)
+        valides[:, 0] = True
+
+        choix = np.zeros(n, dtype=np.int64)
+        rangs = np.arange(n)
+
+        def conflits_paires():
+            vx, vy = vx_candidats[rangs, choix], vy_candidats[rangs, choix]
+            alt = altitudes_candidates[rangs, choix]
+            return self._en_conflit(x[j] - x[i], y[j] - y[i], vx[j] - vx[i], vy[j] - vy[i], alt[j] - alt[i])
+
+        en_conflit = conflits_paires()
+        nb_initial = int(np.count_nonzero(en_conflit))
+
+        for _ in range(self.ITERATIONS_MAX):
+            if not en_conflit.any():
+                break
+            ci, cj = i[en_conflit], j[en_conflit]
+            impliques = np.zeros(n, dtype=bool)
+            impliques[ci] = True
+            impliques[cj] = True
+            impliques &= mobiles
+
+            # Toutes les manœuvres de tous les avions impliqués contre la trajectoire actuelle de leurs voisins.
+            a = np.concatenate([i, j])
+            b = np.concatenate([j, i])
+            garde = impliques[a]
+            a, b = a[garde], b[garde]
+            vx_b = vx_candidats[b, choix[b]][:, None]
+            vy_b = vy_candidats[b, choix[b]][:, None]
+            alt_b = altitudes_candidates[b, choix[b]][:, None]
+            conflits = self._en_conflit((x[b] - x[a])[:, None], (y[b] - y[a])[:, None],
+                                        vx_b - vx_candidats[a], vy_b - vy_candidats[a], alt_b - altitudes_candidates[a])
+            nb_manoeuvres = len(self.couts)
+            cases = (a[:, None] * nb_manoeuvres + np.arange(nb_manoeuvres)[None, :])[conflits]
+            nb_conflits = np.bincount(cases, minlength=n * nb_manoeuvres).reshape(n, nb_manoeuvres)
+
+            score = np.where(valides, nb_conflits * 1000.0 + self.couts[None, :], np.inf)
+            meilleure = np.argmin(score, axis=1)
+            gain = nb_conflits[rangs, choix] - nb_conflits[rangs, meilleure]
+            candidats = np.flatnonzero(impliques & (gain > 0))
+            if len(candidats) == 0:
+                break
+
+            # Les grappes couplées sont traitées ensemble : un avion ne change que s'il a la meilleure priorité
+            # parmi ses voisins potentiels. Deux avions qui manœuvrent en même temps ne sont donc jamais voisins,
+            # chaque gain évalué reste exact et le nombre total de conflits décroît strictement.
+            ordre = np.lexsort((-self.couts[meilleure[candidats]], gain[candidats]))
+            priorite = np.full(n, -1, dtype=np.int64)
+            priorite[candidats[ordre]] = np.arange(len(candidats))
+            priorite_voisins = np.full(n, -1, dtype=np.int64)
+            np.maximum.at(priorite_voisins, ci, priorite[cj])
+            np.maximum.at(priorite_voisins, cj, priorite[ci])
+            retenus = candidats[priorite[candidats] > priorite_voisins[candidats]]
+            choix[retenus] = meilleure[retenus]
+            en_conflit = conflits_paires()
+
+        avis = tuple(
+            AvisResolution(avions[k].identifiant, int(cap[k] + self.deltas_cap[choix[k]]) % 360,
+                           int(self.deltas_altitude[choix[k]]))
+            for k in np.flatnonzero(choix)
+        )
+        return Resolution(avis, nb_initial, int(np.count_nonzero(en_conflit)), time.perf_counter() - debut)
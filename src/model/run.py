@@ -0,0 +1,102 @@
+import argparse
+import time
+
+from model.espace_aerien import EspaceAerien
+from model.simulation import Simulation
+
+MODES_RESOLUTION = {
+    "aucune": Simulation.RESOLUTION_AUCUNE,
+    "conseil": Simulation.RESOLUTION_CONSEIL,
+    "auto": Simulation.RESOLUTION_AUTO,
+}
+
+
+def dimensions(texte: str) -> tuple[float, float] | tuple[int, int]:
+    # « 4000 » ou « 4000x2000 » ; les entiers restent entiers (nombre de secteurs).
+    valeurs = [float(v) if "." in v else int(v) for v in texte.lower().split("x")]
+    if len(valeurs) == 1:
+        valeurs *= 2
+    if len(valeurs) != 2 or min(valeurs) <= 0:
+        raise argparse.ArgumentTypeError(f"Dimensions invalides : {texte}")
+    return tuple(valeurs)
+
+
+def executer(ticks: int, graine: int | None = None, vitesse: float = Simulation.VITESSE_SIMULATION_DEFAUT,
+             flotte_vectorisee: bool = False, profilage: bool = False,
+             journal: str | None = None, reprendre: str | None = None,
+             evenements: str | None = None, taille: tuple[float, float] = (EspaceAerien.TAILLE_X, EspaceAerien.TAILLE_Y),
+             secteurs: tuple[int, int] = (1, 1), processus: int = 0,
+             mode_resolution: int = Simulation.RESOLUTION_AUCUNE,
+             arrivees_auto: bool = False,
+             intervalle_prediction: int = Simulation.INTERVALLE_PREDICTION) -> tuple[Simulation, float]:
+    simulation = Simulation(flotte_vectorisee=flotte_vectorisee, graine=graine, taille_x=taille[0], taille_y=taille[1],
+                            secteurs=secteurs, processus=processus)
+    if reprendre is not None:
+        simulation.load_checkpoint(reprendre)
+    simulation.activer_profilage(profilage)
+    if journal is not None:
+        simulation.activer_journal(journal)
+    if evenements is not None:
+        simulation.activer_export_evenements(evenements)
+    simulation.set_vitesse_simulation(vitesse)
+    simulation.set_mode_resolution(mode_resolution)
+    simulation.set_arrivees_automatiques(arrivees_auto)
+    simulation.set_intervalle_prediction(intervalle_prediction)
+    simulation.demarrer()
+
+    debut = time.perf_counter()
+    for _ in range(ticks):
+        simulation.mise_a_jour()
+        simulation.evenements.vider()
+    duree = time.perf_counter() - debut
+    simulation.fermer_journal()
+    simulation.fermer_export_evenements()
+    simulation.fermer_secteurs()
+
+    return simulation, duree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation sans interface graphique.")
+    parser.add_argument("--ticks", type=int, default=10_000, help="Nombre de ticks à simuler.")
+    parser.add_argument("--seed", type=int, default=None, help="Graine aléatoire.")
+    parser.add_argument("--vitesse", type=float, default=Simulation.VITESSE_SIMULATION_DEFAUT,
+                        help="Facteur de vitesse de la simulation.")
+    parser.add_argument("--flotte", action="store_true", help="Utiliser la flotte vectorisée NumPy.")
+    parser.add_argument("--profil", action="store_true", help="Afficher le profil par phase (JSON).")
+    parser.add_argument("--journal", default=None, help="Enregistrer un journal binaire rejouable.")
+    parser.add_argument("--reprendre", default=None, help="Charger ce checkpoint avant de simuler.")
+    parser.add_argument("--checkpoint", default=None, help="Sauvegarder l'état final dans ce checkpoint.")
+    parser.add_argument("--evenements", default=None, help="Exporter tous les évènements (JSON lignes).")
+    parser.add_argument("--taille", type=dimensions, default=(EspaceAerien.TAILLE_X, EspaceAerien.TAILLE_Y),
+                        help="Dimensions de l'espace aérien (LARGEURxHAUTEUR).")
+    parser.add_argument("--secteurs", type=dimensions, default=(1, 1), help="Découpage en secteurs (NXxNY).")
+    parser.add_argument("--processus", type=int, default=0,
+                        help="Processus de détection par secteur (0 : dans le processus principal).")
+    parser.add_argument("--resolution", choices=MODES_RESOLUTION, default="aucune",
+                        help="Résolution des conflits : avis calculés seulement, ou appliqués automatiquement.")
+    parser.add_argument("--arrivees-auto", action="store_true",
+                        help="Autoriser à atterrir les avions en panne ou à court de carburant.")
+    parser.add_argument("--prediction", type=int, default=Simulation.INTERVALLE_PREDICTION,
+                        help="Prédire les conflits tous les N ticks (0 : jamais).")
+    args = parser.parse_args(argv)
+
+    simulation, duree = executer(args.ticks, args.seed, args.vitesse, args.flotte, args.profil, args.journal,
+                                 args.reprendre, args.evenements, args.taille, args.secteurs, args.processus,
+                                 MODES_RESOLUTION[args.resolution], args.arrivees_auto,
+                                 args.prediction)
+    if args.checkpoint is not None:
+        simulation.save_checkpoint(args.checkpoint)
+
+    ticks_par_s = args.ticks / duree if duree > 0 else float("inf")
+    print(f"{args.ticks} ticks en {duree:.2f}s ({ticks_par_s:.0f} ticks/s)")
+    for cle, valeur in simulation.get_stats().items():
+        print(f"{cle}: {valeur}")
+    if simulation.secteurs is not None:
+        print(f"transferts: {simulation.secteurs.transferts}")
+    if args.profil:
+        print(simulation.profileur.exporter_json())
+
+
+if __name__ == "__main__":
+    main()
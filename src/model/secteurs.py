@@ -0,0 +1,93 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model.espace_aerien import EspaceAerien, detecter_secteur
+
+
+class PartitionSecteurs:
+    """Découpe l'espace en nx × ny secteurs rectangulaires, chacun détectant les collisions de ses avions."""
+
+    # Un avion voisin à moins de la séparation minimale d'une frontière est recopié dans le halo du secteur.
+    LARGEUR_HALO = EspaceAerien.DISTANCE_MIN_LAT
+
+    def __init__(self, nx: int, ny: int, taille_x: float = EspaceAerien.TAILLE_X,
+                 taille_y: float = EspaceAerien.TAILLE_Y, processus: int = 0):
+        self.nx = nx
+        self.ny = ny
+        # Les secteurs du bord s'étendent à l'infini : un avion sorti de l'espace reste suivi.
+        self.bords_x = np.concatenate([[-np.inf], np.arange(1, nx) * (taille_x / nx), [np.inf]])
+        self.bords_y = np.concatenate([[-np.inf], np.arange(1, ny) * (taille_y / ny), [np.inf]])
+        self.processus = processus
+        self._pool = None
+        if processus > 0:
+            # spawn plutôt que fork : le processus parent a déjà des threads (moteur, export d'évènements).
+            self._pool = ProcessPoolExecutor(processus, mp_context=multiprocessing.get_context("spawn"))
+        self.reinitialiser()
+
+    @property
+    def nb_secteurs(self) -> int:
+        return self.nx * self.ny
+
+    def reinitialiser(self):
+        self._handles_precedents = np.empty(0, dtype=np.int64)
+        self._secteurs_precedents = np.empty(0, dtype=np.int64)
+        self.transferts = 0
+        self.avions_par_secteur = np.zeros(self.nb_secteurs, dtype=np.int64)
+
+    def secteurs(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        ix = np.searchsorted(self.bords_x, x, side="right") - 1
+        iy = np.searchsorted(self.bords_y, y, side="right") - 1
+        return iy * self.nx + ix
+
+    def _transferer(self, handles: np.ndarray, secteurs: np.ndarray):
+        # Passage de frontière : l'avion change de secteur propriétaire.
+        precedents = self._handles_precedents
+        if len(precedents) and len(handles):
+            rangs = np.minimum(np.searchsorted(precedents, handles), len(precedents) - 1)
+            connus = precedents[rangs] == handles
+            self.transferts += int(np.count_nonzero(connus & (self._secteurs_precedents[rangs] != secteurs)))
+
+        ordre = np.argsort(handles, kind="stable")
+        self._handles_precedents = handles[ordre]
+        self._secteurs_precedents = secteurs[ordre]
+        self.avions_par_secteur = np.bincount(secteurs, minlength=self.nb_secteurs)
+
+    def _decouper(self, handles, x, y, altitude, secteurs):
+        h = self.LARGEUR_HALO
+        for secteur in range(self.nb_secteurs):
+            proprietaires = secteurs == secteur
+            if not proprietaires.any():
+                continue
+            ix, iy = secteur % self.nx, secteur // self.nx
+            halo = (~proprietaires
+                    & (x >= self.bords_x[ix] - h) & (x < self.bords_x[ix + 1] + h)
+                    & (y >= self.bords_y[iy] - h) & (y < self.bords_y[iy + 1] + h))
+            indices = np.concatenate([np.flatnonzero(proprietaires), np.flatnonzero(halo)])
+            yield (handles[indices], x[indices], y[indices], altitude[indices],
+                   int(np.count_nonzero(proprietaires)))
+
+    def detecter(self, espace: EspaceAerien):
+        handles, x, y, altitude = espace.colonnes("handle", "x", "y", "altitude")
+
+        secteurs = self.secteurs(x, y)
+        self._transferer(handles, secteurs)
+
+        taches = list(self._decouper(handles, x, y, altitude, secteurs))
+        crashes, conflits, alertes = set(), set(), set()
+        if taches:
+            executer = self._pool.map if self._pool is not None else map
+            # Une paire à cheval sur une frontière est vue des deux côtés : l'union des ensembles la dédoublonne.
+            for crashes_secteur, conflits_secteur, alertes_secteur in executer(detecter_secteur, *zip(*taches)):
+                crashes.update(crashes_secteur)
+                conflits.update(conflits_secteur)
+                alertes.update(alertes_secteur)
+
+        par_handle = espace.registre.par_handle
+        return {par_handle(h) for h in crashes}, conflits, {par_handle(h) for h in alertes}
+
+    def fermer(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -1,7 +1,19 @@
+from model.arrivees import GestionnaireArrivees
 from model.espace_aerien import EspaceAerien
 from model.avion import Avion
+from model import checkpoint
+from model.evenements import BusEvenements, Evenement, PuitsJsonLignes
+from model.flotte import Flotte
+from model.historique import HistoriqueTrajectoires
+from model.journal import COMMANDE_ALTITUDE, COMMANDE_ATTERRISSAGE, COMMANDE_CAP, EnregistreurJournal
+from model.prediction import ConflitPrevu, PredicteurConflits
+from model.profilage import ProfileurTicks
+from model.resolution import Resolution, ResolveurConflits
+from model.secteurs import PartitionSecteurs
 import random
 
+import numpy as np
+
 
 class Simulation:
     TEMPS_PAR_TICK_S = 0.1
@@ -13,10 +25,34 @@ class Simulation:
     PROBABILITE_TEMPETE = 0.002
     TEMPS_MAX_TEMPETE_SEC = 5.0
 
-    def __init__(self):
-        self.espace = EspaceAerien()
+    ALTITUDE_MIN = 1000
+    ALTITUDE_MAX = 5000
+
+    RESOLUTION_AUCUNE, RESOLUTION_CONSEIL, RESOLUTION_AUTO = range(3)
+
+    # Prédiction des conflits tous les N ticks ; 0 la désactive (et avec elle la fusion des ticks).
+    INTERVALLE_PREDICTION = 1
+
+    AVANCE_RAPIDE_MAX = 1000
+    # Distance maximale parcourue par un avion en un sous-pas fusionné (moitié du plus petit rayon de tempête).
+    DEPLACEMENT_MAX_SOUS_PAS = 25.0
+
+    def __init__(self, flotte_vectorisee: bool = False, graine: int | None = None,
+                 rng: random.Random | None = None, rng_numpy: np.random.Generator | None = None,
+                 taille_x: float = EspaceAerien.TAILLE_X, taille_y: float = EspaceAerien.TAILLE_Y,
+                 secteurs: tuple[int, int] = (1, 1), processus: int = 0):
+        self.flotte_vectorisee = flotte_vectorisee
+        self.taille_x = taille_x
+        self.taille_y = taille_y
+        # Partition en secteurs ; un seul secteur garde la détection globale d'origine.
+        self.secteurs = PartitionSecteurs(*secteurs, taille_x, taille_y, processus) if secteurs != (1, 1) else None
+        self.rng = rng if rng is not None else random.Random(graine)
+        # Si fourni, les tirages d'incident d'un tick sont faits en un seul appel vectorisé.
+        self.rng_numpy = rng_numpy
+        self.espace = self._creer_espace()
         self.en_cours = False
         self.vitesse_simulation = self.VITESSE_SIMULATION_DEFAUT
+        self.avance_rapide = 1
         self.tick_compteur = 0
 
         self.score = 0
@@ -24,23 +60,67 @@ class Simulation:
         self.avions_entres = 0
         self.avions_perdus_collision = 0
 
-        self.messages = []
+        self.evenements = BusEvenements()
+        self.puits_evenements: PuitsJsonLignes | None = None
+
+        self.predicteur = PredicteurConflits()
+        self.intervalle_prediction = self.INTERVALLE_PREDICTION
+        self.conflits_prevus: list[ConflitPrevu] = []
+        # Ticks avant qu'une paire passe sous la séparation (0 si c'est déjà le cas), selon la dernière prédiction.
+        self.entree_separation = 0.0
+        self.resolveur = ResolveurConflits(self.predicteur, self.ALTITUDE_MIN, self.ALTITUDE_MAX)
+        self.mode_resolution = self.RESOLUTION_AUCUNE
+        self.resolution: Resolution | None = None
+        self.arrivees = GestionnaireArrivees(self.ALTITUDE_MIN)
+        # Historique des trajectoires pour les traînées radar, désactivé par défaut.
+        self.historique: HistoriqueTrajectoires | None = None
+
+        self.profileur = ProfileurTicks()
+        self.journal: EnregistreurJournal | None = None
 
         self._initialiser_avions_depart(5)
 
+    def _creer_espace(self) -> EspaceAerien:
+        if self.secteurs is not None:
+            self.secteurs.reinitialiser()
+        return EspaceAerien(Flotte() if self.flotte_vectorisee else None, self.rng, self.taille_x, self.taille_y,
+                            self.secteurs)
+
+    @property
+    def facteur_surface(self) -> float:
+        return (self.taille_x * self.taille_y) / (EspaceAerien.TAILLE_X * EspaceAerien.TAILLE_Y)
+
+    # Trafic maximal et cadence d'apparition suivent la surface : la densité reste celle de l'espace d'origine.
+    @property
+    def max_avions_en_vol(self) -> int:
+        return int(self.MAX_AVIONS_EN_VOL * self.facteur_surface)
+
+    @property
+    def intervalle_apparition(self) -> int:
+        return max(1, round(self.INTERVALLE_APPARITION_AVION / self.facteur_surface))
+
     def _initialiser_avions_depart(self, nombre):
         self.log("INFO", f"Création de {nombre} avions initiaux.")
         for _ in range(nombre):
             self.espace.generer_avion_aleatoire()
             self.avions_entres += 1
 
-    def log(self, type_msg, texte):
-        self.messages.append((type_msg, texte))
+    def log(self, type_msg: str, texte: str, identifiant: str | None = None):
+        self.evenements.publier(Evenement(self.tick_compteur, type_msg, texte, identifiant))
+
+    def pop_messages(self) -> list[Evenement]:
+        return self.evenements.vider()
 
-    def pop_messages(self):
-        msgs = self.messages.copy()
-        self.messages.clear()
-        return msgs
+    def activer_export_evenements(self, chemin: str):
+        self.fermer_export_evenements()
+        self.puits_evenements = PuitsJsonLignes(chemin)
+        self.evenements.abonner(self.puits_evenements)
+
+    def fermer_export_evenements(self):
+        if self.puits_evenements is not None:
+            self.evenements.desabonner(self.puits_evenements)
+            self.puits_evenements.fermer()
+            self.puits_evenements = None
 
     def demarrer(self):
         self.en_cours = True
@@ -52,7 +132,7 @@ class Simulation:
 
     def redemarrer(self):
         self.arreter()
-        self.espace = EspaceAerien()
+        self.espace = self._creer_espace()
         self.tick_compteur = 0
 
         self.score = 0
@@ -60,69 +140,136 @@ class Simulation:
         self.avions_entres = 0
         self.avions_perdus_collision = 0
 
-        self.messages = []
+        self.evenements.vider()
+        self.conflits_prevus = []
+        self.entree_separation = 0.0
+        self.resolution = None
+        self.arrivees.reinitialiser()
+        if self.historique is not None:
+            self.historique.reinitialiser()
+        if self.journal is not None:
+            # Les poignées repartent de zéro : la frame suivante doit être complète.
+            self.journal.forcer_keyframe()
         self._initialiser_avions_depart(5)
         self.log("INFO", "Réinitialisation complète du système.")
 
+    def save_checkpoint(self, chemin: str):
+        checkpoint.sauver(self, chemin)
+        self.log("INFO", f"Checkpoint sauvegardé dans {chemin} (tick {self.tick_compteur}).")
+
+    def load_checkpoint(self, chemin: str):
+        checkpoint.charger(self, chemin)
+        if self.journal is not None:
+            self.journal.forcer_keyframe()
+        self.log("INFO", f"Checkpoint {chemin} chargé (tick {self.tick_compteur}).")
+
     def ajouter_avion(self):
-        if len(self.espace.avions) < self.MAX_AVIONS_EN_VOL:
+        if len(self.espace.avions) < self.max_avions_en_vol:
             avion = self.espace.generer_avion_aleatoire()
             self.avions_entres += 1
-            self.log("INFO", f"Avion {avion.identifiant} ajouté manuellement.")
+            self.entree_separation = 0.0
+            self.log("INFO", f"Avion {avion.identifiant} ajouté manuellement.", avion.identifiant)
             return avion
         else:
             self.log("WARNING", "Impossible d'ajouter : Espace saturé.")
             return None
 
-    def mise_a_jour(self):
+    @staticmethod
+    def _probabilite(p: float, ticks: int) -> float:
+        # Probabilité qu'un évènement de probabilité p par tick survienne au moins une fois sur `ticks` ticks.
+        return p if ticks == 1 else 1.0 - (1.0 - p) ** ticks
+
+    def mise_a_jour(self, ticks: int = 1) -> int:
+        # Renvoie le nombre de ticks réellement simulés.
         if not self.en_cours:
-            return
+            return 0
 
-        delta_temps_heures = (self.TEMPS_PAR_TICK_S * self.vitesse_simulation) / 3600.0
+        profileur = self.profileur
+        debut_tick = t = profileur.debut()
+
+        delta_tick_heures = (self.TEMPS_PAR_TICK_S * self.vitesse_simulation) / 3600.0
         self.tick_compteur += 1
 
-        if random.random() < self.PROBABILITE_TEMPETE:
-            t = self.espace.generer_tempete()
+        avions_a_retirer = []
+        collisions_evitees_prev = self.espace.collisions_evitees
+
+        # Le pas fusionné a été choisi sur les trajectoires d'avant ces manœuvres : on le recalcule après.
+        if self._guider_arrivees(delta_tick_heures):
+            self.entree_separation = 0.0
+            if ticks > 1:
+                self._borner_entree(self.predicteur.predire(self.espace, delta_tick_heures, inclure_actifs=True))
+                ticks = self._pas_adaptatif(ticks)
+        self.tick_compteur += ticks - 1
+        delta_temps_heures = delta_tick_heures * ticks
+        t = profileur.marquer("arrivees", t)
+
+        if self.espace.flotte is not None:
+            self.espace.flotte.deplacer_tous(delta_temps_heures)
+        else:
+            for avion in self.espace.avions:
+                avion.deplacer(delta_temps_heures)
+        t = profileur.marquer("mouvement", t)
+
+        if self.rng.random() < self._probabilite(self.PROBABILITE_TEMPETE, ticks):
+            self.espace.generer_tempete(self.tick_compteur)
             self.log("WARNING", f"Tempête détectée !")
 
-        if len(self.espace.tempetes) > 3 and random.random() < 0.005:
-            self.espace.tempetes.pop(0)
+        if len(self.espace.tempetes) > 3 and self.rng.random() < self._probabilite(0.005, ticks):
+            self.espace.retirer_tempete(self.espace.tempetes[0])
 
-        for tempete in self.espace.tempetes:
-            tempete.duree_vie -= 1
-        self.espace.tempetes = [t for t in self.espace.tempetes if t.duree_vie > 0]
+        self.espace.expirer_tempetes(self.tick_compteur)
 
-        avions_a_retirer = []
-        collisions_evitees_prev = self.espace.collisions_evitees
+        dans_tempete = self.espace.masque_tempetes()
+        t = profileur.marquer("tempetes", t)
 
-        for avion in self.espace.avions:
-            avion.deplacer(delta_temps_heures)
+        avions = self.espace.avions
+        flotte = self.espace.flotte
+        probabilite_incident = self._probabilite(self.PROBABILITE_INCIDENT, ticks)
+        tirages_incident = None
+        if self.rng_numpy is not None:
+            tirages_incident = self.rng_numpy.random(len(avions)) < probabilite_incident
 
-            if self.espace.verifier_tempete(avion):
-                avion.compteur_tempete += self.TEMPS_PAR_TICK_S
-                if avion.compteur_tempete > self.TEMPS_MAX_TEMPETE_SEC:
-                    avions_a_retirer.append(avion)
-                    self.avions_perdus_collision += 1
-                    self.log("DANGER", f"{avion.identifiant} DÉTRUIT par la tempête !")
-            else:
-                avion.compteur_tempete = max(0, avion.compteur_tempete - 0.1)
+        if flotte is None:
+            lignes = range(len(avions))
+        else:
+            lignes, tirages_incident = self._lignes_evenements(flotte, dans_tempete, ticks, tirages_incident,
+                                                               probabilite_incident)
+
+        for i in lignes:
+            avion = avions[i]
+            if flotte is None:
+                if dans_tempete[i]:
+                    avion.compteur_tempete += self.TEMPS_PAR_TICK_S * ticks
+                else:
+                    avion.compteur_tempete = max(0, avion.compteur_tempete - 0.1 * ticks)
+            if dans_tempete[i] and avion.compteur_tempete > self.TEMPS_MAX_TEMPETE_SEC:
+                avions_a_retirer.append(avion)
+                self.avions_perdus_collision += 1
+                self.log("DANGER", f"{avion.identifiant} DÉTRUIT par la tempête !", avion.identifiant)
 
             if not avion.incident and not avion.a_atterri:
-                if random.random() < self.PROBABILITE_INCIDENT:
+                if tirages_incident is not None:
+                    incident = tirages_incident[i]
+                else:
+                    incident = self.rng.random() < probabilite_incident
+                if incident:
                     avion.incident = True
-                    self.log("WARNING", f"Incident technique sur {avion.identifiant}")
+                    self.log("WARNING", f"Incident technique sur {avion.identifiant}", avion.identifiant)
 
-            if self.espace.tenter_atterrissage(avion):
+            if self.arrivees.autoriser(avion, self.tick_compteur) and self.espace.tenter_atterrissage(avion):
+                self.arrivees.atterrissage(self.tick_compteur)
                 self.avions_atterris_reussis += 1
                 avions_a_retirer.append(avion)
-                self.log("SUCCESS", f"{avion.identifiant} a atterri en sécurité.")
+                self.log("SUCCESS", f"{avion.identifiant} a atterri en sécurité.", avion.identifiant)
 
             if avion.carburant <= 0:
                 self.avions_perdus_collision += 1
                 avions_a_retirer.append(avion)
-                self.log("DANGER", f"{avion.identifiant} s'est écrasé (Panne sèche).")
+                self.log("DANGER", f"{avion.identifiant} s'est écrasé (Panne sèche).", avion.identifiant)
+        t = profileur.marquer("etat_avions", t)
 
         avions_crashes = self.espace.detecter_collisions()
+        t = profileur.marquer("collisions", t)
 
         if self.espace.collisions_evitees > collisions_evitees_prev:
             diff = self.espace.collisions_evitees - collisions_evitees_prev
@@ -132,25 +279,201 @@ class Simulation:
             if avion_crash not in avions_a_retirer:
                 avions_a_retirer.append(avion_crash)
                 self.avions_perdus_collision += 1
-                self.log("DANGER", f"COLLISION EN VOL : {avion_crash.identifiant} détruit !")
-
-        ids_a_retirer = {a.identifiant for a in avions_a_retirer}
-        self.espace.avions = [a for a in self.espace.avions if a.identifiant not in ids_a_retirer]
-
-        if self.tick_compteur % self.INTERVALLE_APPARITION_AVION == 0 and len(
-                self.espace.avions) < self.MAX_AVIONS_EN_VOL:
-            force_conflit = random.random() < 0.25
+                self.log("DANGER", f"COLLISION EN VOL : {avion_crash.identifiant} détruit !",
+                         avion_crash.identifiant)
+
+        self.espace.retirer_avions(avions_a_retirer)
+        if self.historique is not None:
+            for avion in avions_a_retirer:
+                self.historique.retirer(avion)
+
+        intervalle = self.intervalle_apparition
+        apparitions = self.tick_compteur // intervalle - (self.tick_compteur - ticks) // intervalle
+        max_avions = self.max_avions_en_vol
+        for _ in range(apparitions):
+            if len(self.espace.avions) >= max_avions:
+                break
+            force_conflit = self.rng.random() < 0.25
             self.espace.generer_avion_aleatoire(force_conflit)
             self.avions_entres += 1
+            self.entree_separation = 0.0
 
         self.score = (self.avions_atterris_reussis * 100) + \
                      (self.espace.collisions_evitees * 200) - \
                      (self.avions_perdus_collision * 150)
         self.score = max(0, self.score)
+        t = profileur.marquer("gestion_liste", t)
+
+        if self.historique is not None:
+            self.historique.echantillonner(self.espace.avions, self.tick_compteur, ticks)
+            t = profileur.marquer("historique", t)
+
+        intervalle = self.intervalle_prediction
+        if intervalle and self.tick_compteur // intervalle != (self.tick_compteur - ticks) // intervalle:
+            self._prevoir_conflits(delta_tick_heures)
+            t = profileur.marquer("prediction", t)
+        else:
+            # Entre deux prédictions, la borne d'entrée en séparation vieillit avec les ticks écoulés.
+            self.entree_separation = max(0.0, self.entree_separation - ticks)
+
+        if self.mode_resolution != self.RESOLUTION_AUCUNE:
+            self._resoudre_conflits(delta_tick_heures)
+            t = profileur.marquer("resolution", t)
+
+        if self.journal is not None:
+            self.journal.enregistrer_tick(self)
+            profileur.marquer("journal", t)
+        profileur.marquer("tick", debut_tick)
+        return ticks
+
+    def _lignes_evenements(self, flotte: Flotte, dans_tempete: np.ndarray, ticks: int, tirages_incident: np.ndarray | None,
+                           probabilite_incident: float) -> tuple[list[int], np.ndarray]:
+        # Mode flotte : compteurs de tempête mis à jour en colonne, la boucle ne visite que les avions
+        # susceptibles d'un évènement, dans l'ordre de la liste (mêmes retraits, mêmes messages).
+        n = flotte.taille
+        compteur = flotte.compteur_tempete[:n]
+        compteur[:] = np.where(dans_tempete, compteur + self.TEMPS_PAR_TICK_S * ticks,
+                               np.maximum(0, compteur - 0.1 * ticks))
+
+        candidats = ~flotte.incident[:n] & ~flotte.a_atterri[:n]
+        if tirages_incident is None:
+            # Même suite de tirages que la boucle objet : un par candidat, dans l'ordre.
+            tirages_incident = np.zeros(n, dtype=bool)
+            tirages_incident[candidats] = [self.rng.random() < probabilite_incident
+                                           for _ in range(int(np.count_nonzero(candidats)))]
+
+        evenements = ((dans_tempete & (compteur > self.TEMPS_MAX_TEMPETE_SEC)) | (candidats & tirages_incident)
+                      | flotte.instruction_atterrissage[:n] | (flotte.carburant[:n] <= 0))
+        return np.flatnonzero(evenements).tolist(), tirages_incident
+
+    def _guider_arrivees(self, delta_tick_heures: float) -> bool:
+        # Renvoie True si un cap, une vitesse ou un niveau a changé.
+        candidats = []
+        if self.arrivees.autorisation_automatique:
+            candidats = self.arrivees.candidats_automatiques(self.espace)
+            for avion in candidats:
+                self.commande_atterrissage(avion.identifiant)
+                self.log("INFO", f"{avion.identifiant} autorisé automatiquement à atterrir.", avion.identifiant)
+        for identifiant in self.arrivees.guider(self.espace, self.tick_compteur, delta_tick_heures):
+            self.log("DANGER", f"{identifiant} n'a plus assez de carburant pour rejoindre l'aéroport !", identifiant)
+        return bool(candidats) or self.arrivees.trajectoires_modifiees
+
+    def avancer(self, ticks: int) -> int:
+        # Avance de `ticks` ticks en fusionnant ceux sans rapprochement critique ; renvoie le nombre de sous-pas.
+        sous_pas = 0
+        restant = ticks
+        while restant > 0 and self.en_cours:
+            # Le premier sous-pas est unitaire : la prédiction tient alors compte des commandes reçues entre deux frames.
+            pas = self._pas_adaptatif(restant) if sous_pas else 1
+            restant -= self.mise_a_jour(pas)
+            sous_pas += 1
+        return sous_pas
+
+    def _pas_adaptatif(self, restant: int) -> int:
+        # Tant qu'aucune paire n'entre dans le minimum de séparation, fusionner les ticks ne change ni les
+        # conflits ni les crashs détectés ; on retombe sur des ticks unitaires dès qu'un rapprochement est proche.
+        if self.espace.conflits_actifs:
+            return 1
+        # Le sous-pas s'arrête avant que la première paire n'entre dans la séparation, pas à son rapprochement maximal.
+        pas = min(restant, self.predicteur.horizon_ticks, int(min(self.entree_separation, restant)))
+
+        avions = self.espace.avions
+        if avions:
+            delta_tick_heures = (self.TEMPS_PAR_TICK_S * self.vitesse_simulation) / 3600.0
+            deplacement_tick = max(avion.vitesse for avion in avions) * delta_tick_heures * 100
+            if deplacement_tick > 0:
+                pas = min(pas, int(self.DEPLACEMENT_MAX_SOUS_PAS / deplacement_tick))
+        return max(1, pas)
+
+    def _borner_entree(self, conflits: list[ConflitPrevu]):
+        # Au-delà de l'horizon, la prédiction ne garantit plus rien.
+        self.entree_separation = float(min([self.predicteur.horizon_ticks] + [c.entree_ticks for c in conflits]))
+
+    def _prevoir_conflits(self, delta_temps_heures: float):
+        conflits = self.predicteur.predire(self.espace, delta_temps_heures, inclure_actifs=True)
+        self._borner_entree(conflits)
+        conflits = [c for c in conflits if not c.en_separation]
+        deja_prevus = {(c.id1, c.id2) for c in self.conflits_prevus}
+        for conflit in conflits:
+            if (conflit.id1, conflit.id2) not in deja_prevus:
+                eta_s = conflit.eta_ticks * self.TEMPS_PAR_TICK_S
+                self.log("WARNING", f"Conflit prévu : {conflit.id1} / {conflit.id2} dans {eta_s:.1f}s", conflit.id1)
+        self.conflits_prevus = conflits
+
+    def _resoudre_conflits(self, delta_temps_heures: float):
+        if not self.espace.conflits_actifs and not self.conflits_prevus:
+            self.resolution = None
+            return
+        self.resolution = self.resolveur.resoudre(self.espace.avions, delta_temps_heures)
+        if self.mode_resolution == self.RESOLUTION_AUTO and self.resolution.avis:
+            self.appliquer_avis()
+
+    def appliquer_avis(self):
+        if self.resolution is None or not self.resolution.avis:
+            return
+        resolution = self.resolution
+        for avis in resolution.avis:
+            avion = self.trouver_avion(avis.identifiant)
+            if avion is None:
+                continue
+            if avis.cap != avion.cap:
+                self.commande_cap(avis.identifiant, avis.cap)
+            if avis.delta_altitude:
+                self.commande_altitude(avis.identifiant, avis.delta_altitude)
+        self.log("INFO", f"{len(resolution.avis)} avis de résolution appliqués "
+                         f"({resolution.conflits - resolution.non_resolus}/{resolution.conflits} conflits, "
+                         f"{resolution.duree_s * 1000:.1f} ms).")
+        self.resolution = resolution._replace(avis=())
+        if self.intervalle_prediction:
+            # Les marqueurs « Prévu » et le prochain sous-pas doivent décrire les trajectoires après manœuvre.
+            self._prevoir_conflits((self.TEMPS_PAR_TICK_S * self.vitesse_simulation) / 3600.0)
+
+    def set_mode_resolution(self, mode: int):
+        self.mode_resolution = mode
+        if mode == self.RESOLUTION_AUCUNE:
+            self.resolution = None
+
+    def set_intervalle_prediction(self, intervalle: int):
+        self.intervalle_prediction = max(0, int(intervalle))
+        if self.intervalle_prediction == 0:
+            self.conflits_prevus = []
+            self.entree_separation = 0.0
+
+    def set_arrivees_automatiques(self, actif: bool):
+        self.arrivees.autorisation_automatique = actif
+
+    def activer_historique(self, actif: bool, echantillons: int = HistoriqueTrajectoires.ECHANTILLONS,
+                           decimation: int = HistoriqueTrajectoires.DECIMATION_TICKS):
+        self.historique = HistoriqueTrajectoires(echantillons, decimation) if actif else None
 
     def set_vitesse_simulation(self, vitesse: float):
         self.vitesse_simulation = max(1.0, vitesse)
 
+    def set_avance_rapide(self, facteur: int):
+        self.avance_rapide = max(1, min(int(facteur), self.AVANCE_RAPIDE_MAX))
+
+    def activer_profilage(self, actif: bool):
+        self.profileur.actif = actif
+        if not actif:
+            self.profileur.reinitialiser()
+
+    def activer_journal(self, chemin: str, intervalle_keyframe: int = EnregistreurJournal.INTERVALLE_KEYFRAME):
+        self.fermer_journal()
+        self.journal = EnregistreurJournal(chemin, intervalle_keyframe, self.taille_x, self.taille_y)
+        self.log("INFO", f"Enregistrement du journal dans {chemin}.")
+
+    def fermer_journal(self):
+        if self.journal is not None:
+            self.journal.fermer()
+            self.journal = None
+
+    def fermer_secteurs(self):
+        if self.secteurs is not None:
+            self.secteurs.fermer()
+
+    def get_perf_stats(self):
+        return self.profileur.statistiques()
+
     def get_stats(self):
         return {
             "score": self.score,
@@ -161,4 +484,39 @@ class Simulation:
         }
 
     def traiter_atterrissage(self, avion: Avion):
-        avion.instruction_atterrissage = True
\ No newline at end of file
+        avion.instruction_atterrissage = True
+
+    def trouver_avion(self, identifiant: str) -> Avion | None:
+        return self.espace.trouver_avion(identifiant)
+
+    def commande_cap(self, identifiant: str, nouveau_cap: int):
+        avion = self.trouver_avion(identifiant)
+        if avion and avion.en_vol:
+            avion.changer_cap(nouveau_cap)
+            self.entree_separation = 0.0
+            if self.journal is not None:
+                self.journal.commande(COMMANDE_CAP, avion, nouveau_cap)
+
+    def commande_altitude(self, identifiant: str, delta: int):
+        avion = self.trouver_avion(identifiant)
+        if avion and avion.en_vol:
+            nouvelle_alt = avion.altitude + delta
+            if self.ALTITUDE_MIN <= nouvelle_alt <= self.ALTITUDE_MAX:
+                if delta > 0:
+                    avion.monter(delta)
+                else:
+                    avion.descendre(abs(delta))
+                self.entree_separation = 0.0
+                if self.journal is not None:
+                    self.journal.commande(COMMANDE_ALTITUDE, avion, delta)
+
+    def commande_atterrissage(self, identifiant: str):
+        avion = self.trouver_avion(identifiant)
+        if avion and avion.en_vol:
+            avion.changer_cap(self.espace.cap_vers_aeroport(avion.x, avion.y))
+            if avion.altitude > self.ALTITUDE_MIN:
+                avion.altitude = self.ALTITUDE_MIN
+            self.traiter_atterrissage(avion)
+            self.entree_separation = 0.0
+            if self.journal is not None:
+                self.journal.commande(COMMANDE_ATTERRISSAGE, avion)
\ No newline at end of file
@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import json
+import struct
+
+import numpy as np
+
+from model.avion import Avion
+from model.espace_aerien import EspaceAerien
+from model.evenements import Evenement
+from model.instantane import EtatAvion, EtatTempete, Instantane
+from model.journal import (
+    DTYPE_AVION, DTYPE_ENTETE_FICHIER, DTYPE_HANDLE, DTYPE_TEMPETE, TYPE_DELTA, TYPE_KEYFRAME, _ligne_avion
+)
+from model.simulation import Simulation
+
+MAGIC = b"ATCT"
+VERSION_FORMAT = 2
+
+# Champs envoyés séparément dans une delta : seules les valeurs qui ont changé partent sur le réseau.
+CHAMPS_DELTA = ("x", "y", "altitude", "vitesse", "cap", "carburant", "compteur_tempete", "drapeaux", "version")
+
+DTYPE_TRAME = np.dtype([
+    ("type", "u1"),
+    ("numero", "<u4"),
+    ("tick", "<u4"),
+    ("nb_nouveaux", "<u4"),
+    ("nb_retires", "<u4"),
+    ("nb_modifies", "<u4", (len(CHAMPS_DELTA),)),
+    ("nb_tempetes_nouvelles", "<u4"),
+    ("nb_tempetes_expirees", "<u4"),
+    ("octets_evenements", "<u4"),
+    ("score", "<i4"),
+    ("avions_atterris", "<i4"),
+    ("avions_perdus", "<i4"),
+    ("collisions_evitees", "<i4"),
+])
+
+# Chaque trame est précédée de sa longueur sur le flux TCP.
+LONGUEUR = struct.Struct("<I")
+
+
+class EncodeurTelemetrie:
+    """Encode l'état de la simulation à chaque tick en une trame partagée par tous les clients."""
+
+    INTERVALLE_KEYFRAME = 100
+
+    def __init__(self, intervalle_keyframe: int = INTERVALLE_KEYFRAME):
+        self.intervalle_keyframe = intervalle_keyframe
+        self.numero = 0
+        self._tick = -1
+        self._avions = np.empty(0, dtype=DTYPE_AVION)
+        self._tempetes = np.empty(0, dtype=DTYPE_TEMPETE)
+        self._entete = np.zeros(1, dtype=DTYPE_TRAME)
+        self._evenements = b""
+        self._keyframe: bytes | None = None
+
+    def capturer(self, simulation: Simulation, evenements: list[Evenement]) -> bytes:
+        avions = np.array([_ligne_avion(a) for a in simulation.espace.avions], dtype=DTYPE_AVION)
+        avions = avions[np.argsort(avions["handle"], kind="stable")]
+        tempetes = np.array([(t.numero, t.x, t.y, t.rayon, t.expiration) for t in simulation.espace.tempetes],
+                            dtype=DTYPE_TEMPETE)
+        precedents, tempetes_precedentes = self._avions, self._tempetes
+        # Un tick qui recule (redémarrage, checkpoint) invalide les poignées connues des clients.
+        keyframe = self.numero % self.intervalle_keyframe == 0 or simulation.tick_compteur < self._tick
+
+        stats = simulation.get_stats()
+        entete = self._entete
+        entete["numero"] = self.numero
+        entete["tick"] = simulation.tick_compteur
+        for cle in ("score", "avions_atterris", "avions_perdus", "collisions_evitees"):
+            entete[cle] = stats[cle]
+        self._evenements = json.dumps([list(e) for e in evenements]).encode() if evenements else b""
+        self._avions, self._tempetes, self._tick = avions, tempetes, simulation.tick_compteur
+        self._keyframe = None
+        self.numero += 1
+
+        if keyframe:
+            return self.keyframe()
+        return self._delta(precedents, avions, tempetes_precedentes, tempetes)
+
+    def keyframe(self) -> bytes:
+        # Construite au plus une fois par tick, quel que soit le nombre de clients à resynchroniser.
+        if self._keyframe is None:
+            self._keyframe = self._assembler(TYPE_KEYFRAME, self._avions, np.empty(0, dtype=DTYPE_HANDLE),
+                                             [], self._tempetes, np.empty(0, dtype=DTYPE_HANDLE))
+        return self._keyframe
+
+    def _delta(self, precedents: np.ndarray, avions: np.ndarray,
+               tempetes_precedentes: np.ndarray, tempetes: np.ndarray) -> bytes:
+        handles_precedents = precedents["handle"]
+        if len(precedents):
+            rangs = np.minimum(np.searchsorted(handles_precedents, avions["handle"]), len(precedents) - 1)
+            connus = handles_precedents[rangs] == avions["handle"]
+        else:
+            rangs = np.zeros(len(avions), dtype=np.int64)
+            connus = np.zeros(len(avions), dtype=bool)
+        anciens = precedents[rangs[connus]]
+        suivis = avions[connus]
+
+        modifies = []
+        for champ in CHAMPS_DELTA:
+            change = anciens[champ] != suivis[champ]
+            modifies.append((suivis["handle"][change], suivis[champ][change]))
+
+        retires = handles_precedents[~np.isin(handles_precedents, avions["handle"])]
+        nouvelles = tempetes[~np.isin(tempetes["numero"], tempetes_precedentes["numero"])]
+        expirees = tempetes_precedentes["numero"][~np.isin(tempetes_precedentes["numero"], tempetes["numero"])]
+        return self._assembler(TYPE_DELTA, avions[~connus], retires, modifies, nouvelles, expirees)
+
+    def _assembler(self, type_trame: int, nouveaux: np.ndarray, retires: np.ndarray,
+                   modifies: list[tuple[np.ndarray, np.ndarray]], nouvelles: np.ndarray, expirees: np.ndarray) -> bytes:
+        entete = self._entete.copy()
+        entete["type"] = type_trame
+        entete["nb_nouveaux"] = len(nouveaux)
+        entete["nb_retires"] = len(retires)
+        entete["nb_modifies"] = [len(handles) for handles, _ in modifies] if modifies else 0
+        entete["nb_tempetes_nouvelles"] = len(nouvelles)
+        entete["nb_tempetes_expirees"] = len(expirees)
+        entete["octets_evenements"] = len(self._evenements)
+
+        morceaux = [entete.tobytes(), nouveaux.tobytes(), retires.astype(DTYPE_HANDLE).tobytes()]
+        for handles, valeurs in modifies:
+            morceaux.append(handles.astype(DTYPE_HANDLE).tobytes())
+            morceaux.append(valeurs.tobytes())
+        morceaux += [nouvelles.tobytes(), expirees.astype(DTYPE_HANDLE).tobytes(), self._evenements]
+        return b"".join(morceaux)
+
+
+class DecodeurTelemetrie:
+    """Côté client : applique les trames reçues et reconstruit des instantanés."""
+
+    def __init__(self, taille_x: float = EspaceAerien.TAILLE_X, taille_y: float = EspaceAerien.TAILLE_Y):
+        self.taille_x = taille_x
+        self.taille_y = taille_y
+        self.synchronise = False
+        self.numero = -1
+        self._avions = np.empty(0, dtype=DTYPE_AVION)
+        self._tempetes = np.empty(0, dtype=DTYPE_TEMPETE)
+        self._entete = None
+        self.evenements: list[Evenement] = []
+
+    @staticmethod
+    def _lire(trame: bytes, offset: int, dtype: np.dtype, nombre: int) -> tuple[np.ndarray, int]:
+        tableau = np.frombuffer(trame, dtype=dtype, count=nombre, offset=offset)
+        return tableau, offset + nombre * dtype.itemsize
+
+    def appliquer(self, trame: bytes) -> bool:
+        # Renvoie False pour une delta qui ne suit pas la dernière trame appliquée : on attend la keyframe.
+        entete, offset = self._lire(trame, 0, DTYPE_TRAME, 1)
+        entete = entete[0]
+        keyframe = entete["type"] == TYPE_KEYFRAME
+        if not keyframe and (not self.synchronise or entete["numero"] != self.numero + 1):
+            self.synchronise = False
+            return False
+
+        nouveaux, offset = self._lire(trame, offset, DTYPE_AVION, int(entete["nb_nouveaux"]))
+        retires, offset = self._lire(trame, offset, DTYPE_HANDLE, int(entete["nb_retires"]))
+        avions = self._avions if not keyframe else np.empty(0, dtype=DTYPE_AVION)
+        avions = avions[~np.isin(avions["handle"], retires)]
+        avions = np.concatenate([avions, nouveaux])
+        avions = avions[np.argsort(avions["handle"], kind="stable")]
+
+        for champ, nombre in zip(CHAMPS_DELTA, entete["nb_modifies"].tolist()):
+            handles, offset = self._lire(trame, offset, DTYPE_HANDLE, nombre)
+            valeurs, offset = self._lire(trame, offset, DTYPE_AVION[champ], nombre)
+            if nombre:
+                avions[champ][np.searchsorted(avions["handle"], handles)] = valeurs
+
+        nouvelles, offset = self._lire(trame, offset, DTYPE_TEMPETE, int(entete["nb_tempetes_nouvelles"]))
+        expirees, offset = self._lire(trame, offset, DTYPE_HANDLE, int(entete["nb_tempetes_expirees"]))
+        tempetes = self._tempetes if not keyframe else np.empty(0, dtype=DTYPE_TEMPETE)
+        self._tempetes = np.concatenate([tempetes[~np.isin(tempetes["numero"], expirees)], nouvelles])
+
+        octets = int(entete["octets_evenements"])
+        if octets:
+            self.evenements.extend(Evenement(*e) for e in json.loads(trame[offset:offset + octets]))
+
+        self._avions = avions
+        self._entete = entete
+        self.numero = int(entete["numero"])
+        self.synchronise = True
+        return True
+
+    def instantane(self) -> Instantane:
+        avions = tuple(
+            EtatAvion(ligne["identifiant"].decode(), float(ligne["x"]), float(ligne["y"]), int(ligne["altitude"]),
+                      int(ligne["vitesse"]), int(ligne["cap"]), float(ligne["carburant"]),
+                      bool(ligne["drapeaux"] & Avion.EN_VOL), bool(ligne["drapeaux"] & Avion.ALERTE_COLLISION),
+                      bool(ligne["drapeaux"] & Avion.INSTRUCTION_ATTERRISSAGE),
+                      bool(ligne["drapeaux"] & Avion.A_ATTERRI), bool(ligne["drapeaux"] & Avion.INCIDENT),
+                      float(ligne["compteur_tempete"]), int(ligne["version"]))
+            for ligne in self._avions
+        )
+        tempetes = tuple(EtatTempete(float(t["x"]), float(t["y"]), int(t["rayon"])) for t in self._tempetes)
+        entete = self._entete
+        stats = {
+            "score": int(entete["score"]),
+            "avions_en_vol": len(avions),
+            "avions_atterris": int(entete["avions_atterris"]),
+            "avions_perdus": int(entete["avions_perdus"]),
+            "collisions_evitees": int(entete["collisions_evitees"]),
+        }
+        return Instantane(int(entete["tick"]), True, avions, tempetes, stats, (), {a.identifiant: a for a in avions},
+                          taille_x=self.taille_x, taille_y=self.taille_y)
+
+
+class ClientTelemetrie:
+    def __init__(self, writer: asyncio.StreamWriter, taille_file: int):
+        self.writer = writer
+        self.file: asyncio.Queue[bytes] = asyncio.Queue(taille_file)
+        self.besoin_keyframe = True
+        self.trames_sautees = 0
+
+
+class ServeurTelemetrie:
+    """Fait tourner la simulation dans la boucle asyncio et diffuse ses trames à tous les clients connectés."""
+
+    HOTE = "127.0.0.1"
+    PORT = 8765
+    # Trames en attente par client ; au-delà, le client est trop lent et repart d'une keyframe.
+    TAILLE_FILE_CLIENT = 8
+
+    def __init__(self, simulation: Simulation, hote: str = HOTE, port: int = PORT,
+                 intervalle_keyframe: int = EncodeurTelemetrie.INTERVALLE_KEYFRAME,
+                 taille_file: int = TAILLE_FILE_CLIENT, periode_s: float = Simulation.TEMPS_PAR_TICK_S):
+        self.simulation = simulation
+        self.hote = hote
+        self.port = port
+        self.taille_file = taille_file
+        self.periode_s = periode_s
+        self.encodeur = EncodeurTelemetrie(intervalle_keyframe)
+        self.clients: set[ClientTelemetrie] = set()
+        self._connexions: set[asyncio.Task] = set()
+        self._serveur: asyncio.Server | None = None
+
+    async def demarrer(self):
+        self._serveur = await asyncio.start_server(self._servir, self.hote, self.port)
+        self.port = self._serveur.sockets[0].getsockname()[1]
+        self.simulation.log("INFO", f"Télémétrie sur {self.hote}:{self.port}.")
+
+    async def executer(self, ticks: int | None = None):
+        # La simulation n'attend jamais les clients : diffuser ne fait que remplir des files bornées.
+        boucle = asyncio.get_running_loop()
+        prochain = boucle.time()
+        tick = 0
+        while ticks is None or tick < ticks:
+            self.simulation.avancer(self.simulation.avance_rapide)
+            self.diffuser(self.encodeur.capturer(self.simulation, self.simulation.pop_messages()))
+            tick += 1
+
+            prochain += self.periode_s
+            attente = prochain - boucle.time()
+            if attente <= 0:
+                prochain = boucle.time()
+            await asyncio.sleep(max(0.0, attente))
+
+    def diffuser(self, trame: bytes):
+        for client in self.clients:
+            if client.besoin_keyframe or client.file.full():
+                # Client nouveau ou en retard : les deltas en attente ne servent plus, on les remplace par l'état complet.
+                while not client.file.empty():
+                    client.file.get_nowait()
+                    client.trames_sautees += 1
+                client.file.put_nowait(self.encodeur.keyframe())
+                client.besoin_keyframe = False
+            else:
+                client.file.put_nowait(trame)
+
+    async def _servir(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = ClientTelemetrie(writer, self.taille_file)
+        self.clients.add(client)
+        self._connexions.add(asyncio.current_task())
+        envoi = asyncio.ensure_future(self._envoyer(client))
+        fermeture = asyncio.ensure_future(self._attendre_fermeture(reader))
+        try:
+            await asyncio.wait({envoi, fermeture}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.clients.discard(client)
+            self._connexions.discard(asyncio.current_task())
+            envoi.cancel()
+            fermeture.cancel()
+            writer.close()
+
+    async def _envoyer(self, client: ClientTelemetrie):
+        writer = client.writer
+        try:
+            writer.write(np.array([(MAGIC, VERSION_FORMAT, self.simulation.taille_x, self.simulation.taille_y)],
+                                  dtype=DTYPE_ENTETE_FICHIER).tobytes())
+            while True:
+                trame = await client.file.get()
+                writer.write(LONGUEUR.pack(len(trame)))
+                writer.write(trame)
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    async def _attendre_fermeture(reader: asyncio.StreamReader):
+        # Les clients n'envoient rien : la fin du flux signale la déconnexion.
+        while await reader.read(1024):
+            pass
+
+    async def fermer(self):
+        if self._serveur is not None:
+            self._serveur.close()
+            # Fermer les connexions termine normalement leurs tâches, sans annulation en cours d'envoi.
+            for client in self.clients:
+                client.writer.close()
+            await asyncio.gather(*self._connexions, return_exceptions=True)
+            await self._serveur.wait_closed()
+            self._serveur = None
+
+
+async def suivre(hote: str = ServeurTelemetrie.HOTE, port: int = ServeurTelemetrie.PORT):
+    # Client minimal : produit un instantané pour chaque trame appliquée.
+    reader, writer = await asyncio.open_connection(hote, port)
+    try:
+        entete = np.frombuffer(await reader.readexactly(DTYPE_ENTETE_FICHIER.itemsize), dtype=DTYPE_ENTETE_FICHIER)[0]
+        if entete["magic"] != MAGIC or entete["version"] != VERSION_FORMAT:
+            raise ValueError(f"{hote}:{port} n'est pas un serveur de télémétrie compatible.")
+        decodeur = DecodeurTelemetrie(float(entete["taille_x"]), float(entete["taille_y"]))
+        while True:
+            (longueur,) = LONGUEUR.unpack(await reader.readexactly(LONGUEUR.size))
+            if decodeur.appliquer(await reader.readexactly(longueur)):
+                yield decodeur.instantane(), decodeur
+    except asyncio.IncompleteReadError:
+        # Le serveur s'est arrêté.
+        return
+    finally:
+        writer.close()
+
+
+async def _lancer_serveur(args):
+    simulation = Simulation(flotte_vectorisee=args.flotte, graine=args.seed)
+    simulation.set_vitesse_simulation(args.vitesse)
+    simulation.demarrer()
+    serveur = ServeurTelemetrie(simulation, args.hote, args.port, args.keyframe, args.file)
+    await serveur.demarrer()
+    print(f"Télémétrie sur {serveur.hote}:{serveur.port}")
+    try:
+        await serveur.executer(args.ticks)
+    finally:
+        await serveur.fermer()
+
+
+async def _lancer_client(args):
+    async for instantane, decodeur in suivre(args.hote, args.port):
+        for evenement in decodeur.evenements:
+            print(f"[{evenement.tick}] {evenement.type}: {evenement.texte}")
+        decodeur.evenements.clear()
+        if instantane.tick % 10 == 0:
+            print(f"tick {instantane.tick} : {instantane.stats}")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Serveur de télémétrie (ou client avec --client).")
+    parser.add_argument("--client", action="store_true", help="Se connecter à un serveur et afficher son état.")
+    parser.add_argument("--hote", default=ServeurTelemetrie.HOTE, help="Adresse d'écoute ou du serveur.")
+    parser.add_argument("--port", type=int, default=ServeurTelemetrie.PORT, help="Port TCP.")
+    parser.add_argument("--ticks", type=int, default=None, help="Arrêter le serveur après ce nombre de ticks.")
+    parser.add_argument("--seed", type=int, default=None, help="Graine aléatoire.")
+    parser.add_argument("--vitesse", type=float, default=Simulation.VITESSE_SIMULATION_DEFAUT,
+                        help="Facteur de vitesse de la simulation.")
+    parser.add_argument("--flotte", action="store_true", help="Utiliser la flotte vectorisée NumPy.")
+    parser.add_argument("--keyframe", type=int, default=EncodeurTelemetrie.INTERVALLE_KEYFRAME,
+                        help="Intervalle entre deux keyframes (ticks).")
+    parser.add_argument("--file", type=int, default=ServeurTelemetrie.TAILLE_FILE_CLIENT,
+                        help="Trames en attente par client avant de le resynchroniser.")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_lancer_client(args) if args.client else _lancer_serveur(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
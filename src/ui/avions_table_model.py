@@ -0,0 +1,152 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+from model.instantane import EtatAvion, Instantane
+
+
+class AvionsTableModel(QAbstractTableModel):
+    COLONNES = ("Avion", "Altitude", "Carburant", "Alerte")
+    COLONNE_AVION, COLONNE_ALTITUDE, COLONNE_CARBURANT, COLONNE_ALERTE = range(4)
+
+    # Rôle utilisé par le proxy de tri : valeurs numériques plutôt que le texte affiché.
+    ROLE_TRI = Qt.UserRole + 1
+
+    ALERTE_AUCUNE, ALERTE_PREVUE, ALERTE_TEMPETE, ALERTE_COLLISION, ALERTE_PANNE = range(5)
+    TEXTES_ALERTE = {
+        ALERTE_AUCUNE: "",
+        ALERTE_PREVUE: "⏱️ Prévue",
+        ALERTE_TEMPETE: "⛈️ Tempête",
+        ALERTE_COLLISION: "⚔️ COLLISION",
+        ALERTE_PANNE: "⚠️ Panne",
+    }
+    COULEURS_ALERTE = {
+        ALERTE_PREVUE: QBrush(QColor("#ffb86c")),
+        ALERTE_TEMPETE: QBrush(QColor("#8be9fd")),
+        ALERTE_COLLISION: QBrush(QColor("#ff5555")),
+        ALERTE_PANNE: QBrush(QColor("#ff8c00")),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._avions: list[EtatAvion] = []
+        # Valeurs affichées par ligne : une ligne n'est signalée modifiée que si l'une d'elles change.
+        self._affichages: list[tuple] = []
+        self._rangs: dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._avions)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLONNES)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLONNES[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        identifiant, altitude, carburant, alerte = self._affichages[index.row()]
+        colonne = index.column()
+
+        if role == Qt.DisplayRole:
+            if colonne == self.COLONNE_AVION:
+                return identifiant
+            if colonne == self.COLONNE_ALTITUDE:
+                return f"{altitude} m"
+            if colonne == self.COLONNE_CARBURANT:
+                return f"{carburant} %"
+            return self.TEXTES_ALERTE[alerte]
+        if role == self.ROLE_TRI:
+            return (identifiant, altitude, carburant, alerte)[colonne]
+        if role == Qt.ForegroundRole and colonne == self.COLONNE_ALERTE:
+            return self.COULEURS_ALERTE.get(alerte)
+        if role == Qt.UserRole:
+            return identifiant
+        return None
+
+    def rang(self, identifiant: str) -> int | None:
+        return self._rangs.get(identifiant)
+
+    def _affichage(self, avion: EtatAvion, ids_prevus: set[str]) -> tuple:
+        if avion.incident:
+            alerte = self.ALERTE_PANNE
+        elif avion.alerte_collision:
+            alerte = self.ALERTE_COLLISION
+        elif avion.compteur_tempete > 0:
+            alerte = self.ALERTE_TEMPETE
+        elif avion.identifiant in ids_prevus:
+            alerte = self.ALERTE_PREVUE
+        else:
+            alerte = self.ALERTE_AUCUNE
+        return avion.identifiant, avion.altitude, int(avion.carburant), alerte
+
+    def mettre_a_jour(self, instantane: Instantane):
+        limite_x = instantane.taille_x
+        limite_y = instantane.taille_y
+        visibles = {a.identifiant: a for a in instantane.avions if 0 <= a.x <= limite_x and 0 <= a.y <= limite_y}
+
+        ids_prevus = set()
+        for conflit in instantane.conflits_prevus:
+            ids_prevus.add(conflit.id1)
+            ids_prevus.add(conflit.id2)
+
+        # Suppressions par blocs contigus, en partant de la fin pour garder les rangs valides.
+        a_retirer = [rang for rang, avion in enumerate(self._avions) if avion.identifiant not in visibles]
+        if a_retirer:
+            fin = a_retirer[-1]
+            debut = fin
+            for rang in reversed(a_retirer[:-1]):
+                if rang == debut - 1:
+                    debut = rang
+                    continue
+                self._retirer_lignes(debut, fin)
+                debut = fin = rang
+            self._retirer_lignes(debut, fin)
+            self._rangs = {avion.identifiant: rang for rang, avion in enumerate(self._avions)}
+
+        modifiees = []
+        for rang, ancien in enumerate(self._avions):
+            avion = visibles[ancien.identifiant]
+            self._avions[rang] = avion
+            affichage = self._affichage(avion, ids_prevus)
+            if affichage != self._affichages[rang]:
+                self._affichages[rang] = affichage
+                modifiees.append(rang)
+        self._signaler_modifications(modifiees)
+
+        nouveaux = [avion for identifiant, avion in visibles.items() if identifiant not in self._rangs]
+        if nouveaux:
+            debut = len(self._avions)
+            self.beginInsertRows(QModelIndex(), debut, debut + len(nouveaux) - 1)
+            for avion in nouveaux:
+                self._rangs[avion.identifiant] = len(self._avions)
+                self._avions.append(avion)
+                self._affichages.append(self._affichage(avion, ids_prevus))
+            self.endInsertRows()
+
+    def _retirer_lignes(self, debut: int, fin: int):
+        self.beginRemoveRows(QModelIndex(), debut, fin)
+        del self._avions[debut:fin + 1]
+        del self._affichages[debut:fin + 1]
+        self.endRemoveRows()
+
+    def _signaler_modifications(self, rangs: list[int]):
+        if not rangs:
+            return
+        derniere_colonne = len(self.COLONNES) - 1
+        debut = precedent = rangs[0]
+        for rang in rangs[1:] + [None]:
+            if rang is not None and rang == precedent + 1:
+                precedent = rang
+                continue
+            self.dataChanged.emit(self.index(debut, 0), self.index(precedent, derniere_colonne))
+            if rang is not None:
+                debut = precedent = rang
+
+    def vider(self):
+        self.beginResetModel()
+        self._avions = []
+        self._affichages = []
+        self._rangs = {}
+        self.endResetModel()
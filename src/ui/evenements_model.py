@@ -0,0 +1,62 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+from model.evenements import Evenement
+
+
+class EvenementsListModel(QAbstractListModel):
+    HISTORIQUE_MAX = 2000
+
+    COULEURS = {
+        "DANGER": QBrush(QColor("#ff5555")),
+        "WARNING": QBrush(QColor("#ffb86c")),
+        "SUCCESS": QBrush(QColor("#50fa7b")),
+    }
+    COULEUR_DEFAUT = QBrush(QColor("#f8f8f2"))
+
+    def __init__(self, parent=None, historique_max: int = HISTORIQUE_MAX):
+        super().__init__(parent)
+        self.historique_max = historique_max
+        self._evenements: list[Evenement] = []
+        self._perdus_affiches = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._evenements)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        evenement = self._evenements[index.row()]
+        if role == Qt.DisplayRole:
+            return f"[{evenement.tick}] {evenement.texte}"
+        if role == Qt.ForegroundRole:
+            return self.COULEURS.get(evenement.type, self.COULEUR_DEFAUT)
+        if role == Qt.UserRole:
+            return evenement.identifiant
+        return None
+
+    def ajouter(self, evenements: list[Evenement], perdus: int = 0):
+        # Un seul insert (et au plus un retrait) par frame, quel que soit le nombre d'évènements.
+        if perdus > self._perdus_affiches:
+            tick = evenements[0].tick if evenements else 0
+            evenements = [Evenement(tick, "WARNING", f"… {perdus - self._perdus_affiches} évènement(s) perdu(s)")] \
+                + evenements
+            self._perdus_affiches = perdus
+        if not evenements:
+            return
+
+        evenements = evenements[-self.historique_max:]
+        debut = len(self._evenements)
+        self.beginInsertRows(QModelIndex(), debut, debut + len(evenements) - 1)
+        self._evenements.extend(evenements)
+        self.endInsertRows()
+
+        exces = len(self._evenements) - self.historique_max
+        if exces > 0:
+            self.beginRemoveRows(QModelIndex(), 0, exces - 1)
+            del self._evenements[:exces]
+            self.endRemoveRows()
+
+    def vider(self):
+        self.beginResetModel()
+        self._evenements = []
+        self.endResetModel()
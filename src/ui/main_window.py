@@ -1,33 +1,58 @@
+import json
 import sys
-import math
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QPushButton, QApplication, QGroupBox, QSpinBox, QListWidget, QListWidgetItem
+    QLabel, QPushButton, QApplication, QGroupBox, QSpinBox, QListView,
+    QTableView, QHeaderView, QAbstractItemView, QComboBox, QCheckBox
 )
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QColor, QBrush
+from PySide6.QtCore import Qt, QTimer, QSortFilterProxyModel, QItemSelectionModel
 from model.simulation import Simulation
-from model.avion import Avion
+from model.evenements import Evenement
+from model.instantane import EtatAvion
+from model.journal import LecteurJournal
+from model.moteur import MoteurRelecture, MoteurSimulation
+from model.profilage import ProfileurTicks
+from ui.avions_table_model import AvionsTableModel
+from ui.evenements_model import EvenementsListModel
+from ui.radar_gl import RadarGLView
 from ui.radar_view import RadarView
 
 
 class MainWindow(QMainWindow):
-    REFRESH_RATE_MS = 100
+    REFRESH_RATE_MS = 16
+    PERF_REFRESH_FRAMES = 30
+    PERF_EXPORT_PATH = "profil_perf.json"
 
-    def __init__(self):
+    def __init__(self, graine: int | None = None, relecture: str | None = None, journal: str | None = None,
+                 evenements: str | None = None, opengl: bool = False):
         super().__init__()
         self.setWindowTitle("Simulateur Tour de Contrôle 🛫")
         self.setGeometry(100, 100, 1300, 900)
 
-        self.simulation = Simulation()
-        self.avion_selectionne: Avion = None
+        self.simulation = Simulation(graine=graine)
+        if relecture is not None:
+            self.setWindowTitle(f"Relecture — {relecture}")
+            self.moteur = MoteurRelecture(LecteurJournal(relecture))
+        else:
+            if journal is not None:
+                self.simulation.activer_journal(journal)
+            if evenements is not None:
+                self.simulation.activer_export_evenements(evenements)
+            self.moteur = MoteurSimulation(self.simulation)
+        self.instantane = self.moteur.dernier_instantane()
+        self._instantane_affiche = None
+        self.avion_selectionne: EtatAvion = None
+        self.profileur = ProfileurTicks()
+        self._frames_depuis_perf = 0
+        self._opengl = opengl
 
         self._setup_ui()
         self._setup_timer()
 
         self.radar_view.avion_selectionne.connect(self._selectionner_avion)
 
-        self._simulation_tick()
+        self._rafraichir_affichage()
+        self.moteur.demarrer()
 
     def _setup_ui(self):
         central_widget = QWidget()
@@ -36,7 +61,7 @@ class MainWindow(QMainWindow):
         radar_group = QGroupBox("Zone de Visualisation Radar")
         radar_layout = QVBoxLayout(radar_group)
 
-        self.radar_view = RadarView()
+        self.radar_view = RadarGLView() if self._opengl else RadarView()
         radar_layout.addWidget(self.radar_view)
 
         btn_layout = QHBoxLayout()
@@ -55,6 +80,11 @@ class MainWindow(QMainWindow):
         btn_layout.addWidget(self.btn_restart)
         btn_layout.addWidget(self.btn_add_plane)
 
+        self.btn_perf = QPushButton("📊 Perf")
+        self.btn_perf.setCheckable(True)
+        self.btn_perf.toggled.connect(self._basculer_profilage)
+        btn_layout.addWidget(self.btn_perf)
+
         radar_layout.addLayout(btn_layout)
         main_layout.addWidget(radar_group, 3)
 
@@ -89,21 +119,74 @@ class MainWindow(QMainWindow):
         stats_layout.addWidget(QLabel("Collisions Évitées:"), 5, 0)
         stats_layout.addWidget(self.label_avoided, 5, 1)
 
+        self.label_prevus = QLabel("0")
+        self.label_prevus.setStyleSheet("color: #ffb86c; font-weight: bold;")
+        stats_layout.addWidget(QLabel("Conflits Prévus:"), 6, 0)
+        stats_layout.addWidget(self.label_prevus, 6, 1)
+
         self.spin_speed = QSpinBox()
         self.spin_speed.setRange(1, 10)
         self.spin_speed.setValue(int(self.simulation.VITESSE_SIMULATION_DEFAUT))
         self.spin_speed.valueChanged.connect(self._update_sim_speed)
-        stats_layout.addWidget(QLabel("Vitesse Simu (x):"), 6, 0)
-        stats_layout.addWidget(self.spin_speed, 6, 1)
+        stats_layout.addWidget(QLabel("Vitesse Simu (x):"), 7, 0)
+        stats_layout.addWidget(self.spin_speed, 7, 1)
+
+        self.spin_avance_rapide = QSpinBox()
+        self.spin_avance_rapide.setRange(1, Simulation.AVANCE_RAPIDE_MAX)
+        self.spin_avance_rapide.setValue(1)
+        self.spin_avance_rapide.valueChanged.connect(self._update_avance_rapide)
+        stats_layout.addWidget(QLabel("Avance rapide ⏩ (x):"), 8, 0)
+        stats_layout.addWidget(self.spin_avance_rapide, 8, 1)
+
+        self.check_arrivees_auto = QCheckBox("Autoriser les atterrissages d'urgence")
+        self.check_arrivees_auto.toggled.connect(self._basculer_arrivees_auto)
+        stats_layout.addWidget(self.check_arrivees_auto, 9, 0, 1, 2)
+
+        self.check_trainees = QCheckBox("Afficher les traînées")
+        self.check_trainees.toggled.connect(self._basculer_trainees)
+        stats_layout.addWidget(self.check_trainees, 10, 0, 1, 2)
 
         control_panel.addWidget(stats_group)
 
+        resolution_group = QGroupBox("Résolution des Conflits")
+        resolution_layout = QGridLayout(resolution_group)
+        self.combo_resolution = QComboBox()
+        self.combo_resolution.addItems(["Désactivée", "Conseil", "Automatique"])
+        self.combo_resolution.currentIndexChanged.connect(self._changer_mode_resolution)
+        resolution_layout.addWidget(QLabel("Mode:"), 0, 0)
+        resolution_layout.addWidget(self.combo_resolution, 0, 1)
+        self.label_resolution = QLabel("—")
+        self.label_resolution.setStyleSheet("font-size: 10px;")
+        resolution_layout.addWidget(self.label_resolution, 1, 0, 1, 2)
+        self.btn_appliquer_avis = QPushButton("✅ Appliquer les avis")
+        self.btn_appliquer_avis.setEnabled(False)
+        self.btn_appliquer_avis.clicked.connect(self._appliquer_avis)
+        resolution_layout.addWidget(self.btn_appliquer_avis, 2, 0, 1, 2)
+        control_panel.addWidget(resolution_group)
+
         liste_group = QGroupBox("Sélection d'Avion")
         liste_layout = QVBoxLayout(liste_group)
-        self.list_avions = QListWidget()
-        self.list_avions.setMaximumHeight(100)
-        self.list_avions.itemClicked.connect(self._on_list_clicked)
-        liste_layout.addWidget(self.list_avions)
+        self.modele_avions = AvionsTableModel(self)
+        self.proxy_avions = QSortFilterProxyModel(self)
+        self.proxy_avions.setSourceModel(self.modele_avions)
+        self.proxy_avions.setSortRole(AvionsTableModel.ROLE_TRI)
+        self.proxy_avions.setDynamicSortFilter(True)
+
+        self.table_avions = QTableView()
+        self.table_avions.setModel(self.proxy_avions)
+        self.table_avions.setSortingEnabled(True)
+        self.table_avions.sortByColumn(AvionsTableModel.COLONNE_ALERTE, Qt.DescendingOrder)
+        self.table_avions.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_avions.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table_avions.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Hauteur de ligne fixe : la vue ne mesure jamais les lignes hors écran.
+        self.table_avions.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_avions.verticalHeader().setDefaultSectionSize(20)
+        self.table_avions.verticalHeader().hide()
+        self.table_avions.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_avions.setMaximumHeight(180)
+        self.table_avions.clicked.connect(self._on_table_clicked)
+        liste_layout.addWidget(self.table_avions)
         control_panel.addWidget(liste_group)
 
         self.control_group = QGroupBox("Commandes (Sélectionné: Aucun)")
@@ -118,12 +201,26 @@ class MainWindow(QMainWindow):
 
         log_group = QGroupBox("Journal de Bord")
         log_layout = QVBoxLayout(log_group)
-        self.list_logs = QListWidget()
+        self.modele_logs = EvenementsListModel(self)
+        self.list_logs = QListView()
+        self.list_logs.setModel(self.modele_logs)
+        self.list_logs.setUniformItemSizes(True)
         self.list_logs.setAlternatingRowColors(True)
         self.list_logs.setStyleSheet("font-size: 10px;")
         log_layout.addWidget(self.list_logs)
         control_panel.addWidget(log_group, 1)
 
+        self.perf_group = QGroupBox("Performances (ms p50 / p95 / p99)")
+        perf_layout = QVBoxLayout(self.perf_group)
+        self.label_perf = QLabel()
+        self.label_perf.setStyleSheet("font-family: monospace; font-size: 10px;")
+        perf_layout.addWidget(self.label_perf)
+        self.btn_export_perf = QPushButton("💾 Exporter JSON")
+        self.btn_export_perf.clicked.connect(self._exporter_perf)
+        perf_layout.addWidget(self.btn_export_perf)
+        self.perf_group.setVisible(False)
+        control_panel.addWidget(self.perf_group)
+
         control_panel.addStretch(0)
         main_layout.addLayout(control_panel, 1)
         self.setCentralWidget(central_widget)
@@ -174,14 +271,14 @@ class MainWindow(QMainWindow):
             widget.setVisible(show)
         self.selected_info.setVisible(not show or self.avion_selectionne is None)
 
-    def _selectionner_avion(self, avion: Avion):
+    def _selectionner_avion(self, avion: EtatAvion):
         self.avion_selectionne = avion
         if avion is None or not avion.en_vol:
             self.avion_selectionne = None
             self.control_group.setTitle("Commandes (Sélectionné: Aucun)")
             self.control_group.setEnabled(False)
             self._show_instruction_panel(False)
-            self.list_avions.clearSelection()
+            self.table_avions.clearSelection()
             return
 
         self.control_group.setTitle(f"Commandes (Sélectionné: {avion.identifiant})")
@@ -191,174 +288,213 @@ class MainWindow(QMainWindow):
         self.spin_alt.setValue(avion.altitude)
         self.btn_atterrir.setEnabled(not avion.instruction_atterrissage)
         self.radar_view.selectionner_avion_par_id(avion.identifiant)
-        for i in range(self.list_avions.count()):
-            item = self.list_avions.item(i)
-            if item.data(Qt.UserRole) == avion.identifiant:
-                self.list_avions.setCurrentItem(item)
-                break
-
-    def _on_list_clicked(self, item):
-        id_avion = item.data(Qt.UserRole)
-        avion_trouve = next((a for a in self.simulation.espace.avions if a.identifiant == id_avion), None)
+        rang = self.modele_avions.rang(avion.identifiant)
+        if rang is not None:
+            index = self.proxy_avions.mapFromSource(self.modele_avions.index(rang, 0))
+            self.table_avions.selectionModel().setCurrentIndex(
+                index, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+
+    def _on_table_clicked(self, index):
+        id_avion = index.data(Qt.UserRole)
+        avion_trouve = self.instantane.avions_par_id.get(id_avion)
         if avion_trouve:
             self._selectionner_avion(avion_trouve)
 
     def _update_list_avions(self):
-        limit_x = self.simulation.espace.TAILLE_X
-        limit_y = self.simulation.espace.TAILLE_Y
-        avions_visibles = []
-        ids_visibles = set()
-        for avion in self.simulation.espace.avions:
-            if 0 <= avion.x <= limit_x and 0 <= avion.y <= limit_y:
-                avions_visibles.append(avion)
-                ids_visibles.add(avion.identifiant)
-
-        existing_items = {}
-        for i in range(self.list_avions.count()):
-            item = self.list_avions.item(i)
-            uid = item.data(Qt.UserRole)
-            if uid:
-                existing_items[uid] = item
-
-        for avion in avions_visibles:
-            display_text = avion.identifiant
-            if avion.incident:
-                display_text += " ⚠️ (Panne)"
-            elif avion.alerte_collision:
-                display_text += " ⚔️ (COLLISION)"
-            if avion.compteur_tempete > 0:
-                display_text += " ⛈️"
-
-            if avion.identifiant in existing_items:
-                item = existing_items[avion.identifiant]
-                if item.text() != display_text:
-                    item.setText(display_text)
-            else:
-                item = QListWidgetItem(display_text)
-                item.setData(Qt.UserRole, avion.identifiant)
-                self.list_avions.addItem(item)
-
-        for i in range(self.list_avions.count() - 1, -1, -1):
-            item = self.list_avions.item(i)
-            uid = item.data(Qt.UserRole)
-            if uid not in ids_visibles:
-                self.list_avions.takeItem(i)
+        self.modele_avions.mettre_a_jour(self.instantane)
 
     def _update_logs(self):
-        msgs = self.simulation.pop_messages()
-        for type_msg, text in msgs:
-            item = QListWidgetItem(text)
-            if type_msg == "DANGER":
-                item.setForeground(QBrush(QColor("#ff5555")))
-            elif type_msg == "WARNING":
-                item.setForeground(QBrush(QColor("#ffb86c")))
-            elif type_msg == "SUCCESS":
-                item.setForeground(QBrush(QColor("#50fa7b")))
-            else:
-                item.setForeground(QBrush(QColor("#f8f8f2")))
-
-            self.list_logs.addItem(item)
-            self.list_logs.scrollToBottom()
+        evenements = self.moteur.pop_messages()
+        perdus = self.moteur.evenements_perdus()
+        if evenements or perdus:
+            self.modele_logs.ajouter(evenements, perdus)
+            if evenements:
+                self.list_logs.scrollToBottom()
 
     def _changer_cap(self):
         if self.avion_selectionne and self.avion_selectionne.en_vol:
             nouveau_cap = self.spin_cap.value()
-            self.avion_selectionne.changer_cap(nouveau_cap)
+            self.moteur.envoyer(Simulation.commande_cap, self.avion_selectionne.identifiant, nouveau_cap)
 
     def _changer_altitude(self, delta: int):
         if self.avion_selectionne and self.avion_selectionne.en_vol:
             nouvelle_alt = self.avion_selectionne.altitude + delta
-            if 1000 <= nouvelle_alt <= 5000:
-                if delta > 0:
-                    self.avion_selectionne.monter(delta)
-                else:
-                    self.avion_selectionne.descendre(abs(delta))
-                self.spin_alt.setValue(self.avion_selectionne.altitude)
+            if Simulation.ALTITUDE_MIN <= nouvelle_alt <= Simulation.ALTITUDE_MAX:
+                self.moteur.envoyer(Simulation.commande_altitude, self.avion_selectionne.identifiant, delta)
+                self.spin_alt.setValue(nouvelle_alt)
 
     def _demander_atterrissage(self):
         if self.avion_selectionne and self.avion_selectionne.en_vol:
-            target_x = self.simulation.espace.AEROPORT_X
-            target_y = self.simulation.espace.AEROPORT_Y
-            dx = target_x - self.avion_selectionne.x
-            dy = target_y - self.avion_selectionne.y
-            angle_rad = math.atan2(dy, dx)
-            angle_deg = math.degrees(angle_rad)
-            if angle_deg < 0: angle_deg += 360
-            self.avion_selectionne.changer_cap(int(angle_deg))
-            self.spin_cap.setValue(int(angle_deg))
-            if self.avion_selectionne.altitude > 1000:
-                self.avion_selectionne.altitude = 1000
-                self.spin_alt.setValue(1000)
-            self.simulation.traiter_atterrissage(self.avion_selectionne)
+            self.moteur.envoyer(Simulation.commande_atterrissage, self.avion_selectionne.identifiant)
+            cap = self.simulation.espace.cap_vers_aeroport(self.avion_selectionne.x, self.avion_selectionne.y)
+            self.spin_cap.setValue(cap)
+            self.spin_alt.setValue(min(self.avion_selectionne.altitude, Simulation.ALTITUDE_MIN))
             self.btn_atterrir.setEnabled(False)
 
     def _setup_timer(self):
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self._simulation_tick)
+        self.timer.timeout.connect(self._rafraichir_affichage)
         self.timer.start(self.REFRESH_RATE_MS)
 
-    def _simulation_tick(self):
-        self.simulation.mise_a_jour()
-        self.radar_view.update_radar(self.simulation.espace.avions, self.simulation.espace.tempetes)
-        self._update_list_avions()
-        self._update_logs()
-
-        if self.avion_selectionne:
-            info = f"ID: {self.avion_selectionne.identifiant}\n"
-            info += f"Alt: {self.avion_selectionne.altitude}m | V: {self.avion_selectionne.vitesse}km/h\n"
-            info += f"Cap: {self.avion_selectionne.cap}° | Fuel: {self.avion_selectionne.carburant:.1f}%\n"
-            if self.avion_selectionne.compteur_tempete > 0:
-                info += f"\n[⛈️ ALERTE TEMPÊTE] {self.avion_selectionne.compteur_tempete:.1f}s"
-                self.selected_info.setStyleSheet("font-weight: bold; color: #ff5555;")
-            elif self.avion_selectionne.incident:
-                info += "\n[⚠️ PANNE DÉTECTÉE]"
-                self.selected_info.setStyleSheet("font-weight: bold; color: #ff8c00;")
-            elif self.avion_selectionne.instruction_atterrissage:
-                info += "\n[⚠️ EN APPROCHE]"
-                self.selected_info.setStyleSheet("font-weight: bold; color: orange;")
-            else:
-                info += "\n[EN VOL]"
-                self.selected_info.setStyleSheet("font-style: italic; color: white;")
-            self.selected_info.setText(info)
-            if not self.avion_selectionne.en_vol:
-                self._selectionner_avion(None)
-
-        stats = self.simulation.get_stats()
+    def _rafraichir_affichage(self):
+        profileur = self.profileur
+        self.instantane = self.moteur.dernier_instantane()
+        if self.instantane is not self._instantane_affiche:
+            self._instantane_affiche = self.instantane
+            debut_frame = t = profileur.debut()
+            self.radar_view.update_radar(self.instantane.avions, self.instantane.tempetes,
+                                         self.instantane.trajectoires, self.instantane.taille_x,
+                                         self.instantane.taille_y)
+            t = profileur.marquer("update_radar", t)
+            self._update_list_avions()
+            t = profileur.marquer("update_list_avions", t)
+            self._update_selection()
+            self._update_stats()
+            t = profileur.marquer("update_stats", t)
+            self._update_logs()
+            profileur.marquer("update_logs", t)
+            profileur.marquer("frame", debut_frame)
+        else:
+            self._update_logs()
+
+        if profileur.actif:
+            self._frames_depuis_perf += 1
+            if self._frames_depuis_perf >= self.PERF_REFRESH_FRAMES:
+                self._frames_depuis_perf = 0
+                self._update_perf()
+
+    def _stats_perf(self):
+        return {
+            "simulation": self.simulation.get_perf_stats(),
+            "interface": self.profileur.statistiques(),
+        }
+
+    def _update_perf(self):
+        lignes = []
+        for source, stats in self._stats_perf().items():
+            lignes.append(f"[{source}]")
+            for phase, valeurs in stats.items():
+                lignes.append(f"{phase:<20}{valeurs['p50_ms']:7.2f}{valeurs['p95_ms']:7.2f}{valeurs['p99_ms']:7.2f}")
+        self.label_perf.setText("\n".join(lignes))
+
+    def _basculer_profilage(self, actif: bool):
+        self.moteur.envoyer(Simulation.activer_profilage, actif)
+        self.profileur.actif = actif
+        if not actif:
+            self.profileur.reinitialiser()
+        self.perf_group.setVisible(actif)
+
+    def _exporter_perf(self):
+        with open(self.PERF_EXPORT_PATH, "w", encoding="utf-8") as fichier:
+            json.dump(self._stats_perf(), fichier, indent=2)
+        self.modele_logs.ajouter([Evenement(self.instantane.tick, "INFO",
+                                            f"Profil exporté dans {self.PERF_EXPORT_PATH}")])
+        self.list_logs.scrollToBottom()
+
+    def _update_selection(self):
+        if not self.avion_selectionne:
+            return
+
+        id_avion = self.avion_selectionne.identifiant
+        avion = self.instantane.avions_par_id.get(id_avion)
+        if avion is None or not avion.en_vol:
+            self._selectionner_avion(None)
+            return
+        self.avion_selectionne = avion
+
+        info = f"ID: {avion.identifiant}\n"
+        info += f"Alt: {avion.altitude}m | V: {avion.vitesse}km/h\n"
+        info += f"Cap: {avion.cap}° | Fuel: {avion.carburant:.1f}%\n"
+        for conflit in self.instantane.conflits_prevus:
+            if avion.identifiant in (conflit.id1, conflit.id2):
+                autre = conflit.id2 if conflit.id1 == avion.identifiant else conflit.id1
+                eta_s = conflit.eta_ticks * Simulation.TEMPS_PAR_TICK_S
+                info += f"Conflit prévu avec {autre} dans {eta_s:.1f}s\n"
+        for rang, (identifiant, creneau) in enumerate(self.instantane.sequence_arrivees, 1):
+            if identifiant == avion.identifiant:
+                attente_s = max(0, creneau - self.instantane.tick) * Simulation.TEMPS_PAR_TICK_S
+                info += f"Piste : n°{rang} dans la séquence, créneau dans {attente_s:.1f}s\n"
+                break
+        if avion.compteur_tempete > 0:
+            info += f"\n[⛈️ ALERTE TEMPÊTE] {avion.compteur_tempete:.1f}s"
+            self.selected_info.setStyleSheet("font-weight: bold; color: #ff5555;")
+        elif avion.incident:
+            info += "\n[⚠️ PANNE DÉTECTÉE]"
+            self.selected_info.setStyleSheet("font-weight: bold; color: #ff8c00;")
+        elif avion.instruction_atterrissage:
+            info += "\n[⚠️ EN APPROCHE]"
+            self.selected_info.setStyleSheet("font-weight: bold; color: orange;")
+        else:
+            info += "\n[EN VOL]"
+            self.selected_info.setStyleSheet("font-style: italic; color: white;")
+        self.selected_info.setText(info)
+
+    def _update_stats(self):
+        stats = self.instantane.stats
         self.label_score.setText(f"{stats['score']}")
         self.label_avion_count.setText(f"{stats['avions_en_vol']}")
         self.label_atterris.setText(f"{stats['avions_atterris']}")
         self.label_crashes.setText(f"{stats['avions_perdus']}")
         self.label_avoided.setText(f"{stats['collisions_evitees']}")
+        self.label_prevus.setText(f"{len(self.instantane.conflits_prevus)}")
 
-        if self.simulation.en_cours and stats['avions_en_vol'] > 10:
+        resolution = self.instantane.resolution
+        if resolution is None:
+            self.label_resolution.setText("—")
+            self.btn_appliquer_avis.setEnabled(False)
+        else:
+            self.label_resolution.setText(
+                f"{len(resolution.avis)} avis, {resolution.non_resolus}/{resolution.conflits} conflits non résolus "
+                f"({resolution.duree_s * 1000:.1f} ms)")
+            self.btn_appliquer_avis.setEnabled(bool(resolution.avis))
+
+        if self.instantane.en_cours and stats['avions_en_vol'] > 10:
             self.label_avion_count.setStyleSheet("font-weight: bold; color: orange;")
         else:
             self.label_avion_count.setStyleSheet("")
 
     def _update_sim_speed(self, value):
-        self.simulation.set_vitesse_simulation(float(value))
+        self.moteur.envoyer(Simulation.set_vitesse_simulation, float(value))
+
+    def _basculer_arrivees_auto(self, actif: bool):
+        self.moteur.envoyer(Simulation.set_arrivees_automatiques, actif)
+
+    def _basculer_trainees(self, actif: bool):
+        self.moteur.envoyer(Simulation.activer_historique, actif)
+
+    def _changer_mode_resolution(self, mode: int):
+        self.moteur.envoyer(Simulation.set_mode_resolution, mode)
+
+    def _appliquer_avis(self):
+        self.moteur.envoyer(Simulation.appliquer_avis)
+        self.btn_appliquer_avis.setEnabled(False)
+
+    def _update_avance_rapide(self, value):
+        self.moteur.envoyer(Simulation.set_avance_rapide, value)
 
     def _demarrer_simu(self):
-        self.simulation.demarrer()
+        self.moteur.envoyer(Simulation.demarrer)
         self.label_statut.setText("STATUT : EN COURS")
         self.label_statut.setStyleSheet("font-weight: bold; color: green;")
 
     def _arreter_simu(self):
-        self.simulation.arreter()
+        self.moteur.envoyer(Simulation.arreter)
         self.label_statut.setText("STATUT : ARRÊTÉ")
         self.label_statut.setStyleSheet("font-weight: bold; color: red;")
 
     def _redemarrer_simu(self):
-        self.simulation.redemarrer()
-        self.radar_view.update_radar(self.simulation.espace.avions, self.simulation.espace.tempetes)
-        self._update_list_avions()
-        self.list_logs.clear()
-        self._update_logs()
+        self.moteur.envoyer(Simulation.redemarrer)
+        self.modele_logs.vider()
         self._selectionner_avion(None)
         self.label_statut.setText("STATUT : ARRÊTÉ")
         self.label_statut.setStyleSheet("font-weight: bold; color: red;")
 
     def _ajouter_avion_manuel(self):
-        self.simulation.ajouter_avion()
-        self.radar_view.update_radar(self.simulation.espace.avions, self.simulation.espace.tempetes)
-        self._update_list_avions()
\ No newline at end of file
+        self.moteur.envoyer(Simulation.ajouter_avion)
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.moteur.arreter()
+        self.simulation.fermer_journal()
+        self.simulation.fermer_export_evenements()
+        super().closeEvent(event)
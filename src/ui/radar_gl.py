@@ -0,0 +1,358 @@
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, QSize, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QPainter, QPen, QSurfaceFormat, QVector2D
+from PySide6.QtOpenGL import QOpenGLBuffer, QOpenGLShader, QOpenGLShaderProgram, QOpenGLVertexArrayObject
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+from PySide6.QtWidgets import QWidget
+from model.espace_aerien import EspaceAerien
+from model.historique import Trajectoires
+from model.instantane import EtatAvion, EtatTempete
+
+GL_FLOAT = 0x1406
+GL_TRIANGLE_STRIP = 0x0005
+GL_BLEND = 0x0BE2
+GL_SRC_ALPHA = 0x0302
+GL_ONE_MINUS_SRC_ALPHA = 0x0303
+GL_COLOR_BUFFER_BIT = 0x4000
+
+# Un quad unité instancié pour chaque avion, tempête ou anneau : le disque est découpé dans le fragment shader.
+VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec2 coin;
+layout(location = 1) in vec3 instance;  // x, y (modèle), demi-taille
+layout(location = 2) in vec4 couleur_instance;
+
+uniform vec2 viewport;
+uniform vec2 centre;
+uniform float px_par_unite;
+uniform int taille_modele;  // 1 : demi-taille en unités du modèle (tempêtes), 0 : en pixels (avions)
+
+out vec2 local;
+out vec4 couleur;
+
+void main() {
+    vec2 position = (instance.xy - centre) * px_par_unite * 2.0 / viewport;
+    float demi_px = taille_modele == 1 ? instance.z * px_par_unite : instance.z;
+    gl_Position = vec4(position + coin * demi_px * 2.0 / viewport, 0.0, 1.0);
+    local = coin;
+    couleur = couleur_instance;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330 core
+in vec2 local;
+in vec4 couleur;
+
+uniform float rayon_interieur;  // 0 : disque plein, sinon anneau
+
+out vec4 fragment;
+
+void main() {
+    float r = length(local);
+    if (r > 1.0 || r < rayon_interieur) {
+        discard;
+    }
+    fragment = couleur;
+}
+"""
+
+
+def _rgba(couleur: QColor) -> tuple[float, float, float, float]:
+    return couleur.redF(), couleur.greenF(), couleur.blueF(), couleur.alphaF()
+
+
+class RadarGLView(QOpenGLWidget):
+    """Radar OpenGL : toutes les instances d'une frame partent dans un seul vertex buffer."""
+
+    avion_selectionne = Signal(object)
+
+    ETAT_NORMAL, ETAT_URGENCE, ETAT_INCIDENT, ETAT_PROXIMITE, ETAT_ATTERRI = range(5)
+    # Mêmes couleurs que les AvionItem de RadarView.
+    PALETTE = np.array([
+        _rgba(QColor(30, 144, 255)),
+        _rgba(QColor(220, 20, 60)),
+        _rgba(QColor(255, 140, 0)),
+        _rgba(QColor(255, 0, 0)),
+        _rgba(QColor(0, 150, 0, 100)),
+    ], dtype=np.float32)
+    COULEUR_TEMPETE = _rgba(QColor(50, 50, 80, 100))
+    COULEUR_ANNEAU_ALERTE = _rgba(QColor(255, 0, 0, 200))
+    COULEUR_ANNEAU_SELECTION = _rgba(QColor(255, 255, 0))
+    COULEUR_FOND = QColor(10, 20, 30)
+
+    DEMI_TAILLE_AVION_PX = 4.0
+    DEMI_TAILLE_ANNEAU_PX = 9.0
+    RAYON_INTERIEUR_ANNEAU = 0.7
+
+    ZOOM_MIN = 0.5
+    ZOOM_MAX = 8.0
+    FACTEUR_MOLETTE = 1.25
+    ETIQUETTES_MAX = 300
+    RAYON_CLIC_PX = 8
+
+    # x, y, demi-taille, r, g, b, a
+    FLOATS_PAR_INSTANCE = 7
+
+    def __init__(self, parent: QWidget = None):
+        super().__init__(parent)
+        format_surface = QSurfaceFormat()
+        format_surface.setVersion(3, 3)
+        format_surface.setProfile(QSurfaceFormat.OpenGLContextProfile.CoreProfile)
+        self.setFormat(format_surface)
+        self.setMinimumSize(QSize(400, 400))
+
+        self._avions: tuple[EtatAvion, ...] = ()
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+        self._id_selectionne: str | None = None
+
+        self._instances = np.empty((0, self.FLOATS_PAR_INSTANCE), dtype=np.float32)
+        # Nombre d'instances de chaque passe, dans l'ordre du buffer.
+        self._nb_tempetes = 0
+        self._nb_avions = 0
+        self._nb_anneaux = 0
+        self._a_envoyer = True
+
+        # Taille de l'espace aérien affiché, donnée par chaque instantané (journal relu avec une autre taille).
+        self.taille_x = EspaceAerien.TAILLE_X
+        self.taille_y = EspaceAerien.TAILLE_Y
+        self.zoom = 1.0
+        self.centre = QPointF(self.taille_x / 2, self.taille_y / 2)
+        self._dernier_clic: QPointF | None = None
+
+        self._programme: QOpenGLShaderProgram | None = None
+        self._vao: QOpenGLVertexArrayObject | None = None
+        self._quad: QOpenGLBuffer | None = None
+        self._buffer_instances: QOpenGLBuffer | None = None
+
+    # --- API commune avec RadarView ---
+
+    def selection_changed(self, avion: EtatAvion):
+        self._id_selectionne = avion.identifiant if avion is not None else None
+        self.avion_selectionne.emit(avion)
+
+    def selectionner_avion_par_id(self, identifiant: str):
+        self._id_selectionne = identifiant
+        self._construire_instances(None)
+        self.update()
+
+    def update_radar(self, avions: list[EtatAvion], tempetes: list[EtatTempete] = (),
+                     trajectoires: Trajectoires | None = None, taille_x: float = EspaceAerien.TAILLE_X,
+                     taille_y: float = EspaceAerien.TAILLE_Y):
+        # Les traînées ne sont dessinées que par le radar QGraphicsView.
+        if (taille_x, taille_y) != (self.taille_x, self.taille_y):
+            self.taille_x = taille_x
+            self.taille_y = taille_y
+            self.zoom = 1.0
+            self.centre = QPointF(taille_x / 2, taille_y / 2)
+        self._avions = tuple(avions)
+        self._x = np.array([a.x for a in self._avions], dtype=float)
+        self._y = np.array([a.y for a in self._avions], dtype=float)
+        self._construire_instances(tempetes)
+        self.update()
+
+    # --- Données envoyées au GPU ---
+
+    def _etat(self, avion: EtatAvion) -> int:
+        if not avion.en_vol and avion.a_atterri:
+            return self.ETAT_ATTERRI
+        if avion.alerte_collision:
+            return self.ETAT_PROXIMITE
+        if avion.incident:
+            return self.ETAT_INCIDENT
+        if avion.est_en_urgence():
+            return self.ETAT_URGENCE
+        return self.ETAT_NORMAL
+
+    def _construire_instances(self, tempetes: list[EtatTempete] | None):
+        avions = self._avions
+        if tempetes is None:
+            # Seule la sélection a changé : on garde les tempêtes déjà envoyées.
+            tempetes_instances = self._instances[:self._nb_tempetes]
+        else:
+            tempetes_instances = np.array([(t.x, t.y, t.rayon, *self.COULEUR_TEMPETE) for t in tempetes],
+                                          dtype=np.float32).reshape(-1, self.FLOATS_PAR_INSTANCE)
+
+        etats = np.fromiter((self._etat(a) for a in avions), dtype=np.int64, count=len(avions))
+        avions_instances = np.empty((len(avions), self.FLOATS_PAR_INSTANCE), dtype=np.float32)
+        avions_instances[:, 0] = self._x
+        avions_instances[:, 1] = self._y
+        avions_instances[:, 2] = self.DEMI_TAILLE_AVION_PX
+        avions_instances[:, 3:] = self.PALETTE[etats]
+
+        alertes = np.fromiter((a.alerte_collision for a in avions), dtype=bool, count=len(avions))
+        anneaux = np.empty((np.count_nonzero(alertes), self.FLOATS_PAR_INSTANCE), dtype=np.float32)
+        anneaux[:, 0] = self._x[alertes]
+        anneaux[:, 1] = self._y[alertes]
+        anneaux[:, 2] = self.DEMI_TAILLE_ANNEAU_PX
+        anneaux[:, 3:] = self.COULEUR_ANNEAU_ALERTE
+        selection = [i for i, a in enumerate(avions) if a.identifiant == self._id_selectionne]
+        if selection:
+            i = selection[0]
+            anneaux = np.vstack([anneaux, np.array([[self._x[i], self._y[i], self.DEMI_TAILLE_ANNEAU_PX,
+                                                     *self.COULEUR_ANNEAU_SELECTION]], dtype=np.float32)])
+
+        self._nb_tempetes = len(tempetes_instances)
+        self._nb_avions = len(avions_instances)
+        self._nb_anneaux = len(anneaux)
+        self._instances = np.ascontiguousarray(np.vstack([tempetes_instances, avions_instances, anneaux]))
+        self._a_envoyer = True
+
+    # --- Rendu OpenGL ---
+
+    def initializeGL(self):
+        self._programme = QOpenGLShaderProgram(self)
+        self._programme.addShaderFromSourceCode(QOpenGLShader.ShaderTypeBit.Vertex, VERTEX_SHADER)
+        self._programme.addShaderFromSourceCode(QOpenGLShader.ShaderTypeBit.Fragment, FRAGMENT_SHADER)
+        self._programme.link()
+
+        self._vao = QOpenGLVertexArrayObject(self)
+        self._vao.create()
+        self._vao.bind()
+
+        coins = np.array([-1, -1, 1, -1, -1, 1, 1, 1], dtype=np.float32)
+        self._quad = QOpenGLBuffer(QOpenGLBuffer.Type.VertexBuffer)
+        self._quad.create()
+        self._quad.bind()
+        self._quad.allocate(coins.tobytes(), coins.nbytes)
+        self._programme.enableAttributeArray(0)
+        self._programme.setAttributeBuffer(0, GL_FLOAT, 0, 2, 0)
+
+        self._buffer_instances = QOpenGLBuffer(QOpenGLBuffer.Type.VertexBuffer)
+        self._buffer_instances.setUsagePattern(QOpenGLBuffer.UsagePattern.DynamicDraw)
+        self._buffer_instances.create()
+
+        fonctions = self.context().extraFunctions()
+        fonctions.glVertexAttribDivisor(1, 1)
+        fonctions.glVertexAttribDivisor(2, 1)
+        self._vao.release()
+        self._a_envoyer = True
+
+    def _px_par_unite(self) -> float:
+        return self.zoom * min(self.width(), self.height()) / self.taille_x
+
+    def _dessiner_passe(self, fonctions, premiere: int, nombre: int, taille_modele: int, rayon_interieur: float):
+        if nombre == 0:
+            return
+        octets_par_instance = self.FLOATS_PAR_INSTANCE * 4
+        decalage = premiere * octets_par_instance
+        self._programme.setAttributeBuffer(1, GL_FLOAT, decalage, 3, octets_par_instance)
+        self._programme.setAttributeBuffer(2, GL_FLOAT, decalage + 12, 4, octets_par_instance)
+        self._programme.setUniformValue1i("taille_modele", taille_modele)
+        self._programme.setUniformValue1f("rayon_interieur", rayon_interieur)
+        fonctions.glDrawArraysInstanced(GL_TRIANGLE_STRIP, 0, 4, nombre)
+
+    def paintGL(self):
+        painter = QPainter(self)
+        painter.beginNativePainting()
+
+        fonctions = self.context().extraFunctions()
+        fond = self.COULEUR_FOND
+        fonctions.glClearColor(fond.redF(), fond.greenF(), fond.blueF(), 1.0)
+        fonctions.glClear(GL_COLOR_BUFFER_BIT)
+        fonctions.glEnable(GL_BLEND)
+        fonctions.glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        self._programme.bind()
+        self._vao.bind()
+        self._buffer_instances.bind()
+        if self._a_envoyer:
+            # Un seul envoi par frame : tempêtes, avions et anneaux se suivent dans le même buffer.
+            self._buffer_instances.allocate(self._instances.tobytes(), self._instances.nbytes)
+            self._a_envoyer = False
+        self._programme.enableAttributeArray(1)
+        self._programme.enableAttributeArray(2)
+
+        self._programme.setUniformValue("viewport", QVector2D(self.width(), self.height()))
+        self._programme.setUniformValue("centre", QVector2D(self.centre.x(), self.centre.y()))
+        self._programme.setUniformValue1f("px_par_unite", self._px_par_unite())
+
+        debut_avions = self._nb_tempetes
+        debut_anneaux = debut_avions + self._nb_avions
+        self._dessiner_passe(fonctions, 0, self._nb_tempetes, 1, 0.0)
+        self._dessiner_passe(fonctions, debut_avions, self._nb_avions, 0, 0.0)
+        self._dessiner_passe(fonctions, debut_anneaux, self._nb_anneaux, 0, self.RAYON_INTERIEUR_ANNEAU)
+
+        self._buffer_instances.release()
+        self._vao.release()
+        self._programme.release()
+        painter.endNativePainting()
+
+        self._dessiner_surcouche(painter)
+        painter.end()
+
+    def _vers_ecran(self, x: float, y: float) -> QPointF:
+        echelle = self._px_par_unite()
+        return QPointF(self.width() / 2 + (x - self.centre.x()) * echelle,
+                       self.height() / 2 - (y - self.centre.y()) * echelle)
+
+    def _vers_modele(self, point: QPointF) -> QPointF:
+        echelle = self._px_par_unite()
+        return QPointF(self.centre.x() + (point.x() - self.width() / 2) / echelle,
+                       self.centre.y() - (point.y() - self.height() / 2) / echelle)
+
+    def _dessiner_surcouche(self, painter: QPainter):
+        # Piste et étiquettes : peu d'éléments, dessinés au QPainter par-dessus la passe OpenGL.
+        echelle = self._px_par_unite()
+        aeroport = self._vers_ecran(self.taille_x / 2, self.taille_y / 2)
+        painter.fillRect(QRectF(aeroport.x() - 75 * echelle, aeroport.y() - 15 * echelle, 150 * echelle, 30 * echelle),
+                         QColor(60, 60, 60))
+        painter.setPen(Qt.GlobalColor.white)
+        painter.drawText(aeroport + QPointF(-30, 20 * echelle + 12), "Aéroport")
+
+        painter.setFont(QFont("Monospace", 8))
+        etiquetees = [a for a in self._avions if a.identifiant == self._id_selectionne or a.est_en_urgence()]
+        if len(etiquetees) > self.ETIQUETTES_MAX:
+            etiquetees = [a for a in etiquetees if a.identifiant == self._id_selectionne]
+        for avion in etiquetees:
+            couleur = QColor(220, 20, 60) if avion.est_en_urgence() else QColor(255, 255, 255)
+            painter.setPen(QPen(couleur))
+            painter.drawText(self._vers_ecran(avion.x, avion.y) + QPointF(8, -4),
+                             f"{avion.identifiant} {avion.altitude:.0f}")
+
+    # --- Interaction ---
+
+    def _avion_le_plus_proche(self, point: QPointF) -> EtatAvion | None:
+        if not len(self._avions):
+            return None
+        modele = self._vers_modele(point)
+        distances = (self._x - modele.x()) ** 2 + (self._y - modele.y()) ** 2
+        i = int(np.argmin(distances))
+        rayon = self.RAYON_CLIC_PX / self._px_par_unite()
+        return self._avions[i] if distances[i] <= rayon * rayon else None
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            avion = self._avion_le_plus_proche(event.position())
+            if avion is not None:
+                self.selection_changed(avion)
+                self.selectionner_avion_par_id(avion.identifiant)
+            else:
+                self._dernier_clic = event.position()
+
+    def mouseMoveEvent(self, event):
+        if self._dernier_clic is None:
+            return
+        echelle = self._px_par_unite()
+        delta = event.position() - self._dernier_clic
+        self.centre = QPointF(self.centre.x() - delta.x() / echelle, self.centre.y() + delta.y() / echelle)
+        self._dernier_clic = event.position()
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._dernier_clic = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.zoom = 1.0
+        self.centre = QPointF(self.taille_x / 2, self.taille_y / 2)
+        self.update()
+
+    def wheelEvent(self, event):
+        # Zoom autour du curseur : le point du modèle sous la souris reste en place.
+        avant = self._vers_modele(event.position())
+        facteur = self.FACTEUR_MOLETTE if event.angleDelta().y() > 0 else 1 / self.FACTEUR_MOLETTE
+        self.zoom = min(self.ZOOM_MAX, max(self.ZOOM_MIN, self.zoom * facteur))
+        apres = self._vers_modele(event.position())
+        self.centre = QPointF(self.centre.x() + avant.x() - apres.x(), self.centre.y() + avant.y() - apres.y())
+        self.update()
@@ -1,62 +1,88 @@
-from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsScene, QGraphicsView, QGraphicsTextItem, QWidget
-from PySide6.QtGui import QBrush, QPen, QColor, QFont
+import numpy as np
+from PySide6.QtWidgets import (
+    QGraphicsEllipseItem, QGraphicsItem, QGraphicsScene, QGraphicsView, QGraphicsTextItem, QWidget
+)
+from PySide6.QtGui import QBrush, QPen, QColor, QFont, QPolygonF
 from PySide6.QtCore import QRectF, QPointF, Signal, Qt, QSize
-from model.avion import Avion
+from model.historique import Trajectoires
+from model.instantane import EtatAvion, EtatTempete
 from model.espace_aerien import EspaceAerien
 
 
 class AvionItem(QGraphicsEllipseItem):
-    def __init__(self, avion: Avion, radius=8):
+    # Pinceaux et stylos partagés par tous les avions.
+    default_brush = QBrush(QColor(30, 144, 255))
+    alert_brush = QBrush(QColor(220, 20, 60))
+    proximite_brush = QBrush(QColor(255, 0, 0))
+    incident_brush = QBrush(QColor(255, 140, 0))
+    atterri_brush = QBrush(QColor(0, 150, 0, 100))
+
+    selected_pen = QPen(QColor(255, 255, 0), 3)
+    default_pen = QPen(QColor(0, 0, 0, 0))
+
+    text_color = QColor(255, 255, 255)
+    alert_text_color = QColor(220, 20, 60)
+
+    def __init__(self, avion: EtatAvion, radius=8, taille_x: float = EspaceAerien.TAILLE_X,
+                 taille_y: float = EspaceAerien.TAILLE_Y):
         super().__init__(QRectF(-radius / 2, -radius / 2, radius, radius))
         self.avion = avion
         self.radius = radius
-
-        self.default_brush = QBrush(QColor(30, 144, 255))
-        self.alert_brush = QBrush(QColor(220, 20, 60))
-        self.proximite_brush = QBrush(QColor(255, 0, 0))
-        self.incident_brush = QBrush(QColor(255, 140, 0))
-
-        self.selected_pen = QPen(QColor(255, 255, 0), 3)
+        self.taille_x = taille_x
+        self.taille_y = taille_y
 
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setFlags(QGraphicsEllipseItem.GraphicsItemFlag.ItemIsSelectable)
+        self.setAcceptHoverEvents(True)
 
         self.id_label = QGraphicsTextItem(avion.identifiant, self)
         self.id_label.setFont(QFont("Monospace", 8))
-        self.id_label.setDefaultTextColor(QColor(255, 255, 255))
+        self.id_label.setDefaultTextColor(self.text_color)
         self.id_label.setPos(self.radius, -self.radius)
 
+        self._derniere_position = None
+        self._dernier_label = None
+        self._dernier_etat = None
+
         self.update_graphics()
 
-    def update_position(self, scene_width: float, scene_height: float):
-        MAX_X_MODEL = EspaceAerien.TAILLE_X
-        MAX_Y_MODEL = EspaceAerien.TAILLE_Y
+    def rafraichir(self, scene_width: float, scene_height: float):
+        position = (self.avion.x, self.avion.y)
+        if position != self._derniere_position:
+            self._derniere_position = position
+            self.update_position(scene_width, scene_height)
 
-        sx = (self.avion.x / MAX_X_MODEL) * scene_width
-        sy = scene_height - (self.avion.y / MAX_Y_MODEL) * scene_height
+        etat = (self.avion.version, self.avion.carburant < 10.0, self.isSelected())
+        if etat != self._dernier_etat:
+            self._dernier_etat = etat
+            self.update_label()
+            self.update_graphics()
 
-        self.setPos(sx, sy)
+    def update_position(self, scene_width: float, scene_height: float):
+        sx = (self.avion.x / self.taille_x) * scene_width
+        sy = scene_height - (self.avion.y / self.taille_y) * scene_height
 
-        self.id_label.setPlainText(f"{self.avion.identifiant}\n{self.avion.altitude:.0f}")
+        self.setPos(sx, sy)
 
-        self.update_tooltip()
-        self.update_graphics()
+    def update_label(self):
+        label = (self.avion.identifiant, self.avion.altitude)
+        if label != self._dernier_label:
+            self._dernier_label = label
+            self.id_label.setPlainText(f"{self.avion.identifiant}\n{self.avion.altitude:.0f}")
 
     def update_graphics(self):
+        text_color = self.text_color
         if not self.avion.en_vol and self.avion.a_atterri:
-            brush = QBrush(QColor(0, 150, 0, 100))
+            brush = self.atterri_brush
         elif self.avion.alerte_collision:
             brush = self.proximite_brush
-            text_color = QColor(255, 255, 255)
         elif self.avion.incident:
             brush = self.incident_brush
-            text_color = QColor(255, 255, 255)
         elif self.avion.est_en_urgence():
             brush = self.alert_brush
-            text_color = QColor(220, 20, 60)
+            text_color = self.alert_text_color
         else:
             brush = self.default_brush
-            text_color = QColor(255, 255, 255)
 
         self.setBrush(brush)
         self.id_label.setDefaultTextColor(text_color)
@@ -64,7 +90,7 @@ class AvionItem(QGraphicsEllipseItem):
         if self.isSelected():
             self.setPen(self.selected_pen)
         else:
-            self.setPen(QPen(QColor(0, 0, 0, 0)))
+            self.setPen(self.default_pen)
 
     def update_tooltip(self):
         txt = f"ID: {self.avion.identifiant} | Alt: {self.avion.altitude:.0f}m\n"
@@ -86,6 +112,11 @@ class AvionItem(QGraphicsEllipseItem):
 
         self.setToolTip(txt)
 
+    def hoverEnterEvent(self, event):
+        # L'info-bulle n'est construite qu'au survol.
+        self.update_tooltip()
+        super().hoverEnterEvent(event)
+
     def mousePressEvent(self, event):
         super().mousePressEvent(event)
         if self.scene() and self.scene().views():
@@ -94,8 +125,120 @@ class AvionItem(QGraphicsEllipseItem):
         self.update_graphics()
 
 
+class NuageAvionsItem(QGraphicsItem):
+    """Avions sans étiquette dessinés en un seul appel à paint(), ou en carte de densité quand on dézoome."""
+
+    TAILLE_POINT_PX = 6
+    TAILLE_CELLULE_DENSITE = 25
+
+    point_pen = QPen(AvionItem.default_brush.color(), TAILLE_POINT_PX, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+    point_pen.setCosmetic(True)
+    alerte_pen = QPen(AvionItem.alert_brush.color(), TAILLE_POINT_PX, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap)
+    alerte_pen.setCosmetic(True)
+    # Du bleu transparent (peu d'avions) au rouge opaque (cellule la plus dense).
+    densite_brushes = [QBrush(QColor.fromHsvF(0.6 - 0.6 * i / 7, 0.9, 1.0, 0.25 + 0.6 * i / 7)) for i in range(8)]
+
+    def __init__(self, scene_size: float):
+        super().__init__()
+        self.scene_size = scene_size
+        self.densite = False
+        self._points = QPolygonF()
+        self._points_alerte = QPolygonF()
+        self._cellules: list[tuple[QRectF, QBrush]] = []
+        self.setZValue(0)
+        # Les clics traversent le nuage : la vue retrouve l'avion le plus proche ou fait défiler la carte.
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(0, 0, self.scene_size, self.scene_size)
+
+    @staticmethod
+    def _polygone(sx: np.ndarray, sy: np.ndarray) -> QPolygonF:
+        return QPolygonF([QPointF(x, y) for x, y in zip(sx.tolist(), sy.tolist())])
+
+    def definir_points(self, sx: np.ndarray, sy: np.ndarray, alerte: np.ndarray, densite: bool):
+        # Seule la représentation affichée est construite.
+        self.densite = densite
+        self._points = QPolygonF()
+        self._points_alerte = QPolygonF()
+        self._cellules = []
+
+        if not densite:
+            self._points = self._polygone(sx[~alerte], sy[~alerte])
+            self._points_alerte = self._polygone(sx[alerte], sy[alerte])
+        elif len(sx):
+            taille = self.TAILLE_CELLULE_DENSITE
+            nb = int(np.ceil(self.scene_size / taille))
+            comptes, _, _ = np.histogram2d(sx, sy, bins=nb, range=[[0, nb * taille], [0, nb * taille]])
+            maximum = comptes.max()
+            for i, j in zip(*np.nonzero(comptes)):
+                niveau = int(comptes[i, j] / maximum * (len(self.densite_brushes) - 1))
+                self._cellules.append((QRectF(i * taille, j * taille, taille, taille), self.densite_brushes[niveau]))
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        if self.densite:
+            for rect, brush in self._cellules:
+                painter.fillRect(rect, brush)
+            return
+        painter.setPen(self.point_pen)
+        painter.drawPoints(self._points)
+        painter.setPen(self.alerte_pen)
+        painter.drawPoints(self._points_alerte)
+
+
+class TraineeItem(QGraphicsItem):
+    """Positions passées d'un avion en une polyligne, complétée à chaque nouvel échantillon sans être reconstruite."""
+
+    pen = QPen(QColor(0, 200, 255, 90), 1)
+    pen.setCosmetic(True)
+
+    def __init__(self, capacite: int):
+        super().__init__()
+        self.capacite = capacite
+        self._points = QPolygonF()
+        self._rect = QRectF()
+        self.setZValue(-0.5)
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def remplacer(self, points: QPolygonF):
+        self._points = points
+        self._recalculer()
+
+    def ajouter(self, points: QPolygonF):
+        for point in points:
+            self._points.append(point)
+        # L'anneau du modèle a oublié les plus anciens : on les retire aussi de la traînée.
+        en_trop = self._points.size() - self.capacite
+        if en_trop > 0:
+            self._points.remove(0, en_trop)
+        self._recalculer()
+
+    def _recalculer(self):
+        self.prepareGeometryChange()
+        self._rect = self._points.boundingRect()
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        painter.setPen(self.pen)
+        painter.drawPolyline(self._points)
+
+
 class RadarView(QGraphicsView):
-    avion_selectionne = Signal(Avion)
+    avion_selectionne = Signal(object)
+
+    # Niveaux de zoom relatifs à la vue d'ensemble.
+    ZOOM_MIN = 0.5
+    ZOOM_MAX = 8.0
+    FACTEUR_MOLETTE = 1.25
+    SEUIL_ZOOM_ETIQUETTES = 2.0
+    SEUIL_ZOOM_DENSITE = 0.8
+    # Au-delà, même zoomé, seuls les avions sélectionnés ou en alerte gardent leur étiquette.
+    ETIQUETTES_MAX = 300
+    RAYON_CLIC_PX = 8
 
     def __init__(self, parent: QWidget = None):
         super().__init__(parent)
@@ -104,15 +247,30 @@ class RadarView(QGraphicsView):
         self.setBackgroundBrush(QBrush(QColor(10, 20, 30)))
 
         self.scene_size = 800
+        # Taille de l'espace aérien affiché, donnée par chaque instantané (journal relu avec une autre taille).
+        self.taille_x = EspaceAerien.TAILLE_X
+        self.taille_y = EspaceAerien.TAILLE_Y
         self.scene.setSceneRect(QRectF(0, 0, self.scene_size, self.scene_size))
 
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
 
         self.setMinimumSize(QSize(400, 400))
 
         self.avion_items: dict[str, AvionItem] = {}
-        self.storm_items = []  # Liste pour stocker les objets graphiques des tempêtes
+        self.storm_items = {}  # Objets graphiques des tempêtes, réutilisés tant que la tempête existe
+        self.trainee_items: dict[str, TraineeItem] = {}
+        self._echantillons_trainees = 0
+
+        self.nuage = NuageAvionsItem(self.scene_size)
+        self.scene.addItem(self.nuage)
+        self._avions: tuple[EtatAvion, ...] = ()
+        self._sx = np.empty(0)
+        self._sy = np.empty(0)
+        self._id_selectionne: str | None = None
+        self.zoom = 1.0
 
         self._draw_aeroport()
 
@@ -135,54 +293,182 @@ class RadarView(QGraphicsView):
         label.setPos(center - 30, center + 15)
 
     def _draw_storms(self, tempetes):
-        for item in self.storm_items:
-            self.scene.removeItem(item)
-        self.storm_items.clear()
+        tempetes_actuelles = set(tempetes)
+        for tempete in [t for t in self.storm_items if t not in tempetes_actuelles]:
+            self.scene.removeItem(self.storm_items.pop(tempete))
 
-        scale_factor = self.scene_size / EspaceAerien.TAILLE_X
+        echelle_x = self.scene_size / self.taille_x
+        echelle_y = self.scene_size / self.taille_y
 
         for tempete in tempetes:
-            sx = tempete.x * scale_factor
-            sy = self.scene_size - (tempete.y * scale_factor)  # Inversion Y
-            r = tempete.rayon * scale_factor
+            if tempete in self.storm_items:
+                continue
+
+            sx = tempete.x * echelle_x
+            sy = self.scene_size - (tempete.y * echelle_y)  # Inversion Y
+            rx = tempete.rayon * echelle_x
+            ry = tempete.rayon * echelle_y
 
-            storm_item = self.scene.addEllipse(sx - r, sy - r, r * 2, r * 2,
+            storm_item = self.scene.addEllipse(sx - rx, sy - ry, rx * 2, ry * 2,
                                                QPen(QColor(100, 100, 150, 100)),
                                                QBrush(QColor(50, 50, 80, 100)))
             storm_item.setZValue(-1)
-            self.storm_items.append(storm_item)
+            self.storm_items[tempete] = storm_item
 
-    def selection_changed(self, avion: Avion):
+    def selection_changed(self, avion: EtatAvion):
+        self._id_selectionne = avion.identifiant if avion is not None else None
         self.avion_selectionne.emit(avion)
 
     def selectionner_avion_par_id(self, identifiant: str):
         self.scene.clearSelection()
+        self._id_selectionne = identifiant
+        # L'avion sélectionné garde toujours son étiquette : on recalcule le niveau de détail.
+        self._appliquer_lod()
 
         if identifiant in self.avion_items:
             item = self.avion_items[identifiant]
             item.setSelected(True)
-            item.update_graphics()
+            item.rafraichir(self.scene_size, self.scene_size)
+
+    def _draw_trainees(self, trajectoires: Trajectoires | None):
+        points = trajectoires.points if trajectoires is not None else {}
+        for identifiant in [i for i in self.trainee_items if i not in points]:
+            self.scene.removeItem(self.trainee_items.pop(identifiant))
+        if trajectoires is None:
+            self._echantillons_trainees = 0
+            return
+
+        nouveaux = trajectoires.echantillons - self._echantillons_trainees
+        if nouveaux == 0:
+            return
+        self._echantillons_trainees = trajectoires.echantillons
+        # Frames sautées au-delà de la capacité ou historique réinitialisé : les traînées sont reconstruites.
+        incremental = 0 < nouveaux < trajectoires.capacite
+        echelle_x = self.scene_size / self.taille_x
+        echelle_y = self.scene_size / self.taille_y
+
+        for identifiant, trajectoire in points.items():
+            item = self.trainee_items.get(identifiant)
+            if item is None:
+                item = TraineeItem(trajectoires.capacite)
+                self.scene.addItem(item)
+                self.trainee_items[identifiant] = item
+            elif incremental:
+                trajectoire = trajectoire[-nouveaux:]
+            polygone = NuageAvionsItem._polygone(trajectoire[:, 0] * echelle_x,
+                                                 self.scene_size - trajectoire[:, 1] * echelle_y)
+            if incremental:
+                item.ajouter(polygone)
+            else:
+                item.capacite = trajectoires.capacite
+                item.remplacer(polygone)
+
+    def _changer_taille(self, taille_x: float, taille_y: float):
+        # Tous les éléments déjà placés le sont à l'ancienne échelle : ils sont recréés.
+        self.taille_x = taille_x
+        self.taille_y = taille_y
+        for items in (self.storm_items, self.trainee_items, self.avion_items):
+            for item in items.values():
+                self.scene.removeItem(item)
+            items.clear()
+        self._echantillons_trainees = 0
+
+    def update_radar(self, avions: list[EtatAvion], tempetes: list[EtatTempete] = (),
+                     trajectoires: Trajectoires | None = None, taille_x: float = EspaceAerien.TAILLE_X,
+                     taille_y: float = EspaceAerien.TAILLE_Y):
+        if (taille_x, taille_y) != (self.taille_x, self.taille_y):
+            self._changer_taille(taille_x, taille_y)
+        self._draw_storms(tempetes)
+        self._draw_trainees(trajectoires)
+        self._avions = tuple(avions)
+        self._sx = np.array([a.x for a in self._avions], dtype=float) * (self.scene_size / self.taille_x)
+        self._sy = self.scene_size - np.array([a.y for a in self._avions], dtype=float) * (
+                self.scene_size / self.taille_y)
+        self._appliquer_lod()
+
+    def _zone_visible(self) -> QRectF:
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    def _appliquer_lod(self):
+        avions = self._avions
+        urgence = np.fromiter((a.est_en_urgence() for a in avions), dtype=bool, count=len(avions))
+        detailles = np.fromiter((a.identifiant == self._id_selectionne for a in avions), dtype=bool, count=len(avions))
+        # Trafic très dense : les avions en alerte restent en rouge dans le nuage, sans étiquette.
+        if np.count_nonzero(urgence) <= self.ETIQUETTES_MAX:
+            detailles |= urgence
+
+        if self.zoom >= self.SEUIL_ZOOM_ETIQUETTES and len(avions):
+            zone = self._zone_visible()
+            visibles = ((self._sx >= zone.left()) & (self._sx <= zone.right())
+                        & (self._sy >= zone.top()) & (self._sy <= zone.bottom()))
+            if np.count_nonzero(visibles & ~detailles) <= self.ETIQUETTES_MAX:
+                detailles |= visibles
+
+        ids_detailles = set()
+        for i in np.flatnonzero(detailles).tolist():
+            avion = avions[i]
+            ids_detailles.add(avion.identifiant)
+            item = self.avion_items.get(avion.identifiant)
+            if item is None:
+                item = AvionItem(avion, taille_x=self.taille_x, taille_y=self.taille_y)
+                self.scene.addItem(item)
+                item.setZValue(1)
+                self.avion_items[avion.identifiant] = item
+                if avion.identifiant == self._id_selectionne:
+                    item.setSelected(True)
+            item.avion = avion
+            item.rafraichir(self.scene_size, self.scene_size)
 
-    def update_radar(self, avions: list[Avion], tempetes: list = []):
+        for identifiant in [i for i in self.avion_items if i not in ids_detailles]:
+            self.scene.removeItem(self.avion_items.pop(identifiant))
 
-        self._draw_storms(tempetes)
+        nuage = ~detailles
+        self.nuage.definir_points(self._sx[nuage], self._sy[nuage], urgence[nuage], self.zoom < self.SEUIL_ZOOM_DENSITE)
 
-        avions_actuels_ids = {avion.identifiant for avion in avions}
+    def _avion_le_plus_proche(self, position: QPointF) -> EtatAvion | None:
+        if not len(self._avions):
+            return None
+        distances = (self._sx - position.x()) ** 2 + (self._sy - position.y()) ** 2
+        i = int(np.argmin(distances))
+        rayon = self.RAYON_CLIC_PX / self.transform().m11()
+        return self._avions[i] if distances[i] <= rayon * rayon else None
 
-        for avion in avions:
-            if avion.identifiant not in self.avion_items:
-                item = AvionItem(avion)
-                self.scene.addItem(item)
-                self.avion_items[avion.identifiant] = item
+    def mousePressEvent(self, event):
+        item = self.itemAt(event.position().toPoint())
+        sur_avion = isinstance(item, AvionItem) or (item is not None and isinstance(item.parentItem(), AvionItem))
+        if event.button() == Qt.MouseButton.LeftButton and not sur_avion:
+            # Les avions du nuage n'ont pas d'item propre : on cherche le plus proche du clic.
+            avion = self._avion_le_plus_proche(self.mapToScene(event.position().toPoint()))
+            if avion is not None:
+                self.selection_changed(avion)
+                self.selectionner_avion_par_id(avion.identifiant)
+                return
+        super().mousePressEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.reinitialiser_vue()
 
-            self.avion_items[avion.identifiant].update_position(self.scene_size, self.scene_size)
-            self.avion_items[avion.identifiant].update_graphics()
+    def wheelEvent(self, event):
+        facteur = self.FACTEUR_MOLETTE if event.angleDelta().y() > 0 else 1 / self.FACTEUR_MOLETTE
+        zoom = min(self.ZOOM_MAX, max(self.ZOOM_MIN, self.zoom * facteur))
+        if zoom != self.zoom:
+            self.scale(zoom / self.zoom, zoom / self.zoom)
+            self.zoom = zoom
+            self._appliquer_lod()
 
-        items_a_retirer = [id for id in self.avion_items if id not in avions_actuels_ids]
-        for id in items_a_retirer:
-            item = self.avion_items.pop(id)
-            self.scene.removeItem(item)
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        if self.zoom >= self.SEUIL_ZOOM_ETIQUETTES:
+            self._appliquer_lod()
+
+    def reinitialiser_vue(self):
+        self.zoom = 1.0
+        self.fitInView(self.scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        self._appliquer_lod()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self.fitInView(self.scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
\ No newline at end of file
+        centre = self.mapToScene(self.viewport().rect().center())
+        self.fitInView(self.scene.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+        self.scale(self.zoom, self.zoom)
+        self.centerOn(centre)